@@ -1,5 +1,10 @@
 # ruff: noqa: N802, PLC0415
 
+# Network files browserforge (without `DATA_FILES`) expects to find in the headers data directory
+_HEADER_FILES: frozenset[str] = frozenset(
+    {'browser-helper-file.json', 'header-network.zip', 'headers-order.json', 'input-network.zip'}
+)
+
 
 def patch_browserforge() -> None:
     """Patches `browserforge` to use data from `apify_fingerprint_datapoints`.
@@ -7,10 +12,12 @@ def patch_browserforge() -> None:
     This avoids import time or runtime file downloads.
     """
     # Temporary fix until https://github.com/daijro/browserforge/pull/29 is merged
+    import functools
     from pathlib import Path
 
     import apify_fingerprint_datapoints
     from browserforge import download
+    from typing_extensions import Self
 
     download.DATA_DIRS: dict[str, Path] = {  # type:ignore[misc]
         'headers': apify_fingerprint_datapoints.get_header_network().parent,
@@ -24,34 +31,43 @@ def patch_browserforge() -> None:
 
     import browserforge.bayesian_network
 
-    class BayesianNetwork(browserforge.bayesian_network.BayesianNetwork):
-        def __init__(self, path: Path) -> None:
+    fingerprints_dir = download.DATA_DIRS['fingerprints']
+
+    # Resolve the renamed file names once, so constructing a network is a single dict lookup
+    if hasattr(download, 'DATA_FILES'):
+        # Old API: use file name mapping
+        path_map = {
+            name: download.DATA_DIRS[category] / mapped_name
+            for category in ('fingerprints', 'headers')  # headers take precedence, as in browserforge
+            for name, mapped_name in download.DATA_FILES[category].items()
+        }
+    else:
+        # New API: use hardcoded mapping for known file renames
+        # This matches the structure from browserforge 1.2.4's DATA_FILES
+        file_mapping = {
+            'header-network.zip': 'header-network-definition.zip',
+            'input-network.zip': 'input-network-definition.zip',
+            'fingerprint-network.zip': 'fingerprint-network-definition.zip',
+        }
+        path_map = {name: download.DATA_DIRS['headers'] / file_mapping.get(name, name) for name in _HEADER_FILES}
+        path_map['fingerprint-network.zip'] = fingerprints_dir / file_mapping['fingerprint-network.zip']
+
+    original_network_class = browserforge.bayesian_network.BayesianNetwork
+
+    class BayesianNetwork(original_network_class):
+        def __new__(cls, path: Path) -> Self:
             """Inverted mapping as browserforge expects somewhat renamed file names."""
-            # Handle both old API (with DATA_FILES) and new API (without DATA_FILES)
-            if hasattr(download, 'DATA_FILES'):
-                # Old API: use file name mapping
-                if path.name in download.DATA_FILES['headers']:
-                    path = download.DATA_DIRS['headers'] / download.DATA_FILES['headers'][path.name]
-                else:
-                    path = download.DATA_DIRS['fingerprints'] / download.DATA_FILES['fingerprints'][path.name]
-            else:
-                # New API: use hardcoded mapping for known file renames
-                # This matches the structure from browserforge 1.2.4's DATA_FILES
-                file_mapping = {
-                    'header-network.zip': 'header-network-definition.zip',
-                    'input-network.zip': 'input-network-definition.zip',
-                    'fingerprint-network.zip': 'fingerprint-network-definition.zip',
-                }
-
-                # Determine which category based on common file names
-                if path.name in ('browser-helper-file.json', 'header-network.zip',
-                                 'headers-order.json', 'input-network.zip'):
-                    mapped_name = file_mapping.get(path.name, path.name)
-                    path = download.DATA_DIRS['headers'] / mapped_name
-                else:
-                    mapped_name = file_mapping.get(path.name, path.name)
-                    path = download.DATA_DIRS['fingerprints'] / mapped_name
-            super().__init__(path)
+            return load_network(path_map.get(path.name, fingerprints_dir / path.name))
+
+        def __init__(self, path: Path) -> None:
+            """Networks are fully initialized by `load_network`, once per file."""
+
+    @functools.cache
+    def load_network(path: Path) -> BayesianNetwork:
+        """Parse a network file once; networks are read-only after construction, so instances are shared."""
+        network = object.__new__(BayesianNetwork)
+        original_network_class.__init__(network, path)
+        return network
 
     browserforge.bayesian_network.BayesianNetwork = BayesianNetwork  # type:ignore[misc]
     import browserforge.headers.generator
@@ -0,0 +1,30 @@
+"""Process-wide loading of the project's .env file."""
+
+import functools
+import logging
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# tax_rag_project/.env (this module lives in tax_rag_project/src/tax_rag_scraper/config/)
+ENV_PATH = Path(__file__).resolve().parents[3] / '.env'
+
+
+@functools.lru_cache(maxsize=1)
+def ensure_env_loaded() -> bool:
+    """Load environment variables from the project's .env file, once per process.
+
+    Later calls return the cached result without re-reading the file or touching `os.environ`.
+
+    Returns:
+        True if the .env file was found and loaded, False if only the process environment is used.
+    """
+    if ENV_PATH.exists():
+        load_dotenv(ENV_PATH)
+        logger.info('[OK] Loaded environment from .env')
+        return True
+
+    logger.warning('[WARNING] .env file not found, using environment variables')
+    return False
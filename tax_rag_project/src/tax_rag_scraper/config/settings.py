@@ -40,12 +40,28 @@ class Settings(BaseSettings):
     QDRANT_COLLECTION: str = ''  # Required: set per-scraper (e.g., 'cra-collection')
     QDRANT_SOURCE: str = ''  # Required: source prefix for vector names (e.g., 'cra' -> 'cra-dense', 'cra-sparse')
     USE_QDRANT: bool = True
+    QDRANT_PREFER_GRPC: bool = True  # Set False to use REST where the gRPC port (6334) is blocked
 
     # Embeddings configuration
     # OpenAI API key is REQUIRED when USE_QDRANT is True
     EMBEDDING_MODEL: str = 'text-embedding-3-small'
     EMBEDDING_BATCH_SIZE: int = 5  # Reduced from 10 to avoid rate limits
     OPENAI_API_KEY: str = ''  # Required when USE_QDRANT is True: Get from https://platform.openai.com/api-keys
+    # Compute BM25 sparse vectors with FastEmbed before upload. False delegates BM25 to the Qdrant server
+    # (cloud inference): no local model, and only chunk text is uploaded for the sparse vectors
+    SPARSE_EMBEDDING_LOCAL: bool = True
+    SPARSE_EMBEDDING_PARALLEL: int | None = None  # FastEmbed worker processes (0 = all cores, None = in-process)
+    EMBEDDING_CONCURRENCY: int = 4  # Max OpenAI embedding requests in flight at once
+    # Embed through the OpenAI Batch API: half the cost and separate rate limits, but each job may take up to
+    # 24h. Jobs run in the background while crawling, and the crawl finishes once every job has completed.
+    # Each job covers EMBEDDING_BATCH_API_SIZE documents
+    EMBEDDING_BATCH_API: bool = False
+    EMBEDDING_BATCH_API_SIZE: int = 5000
+    EMBEDDING_BATCH_API_MAX_JOBS: int = 4  # Max Batch API jobs (and their uploaded files) in flight at once
+    UPSERT_BATCH_SIZE: int = 128  # Points per Qdrant upsert request (stays well below the ~2k-point latency knee)
+    UPSERT_CONCURRENCY: int = 4  # Max Qdrant upsert requests in flight at once
+    QDRANT_BULK_MODE: bool = False  # Defer HNSW indexing until the crawl finishes (for large full crawls)
+    QDRANT_QUANTIZE: bool = False  # Enable int8 quantization on the dense vector if the collection has none
 
     # Document processing
     CHUNK_SIZE: int = 800
@@ -1,5 +1,7 @@
 """Base crawler implementation for tax documentation."""
 
+import asyncio
+import contextlib
 import logging
 from datetime import timedelta
 from pathlib import Path
@@ -12,10 +14,12 @@ from crawlee.http_clients import HttpxHttpClient
 from tax_rag_scraper.config.settings import Settings
 from tax_rag_scraper.crawlers.site_router import SiteRouter
 from tax_rag_scraper.storage.qdrant_client import TaxDataQdrantClient
-from tax_rag_scraper.utils.embeddings import EmbeddingService
+from tax_rag_scraper.utils.embeddings import EmbeddedChunks, EmbeddingService, SparseEmbeddingService
 from tax_rag_scraper.utils.link_extractor import LinkExtractor
 from tax_rag_scraper.utils.robots import RobotsChecker
+from tax_rag_scraper.utils.ssl_context import get_ssl_context
 from tax_rag_scraper.utils.stats_tracker import CrawlStats
+from tax_rag_scraper.utils.url_filter import UrlPatterns
 from tax_rag_scraper.utils.user_agents import get_random_user_agent
 
 if TYPE_CHECKING:
@@ -25,6 +29,13 @@ logger = logging.getLogger(__name__)
 
 HTTP_OK = 200
 
+# Maximum batches waiting between pipeline stages (crawl -> embed -> upload) before the producer blocks
+PIPELINE_QUEUE_SIZE = 2
+
+# Longest a request handler waits for room in a backed-up ingest pipeline, kept well under the 60s
+# request handler timeout. Documents stay buffered in `document_batch` if the wait runs out.
+PIPELINE_PUT_TIMEOUT = 30.0
+
 
 class TaxDataCrawler:
     """Base crawler for scraping Canadian tax documentation."""
@@ -37,6 +48,8 @@ class TaxDataCrawler:
         use_qdrant: bool = False,
         qdrant_url: str | None = None,
         qdrant_api_key: str | None = None,
+        allowed_patterns: UrlPatterns | None = None,
+        excluded_patterns: UrlPatterns | None = None,
     ) -> None:
         """Initialize the crawler with settings.
 
@@ -46,6 +59,8 @@ class TaxDataCrawler:
             use_qdrant: Enable Qdrant Cloud vector database integration.
             qdrant_url: Qdrant Cloud URL (e.g., 'https://xyz.cloud.qdrant.io').
             qdrant_api_key: API key for Qdrant Cloud authentication.
+            allowed_patterns: Compiled URL patterns discovered links must match (see `compile_url_patterns`).
+            excluded_patterns: Compiled URL patterns discovered links must not match.
         """
         self.settings = settings or Settings()
 
@@ -54,7 +69,11 @@ class TaxDataCrawler:
 
         # Initialize site router and link extractor
         self.site_router = SiteRouter()
-        self.link_extractor = LinkExtractor(max_depth=max_depth)
+        self.link_extractor = LinkExtractor(
+            max_depth=max_depth,
+            allowed_patterns=allowed_patterns,
+            excluded_patterns=excluded_patterns,
+        )
 
         # Initialize Qdrant Cloud integration
         self.use_qdrant = use_qdrant
@@ -80,18 +99,48 @@ class TaxDataCrawler:
                 collection_name=self.settings.QDRANT_COLLECTION,
                 source=self.settings.QDRANT_SOURCE,
                 vector_size=1536,
+                upsert_batch_size=self.settings.UPSERT_BATCH_SIZE,
+                upsert_concurrency=self.settings.UPSERT_CONCURRENCY,
+                sparse_service=(
+                    SparseEmbeddingService(parallel=self.settings.SPARSE_EMBEDDING_PARALLEL)
+                    if self.settings.SPARSE_EMBEDDING_LOCAL
+                    else None
+                ),
+                prefer_grpc=self.settings.QDRANT_PREFER_GRPC,
+                cloud_inference=not self.settings.SPARSE_EMBEDDING_LOCAL,
             )
             self.embedding_service = EmbeddingService(
-                model_name=self.settings.EMBEDDING_MODEL, api_key=self.settings.OPENAI_API_KEY
+                model_name=self.settings.EMBEDDING_MODEL,
+                api_key=self.settings.OPENAI_API_KEY,
+                max_concurrent_requests=self.settings.EMBEDDING_CONCURRENCY,
+                use_batch_api=self.settings.EMBEDDING_BATCH_API,
             )
             logger.info('✓ Qdrant Cloud integration ready')
         else:
             self.qdrant_client = None
             self.embedding_service = None
 
-        # Batch storage for efficiency (NEW)
-        self.document_batch = []
-        self.batch_size = self.settings.EMBEDDING_BATCH_SIZE if use_qdrant else 0
+        # Batch storage for efficiency (NEW). A plain list: full batches are handed off by swapping in
+        # a fresh list, so there is nothing to copy and no buffer to reuse
+        self.document_batch: list[dict[str, Any]] = []
+        if not use_qdrant:
+            self.batch_size = 0
+        elif self.settings.EMBEDDING_BATCH_API:
+            # Batch API jobs take hours regardless of size, so each one covers many documents
+            self.batch_size = self.settings.EMBEDDING_BATCH_API_SIZE
+        else:
+            self.batch_size = self.settings.EMBEDDING_BATCH_SIZE
+
+        # Ingest pipeline queues, only set while `run()` is active
+        self._document_queue: asyncio.Queue[list[dict[str, Any]] | None] | None = None
+        self._chunk_queue: asyncio.Queue[EmbeddedChunks | None] | None = None
+        self._pipeline_tasks: list[asyncio.Task[None]] = []
+        # Batch API mode: one background task per submitted batch, dropped once it finishes and
+        # awaited when the pipeline stops. At most EMBEDDING_BATCH_API_MAX_JOBS run at once.
+        self._batch_api_tasks: set[asyncio.Task[bool]] = set()
+        self._batch_api_semaphore = asyncio.Semaphore(self.settings.EMBEDDING_BATCH_API_MAX_JOBS)
+        # Held by the one request handler handing a full batch to the pipeline
+        self._handoff_lock = asyncio.Lock()
 
         # Create HTTP client with custom headers and user-agent rotation
         http_client = HttpxHttpClient(
@@ -105,6 +154,7 @@ class TaxDataCrawler:
                 'Upgrade-Insecure-Requests': '1',
             },
             timeout=self.settings.REQUEST_TIMEOUT,
+            verify=get_ssl_context(),
         )
 
         # Add statistics tracker
@@ -149,7 +199,9 @@ class TaxDataCrawler:
                     # Add to Qdrant batch if enabled (NEW)
                     if self.use_qdrant:
                         # Convert TaxDocument to dict for batching
-                        doc_dict = result.model_dump() if hasattr(result, 'model_dump') else cast(dict[str, Any], result)
+                        doc_dict = (
+                            result.model_dump() if hasattr(result, 'model_dump') else cast(dict[str, Any], result)
+                        )
                         await self._store_document(doc_dict)
                 else:
                     self.stats.record_failure()
@@ -168,10 +220,7 @@ class TaxDataCrawler:
                 context.log.info(f'Found {len(links)} valid links at depth {current_depth}')
 
                 # Enqueue discovered links with depth tracking
-                requests = [
-                    Request.from_url(link, user_data={'depth': current_depth + 1})
-                    for link in links
-                ]
+                requests = [Request.from_url(link, user_data={'depth': current_depth + 1}) for link in links]
                 await context.add_requests(requests)
 
     async def _store_document(self, doc_data: dict[str, Any]) -> None:
@@ -185,40 +234,101 @@ class TaxDataCrawler:
 
         self.document_batch.append(doc_data)
 
-        # Flush batch when it reaches batch_size
-        if len(self.document_batch) >= self.batch_size:
-            await self._flush_batch()
+        # Flush batch when it reaches batch_size, unless another handler is already handing it off
+        # (it takes this document along)
+        if len(self.document_batch) >= self.batch_size and not self._handoff_lock.locked():
+            await self._flush_batch(timeout=PIPELINE_PUT_TIMEOUT)
+
+    async def _flush_batch(self, timeout: float | None = None) -> None:
+        """Flush document batch to Qdrant as hybrid (dense + sparse) chunks.
+
+        While `run()` is active, the batch is handed to the ingest pipeline, or to a background task
+        in Batch API mode. Otherwise it is embedded and stored inline.
 
-    async def _flush_batch(self) -> None:
-        """Flush document batch to Qdrant as hybrid (dense + sparse) chunks."""
+        Args:
+            timeout: Seconds to wait for room in a backed-up ingest pipeline before giving up and
+                leaving the documents in `document_batch` for a later flush. None waits indefinitely.
+        """
         if not self.document_batch:
             return
 
-        # Type narrowing: these are guaranteed to be set when use_qdrant is True
-        assert self.embedding_service is not None
-        assert self.qdrant_client is not None
+        if self._document_queue is not None and self.settings.EMBEDDING_BATCH_API:
+            # Batch API jobs can take up to 24h, so each batch is embedded in its own task, awaited
+            # when the pipeline stops, instead of holding a pipeline slot and the crawl behind it
+            batch, self.document_batch = self.document_batch, []
+            task = asyncio.create_task(self._run_batch_api_job(batch))
+            self._batch_api_tasks.add(task)
+            task.add_done_callback(self._batch_api_tasks.discard)
+            return
 
-        try:
-            logger.info(f'Flushing batch of {len(self.document_batch)} documents to Qdrant')
+        if self._document_queue is not None:
+            async with self._handoff_lock:
+                # Swapped out first, so documents added by other handlers during the wait cannot land in a
+                # list the embed worker is already reading
+                batch, self.document_batch = self.document_batch, []
+                try:
+                    await asyncio.wait_for(self._document_queue.put(batch), timeout)
+                except BaseException as e:
+                    # Not queued (timed out or the handler was cancelled): put the batch back ahead of
+                    # anything buffered meanwhile. asyncio.TimeoutError is the builtin only from 3.11.
+                    self.document_batch[:0] = batch
+                    if not isinstance(e, asyncio.TimeoutError):
+                        raise
+                    logger.warning('Ingest pipeline backed up, keeping %d documents buffered', len(self.document_batch))
+            return
 
-            # Generate chunks with dense embeddings and metadata
-            # Returns list of (chunk_text, dense_embedding, metadata) tuples
-            # BM25 sparse vectors are computed by Qdrant from the chunk text at upsert time
-            dense_chunks = await self.embedding_service.embed_documents(self.document_batch)
+        if await self._ingest_documents(self.document_batch):
+            self.document_batch = []
 
-            logger.info(f'Generated {len(dense_chunks)} chunks from {len(self.document_batch)} documents')
+    async def _run_batch_api_job(self, documents: list[dict[str, Any]]) -> bool:
+        """Ingest one batch through the Batch API once fewer than EMBEDDING_BATCH_API_MAX_JOBS jobs are running."""
+        async with self._batch_api_semaphore:
+            return await self._ingest_documents(documents)
 
-            # Store chunks in Qdrant (BM25 sparse vector computed server-side from chunk_text)
-            await self.qdrant_client.store_documents(dense_chunks)
+    async def _ingest_documents(self, documents: list[dict[str, Any]]) -> bool:
+        """Embed documents and store their chunks in Qdrant, logging (not raising) any failure.
 
-            logger.info('✓ Batch flushed successfully')
+        Args:
+            documents: Document dictionaries to ingest.
 
-            # Clear batch
-            self.document_batch = []
+        Returns:
+            True if the documents were stored, False if embedding or storing failed.
+        """
+        embedding_service = self._get_embedding_service()
+        qdrant_client = self._get_qdrant_client()
+
+        try:
+            logger.info('Flushing batch of %d documents to Qdrant', len(documents))
+
+            # Generate chunks with dense embeddings and metadata
+            # Returns parallel (chunk_texts, embedding_matrix, metadata) arrays
+            # BM25 sparse vectors are computed from chunk_texts by the Qdrant client at upload time
+            texts, vectors, metadata = await embedding_service.embed_documents(documents)
+
+            logger.info('Generated %d chunks from %d documents', len(texts), len(documents))
+
+            # Store chunks in Qdrant (BM25 sparse vectors computed per upload batch)
+            await qdrant_client.store_documents(texts, vectors, metadata)
 
         except Exception:
             logger.exception('Error flushing batch')
             # Don't re-raise - we don't want to stop the crawler
+            return False
+
+        logger.info('✓ Batch flushed successfully')
+        return True
+
+    def _get_embedding_service(self) -> EmbeddingService:
+        """Return the embedding service, which is only set up when Qdrant integration is enabled."""
+        if self.embedding_service is None:
+            raise RuntimeError('Embedding service is not configured. Create the crawler with use_qdrant=True.')
+        return self.embedding_service
+
+    def _get_qdrant_client(self) -> TaxDataQdrantClient:
+        """Return the Qdrant client, which is only set up when Qdrant integration is enabled."""
+        if self.qdrant_client is None:
+            raise RuntimeError('Qdrant client is not configured. Create the crawler with use_qdrant=True.')
+        return self.qdrant_client
 
     async def run(self, start_urls: list[str], crawl_type: str = 'standard') -> None:
         """Run the crawler with the given start URLs.
@@ -227,12 +337,29 @@ class TaxDataCrawler:
             start_urls: List of URLs to start crawling from.
             crawl_type: Type of crawl for metrics tracking ('daily', 'weekly-deep', 'standard')
         """
-        await self.crawler.run(start_urls)
+        async with contextlib.AsyncExitStack() as stack:
+            if self.use_qdrant:
+                qdrant_client = self._get_qdrant_client()
+
+                # Fail before crawling if the collection is missing or misconfigured
+                await qdrant_client.validate()
+                if self.settings.QDRANT_QUANTIZE:
+                    await qdrant_client.enable_quantization()
+                if self.settings.QDRANT_BULK_MODE:
+                    # Indexing resumes once the pipeline below has drained
+                    await stack.enter_async_context(qdrant_client.bulk_mode())
+                self._start_ingest_pipeline()
+
+            try:
+                await self.crawler.run(start_urls)
 
-        # Flush any remaining documents in batch (NEW)
-        if self.use_qdrant and self.document_batch:
-            logger.info(f'Flushing final batch of {len(self.document_batch)} documents')
-            await self._flush_batch()
+                # Flush any remaining documents in batch (NEW)
+                if self.use_qdrant and self.document_batch:
+                    logger.info(f'Flushing final batch of {len(self.document_batch)} documents')
+                    await self._flush_batch()
+            finally:
+                if self.use_qdrant:
+                    await self._stop_ingest_pipeline()
 
         # Log statistics after crawl completes
         summary = self.stats.summary()
@@ -249,7 +376,13 @@ class TaxDataCrawler:
 
         # Log Qdrant statistics if enabled (NEW)
         if self.use_qdrant and self.qdrant_client:
-            doc_count = self.qdrant_client.count_documents()
+            # Make every upsert from this crawl visible before counting
+            try:
+                await self.qdrant_client.flush()
+            except Exception:
+                # flush() logs the error; still count and write metrics for the finished crawl
+                logger.warning('Could not confirm all upserts were applied, the document count may be low')
+            doc_count = await self.qdrant_client.count_documents()
             logger.info('\nQdrant Documents: %d', doc_count)
 
         logger.info('%s\n', '=' * 50)
@@ -257,6 +390,75 @@ class TaxDataCrawler:
         # Write metrics to JSONL file for GitHub Actions artifact upload
         self._write_metrics(crawl_type)
 
+    def _start_ingest_pipeline(self) -> None:
+        """Start the embedding and upload stages of the ingest pipeline.
+
+        Document batches flow crawl -> embed -> upload through bounded queues, so OpenAI requests
+        for one batch overlap with Qdrant upserts for the previous one and with ongoing crawling.
+        When a queue is full the producing stage waits, throttling the crawl instead of buffering
+        unbounded batches in memory.
+        """
+        self._document_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        self._chunk_queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        self._pipeline_tasks = [
+            asyncio.create_task(self._embed_worker(self._document_queue, self._chunk_queue)),
+            asyncio.create_task(self._upload_worker(self._chunk_queue)),
+        ]
+
+    async def _stop_ingest_pipeline(self) -> None:
+        """Drain the ingest pipeline and wait for all queued batches to be stored."""
+        if self._document_queue is None:
+            return
+
+        await self._document_queue.put(None)
+
+        # Each Batch API job stores its own results, so one failed job must not drop the others
+        results = await asyncio.gather(*self._batch_api_tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.error('Batch API job failed', exc_info=result)
+        await asyncio.gather(*self._pipeline_tasks)
+
+        self._document_queue = None
+        self._chunk_queue = None
+        self._pipeline_tasks = []
+        self._batch_api_tasks.clear()
+
+    async def _embed_worker(
+        self,
+        document_queue: asyncio.Queue[list[dict[str, Any]] | None],
+        chunk_queue: asyncio.Queue[EmbeddedChunks | None],
+    ) -> None:
+        """Embed document batches from `document_queue` and pass the chunks on to `chunk_queue`."""
+        embedding_service = self._get_embedding_service()
+
+        while (documents := await document_queue.get()) is not None:
+            try:
+                logger.info('Flushing batch of %d documents to Qdrant', len(documents))
+                chunks = await embedding_service.embed_documents(documents)
+            except Exception:
+                logger.exception('Error flushing batch')
+                # Don't re-raise - we don't want to stop the crawler
+                continue
+
+            logger.info('Generated %d chunks from %d documents', len(chunks[0]), len(documents))
+            await chunk_queue.put(chunks)
+
+        await chunk_queue.put(None)
+
+    async def _upload_worker(self, chunk_queue: asyncio.Queue[EmbeddedChunks | None]) -> None:
+        """Store chunk batches from `chunk_queue` in Qdrant."""
+        qdrant_client = self._get_qdrant_client()
+
+        while (chunks := await chunk_queue.get()) is not None:
+            try:
+                await qdrant_client.store_documents(*chunks)
+            except Exception:  # noqa: PERF203
+                logger.exception('Error flushing batch')
+                # Don't re-raise - we don't want to stop the crawler
+            else:
+                logger.info('✓ Batch flushed successfully')
+
     def _write_metrics(self, crawl_type: str) -> None:
         """Write crawl metrics to a JSONL file for persistent tracking.
 
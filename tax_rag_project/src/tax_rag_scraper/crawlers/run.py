@@ -0,0 +1,114 @@
+"""Shared entry point for the active-crawler scrapers."""
+
+import logging
+import os
+import sys
+from typing import Any
+
+from tax_rag_scraper.config.env import ensure_env_loaded
+from tax_rag_scraper.config.settings import Settings
+from tax_rag_scraper.crawlers.base_crawler import TaxDataCrawler
+from tax_rag_scraper.storage._client_pool import close_qdrant_clients
+from tax_rag_scraper.utils.url_filter import UrlPatterns
+
+logger = logging.getLogger(__name__)
+
+
+async def run_scraper(
+    start_urls: list[str],
+    allowed_patterns: UrlPatterns,
+    excluded_patterns: UrlPatterns,
+    crawl_config: dict[str, Any],
+) -> None:
+    """Validate credentials, configure settings, and run a scraper to completion.
+
+    Exits the process with status 1 if required credentials or start URLs are missing.
+
+    Args:
+        start_urls: URLs to start crawling from.
+        allowed_patterns: Compiled URL patterns discovered links must match.
+        excluded_patterns: Compiled URL patterns discovered links must not match.
+        crawl_config: Scraper configuration with keys NAME, TARGET, MAX_DEPTH, MAX_CONCURRENCY,
+            MAX_REQUESTS, CRAWL_TYPE, COLLECTION and SOURCE.
+    """
+    # Load environment variables
+    ensure_env_loaded()
+
+    # Validate required credentials
+    qdrant_url = os.getenv('QDRANT_URL')
+    qdrant_api_key = os.getenv('QDRANT_API_KEY')
+    openai_api_key = os.getenv('OPENAI_API_KEY')
+
+    if not qdrant_url:
+        logger.error('\n[ERROR] QDRANT_URL environment variable not set')
+        logger.error('\nTo use Qdrant Cloud:')
+        logger.error('  1. Visit https://cloud.qdrant.io')
+        logger.error('  2. Create a free account (1GB storage included)')
+        logger.error('  3. Create a new cluster')
+        logger.error('  4. Copy your cluster URL')
+        logger.error('  5. Add to .env file or GitHub Secrets:')
+        logger.error('     QDRANT_URL=https://your-cluster.cloud.qdrant.io')
+        logger.error('     QDRANT_API_KEY=your-api-key')
+        sys.exit(1)
+
+    if not qdrant_api_key:
+        logger.error('\n[ERROR] QDRANT_API_KEY environment variable not set')
+        logger.error('\nGet your API key from https://cloud.qdrant.io')
+        logger.error('Add to .env file or GitHub Secrets: QDRANT_API_KEY=your-api-key')
+        sys.exit(1)
+
+    if not openai_api_key:
+        logger.error('\n[ERROR] OPENAI_API_KEY environment variable not set')
+        logger.error('\nGet your API key from https://platform.openai.com/api-keys')
+        logger.error('Add to .env file or GitHub Secrets: OPENAI_API_KEY=sk-proj-...')
+        sys.exit(1)
+
+    logger.info('[OK] Qdrant Cloud URL: %s', qdrant_url)
+    logger.info('[OK] OpenAI API key configured')
+
+    # Validate configuration
+    if not start_urls or start_urls[0].startswith('https://example.com'):
+        logger.error('\n[ERROR] START_URLS not configured')
+        logger.error('\nPlease update the START_URLS in %s_scraper.py', crawl_config['SOURCE'])
+        logger.error('Add the target URLs for %s', crawl_config['TARGET'])
+        sys.exit(1)
+
+    # Configure settings with scraper overrides
+    settings = Settings()
+    settings.MAX_CRAWL_DEPTH = crawl_config['MAX_DEPTH']
+    settings.MAX_CONCURRENCY = crawl_config['MAX_CONCURRENCY']
+    settings.MAX_REQUESTS_PER_CRAWL = crawl_config['MAX_REQUESTS']
+    settings.QDRANT_COLLECTION = crawl_config['COLLECTION']
+    settings.QDRANT_SOURCE = crawl_config['SOURCE']
+
+    logger.info('\n[INFO] Starting %s Scraper', crawl_config['NAME'])
+    logger.info('[INFO] Target: %s', crawl_config['TARGET'])
+    logger.info('[INFO] Collection: %s', settings.QDRANT_COLLECTION)
+    logger.info('[INFO] Max requests: %d', settings.MAX_REQUESTS_PER_CRAWL)
+    logger.info('[INFO] Max depth: %d', settings.MAX_CRAWL_DEPTH)
+    logger.info('[INFO] Concurrency: %d', settings.MAX_CONCURRENCY)
+    logger.info('[INFO] Start URLs:')
+    for url in start_urls:
+        logger.info('  - %s', url)
+    logger.info('')
+
+    # Create crawler with Qdrant Cloud integration
+    crawler = TaxDataCrawler(
+        settings=settings,
+        max_depth=crawl_config['MAX_DEPTH'],
+        use_qdrant=settings.USE_QDRANT,
+        qdrant_url=qdrant_url,
+        qdrant_api_key=qdrant_api_key,
+        allowed_patterns=allowed_patterns,
+        excluded_patterns=excluded_patterns,
+    )
+
+    # Run the crawler, then close the shared Qdrant connections
+    try:
+        await crawler.run(start_urls, crawl_type=crawl_config['CRAWL_TYPE'])
+    finally:
+        await close_qdrant_clients()
+
+    logger.info('\n[OK] %s scraper complete.', crawl_config['NAME'])
+    logger.info('[OK] Check storage/datasets/default/ for results.')
+    logger.info('[OK] View your data in Qdrant Cloud: https://cloud.qdrant.io')
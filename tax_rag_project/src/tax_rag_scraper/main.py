@@ -5,10 +5,8 @@ import asyncio
 import logging
 import os
 import sys
-from pathlib import Path
-
-from dotenv import load_dotenv
 
+from tax_rag_scraper.config.env import ensure_env_loaded
 from tax_rag_scraper.config.settings import Settings
 from tax_rag_scraper.crawlers.base_crawler import TaxDataCrawler
 
@@ -61,12 +59,7 @@ async def main() -> None:
     args = parse_arguments()
 
     # Load environment variables
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    if env_path.exists():
-        load_dotenv(env_path)
-        logger.info('[OK] Loaded environment from .env')
-    else:
-        logger.warning('[WARNING] .env file not found, using environment variables')
+    ensure_env_loaded()
 
     # Validate required Qdrant Cloud credentials
     qdrant_url = os.getenv('QDRANT_URL')
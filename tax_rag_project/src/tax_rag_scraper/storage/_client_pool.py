@@ -0,0 +1,79 @@
+"""Process-wide Qdrant clients shared across scrapers and collections."""
+
+from qdrant_client import AsyncQdrantClient
+
+# Connections per client: gRPC channels requests are spread over round-robin (qdrant-client defaults to 3),
+# and the cap on REST connections. Enough for several scrapers' concurrent upserts in one process.
+# The pool_size argument needs qdrant-client>=1.16; older versions pass it on to httpx, which rejects it.
+POOL_SIZE = 16
+
+# Qdrant's gRPC port; all requests go over protobuf + HTTP/2 instead of JSON.
+# Qdrant Cloud serves gRPC on this port too; self-hosted setups behind a single proxy port may need to change it.
+GRPC_PORT = 6334
+
+# Seconds before a request is abandoned (large upserts can exceed the 5s default)
+REQUEST_TIMEOUT = 60
+
+_clients: dict[tuple[str, str, bool, bool], AsyncQdrantClient] = {}
+
+
+def get_qdrant_client(
+    url: str,
+    api_key: str,
+    *,
+    prefer_grpc: bool = True,
+    cloud_inference: bool = False,
+) -> AsyncQdrantClient:
+    """Return the shared async client for a Qdrant endpoint, creating it on first use.
+
+    Every `TaxDataQdrantClient` pointing at the same cluster reuses one client, and therefore one
+    pool of TCP+TLS connections, instead of paying a fresh handshake per scraper.
+
+    By default the client prefers gRPC, so large upserts are serialized as protobuf rather than JSON, which
+    is much cheaper for float vectors, and spreads requests over `POOL_SIZE` channels. Where port 6334 is
+    blocked, `prefer_grpc=False` falls back to REST; request bodies are then encoded by pydantic-core's
+    Rust JSON serializer, so no faster JSON library is needed. TLS is used for https URLs.
+
+    `models.Document` inputs (BM25 text for the sparse vectors) are embedded by qdrant-client itself,
+    synchronously with a local FastEmbed model, unless `cloud_inference` is set, in which case the text is
+    sent as-is and the Qdrant server computes the vectors.
+
+    Construction performs no I/O and never awaits, so the check-and-insert below cannot interleave
+    with another coroutine and needs no lock.
+
+    Args:
+        url: Qdrant Cloud URL (e.g., 'https://xyz.cloud.qdrant.io')
+        api_key: API key for authentication
+        prefer_grpc: Send requests over gRPC (True) or REST (False)
+        cloud_inference: Have the server embed `models.Document` inputs (qdrant-client>=1.13, within the
+            >=1.16 pin that `pool_size` needs)
+
+    Returns:
+        The shared `AsyncQdrantClient` for this combination of arguments.
+    """
+    key = (url, api_key, prefer_grpc, cloud_inference)
+    client = _clients.get(key)
+    if client is None:
+        client = AsyncQdrantClient(
+            url=url,
+            api_key=api_key,
+            prefer_grpc=prefer_grpc,
+            grpc_port=GRPC_PORT,
+            pool_size=POOL_SIZE,
+            timeout=REQUEST_TIMEOUT,
+            cloud_inference=cloud_inference,
+        )
+        _clients[key] = client
+    return client
+
+
+async def close_qdrant_clients() -> None:
+    """Close every shared client and its connections.
+
+    Call once when the process has finished talking to Qdrant. A later `get_qdrant_client` call
+    creates a fresh client.
+    """
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.close()
@@ -1,18 +1,116 @@
 """Qdrant Cloud client for storing tax documentation with hybrid vector embeddings."""
 
+import asyncio
+import contextlib
+import copy
+import functools
+import hashlib
 import logging
+import time
 import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+from http import HTTPStatus
 from typing import Any
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import Document, PointStruct, Prefetch
+import grpc
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+from qdrant_client.models import (
+    Document,
+    Fusion,
+    FusionQuery,
+    OptimizersConfigDiff,
+    PointIdsList,
+    PointStruct,
+    Prefetch,
+    QuantizationSearchParams,
+    QueryRequest,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SparseVector,
+    VectorParamsDiff,
+)
+
+from tax_rag_scraper.storage._client_pool import get_qdrant_client
+from tax_rag_scraper.utils.embeddings import SparseEmbeddingService
 
 logger = logging.getLogger(__name__)
 
+# Upsert tuning: points per request and number of requests in flight at once
+DEFAULT_UPSERT_BATCH_SIZE = 128
+DEFAULT_UPSERT_CONCURRENCY = 4
+
+# Attempts per upsert batch on transient errors (unavailable, overloaded, timed out), with 1s, 2s, ... backoff
+UPSERT_MAX_ATTEMPTS = 3
+_TRANSIENT_GRPC_CODES = frozenset(
+    {grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED, grpc.StatusCode.RESOURCE_EXHAUSTED}
+)
+_TRANSIENT_HTTP_STATUSES = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    }
+)
+
+# Seconds a `get_collection` response is reused by count_documents/get_collection_info before refreshing
+COLLECTION_INFO_CACHE_TTL = 5.0
+
+# Maximum number of distinct (query_text, query_vector, limit) results kept by `search`
+SEARCH_CACHE_SIZE = 512
+
+# Scalar int8 quantization for the dense vector, as recommended by `validate` and applied by `enable_quantization`
+DENSE_QUANTIZATION_CONFIG = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+)
+
+# Dense search tuning. hnsw_ef=128 keeps the HNSW candidate list well above the largest dense prefetch
+# (MAX_PREFETCH_LIMIT), so the candidates handed to fusion keep near-exact recall.
+# Over a quantized collection, 2x `limit` candidates are fetched with int8 vectors and rescored with the original
+# float32 vectors to keep recall; collections without quantization ignore that part.
+DENSE_SEARCH_PARAMS = SearchParams(
+    hnsw_ef=128,
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0),
+)
+
+# Candidates fetched per leg of a hybrid search: 2x `limit`, capped so large limits do not scan deep into either index
+MAX_PREFETCH_LIMIT = 50
+
+# Queries with fewer whitespace-separated tokens than this skip the BM25 leg and run a dense-only search,
+# since the sparse leg dominates hybrid latency and a single keyword adds little over its embedding
+MIN_HYBRID_QUERY_TOKENS = 2
+
+# Qdrant's default indexing threshold (KB of vectors per segment before an HNSW index is built)
+DEFAULT_INDEXING_THRESHOLD = 20000
+
+# (url, collection_name, source, vector_size) combinations already validated in this process
+_validated_collections: set[tuple[str, str, str, int]] = set()
+
+# Document-level payload fields (point payload key -> chunk metadata key). They are stored once per
+# document, on its first chunk, and joined back onto the other chunks' search results via `doc_id`.
+DOCUMENT_PAYLOAD_FIELDS = {
+    'title': 'parent_title',
+    'url': 'parent_url',
+    'source': 'parent_source',
+    'doc_type': 'parent_doc_type',
+    'scraped_at': 'parent_scraped_at',
+}
+_DOCUMENT_PAYLOAD_ITEMS = tuple(DOCUMENT_PAYLOAD_FIELDS.items())
+
+_NAMESPACE_URL_BYTES = uuid.NAMESPACE_URL.bytes
+
 
 class TaxDataQdrantClient:
     """Client for interacting with Qdrant Cloud vector database.
 
+    All requests go through a shared async gRPC client, so no call blocks the event loop.
+    Use `create` to construct a client and validate its collection in one step.
+
     This client handles:
     - Collection validation (collections must be created manually in Qdrant UI)
     - Document storage with hybrid (dense + sparse) named vectors
@@ -27,15 +125,34 @@ class TaxDataQdrantClient:
         collection_name: str,
         source: str,
         vector_size: int = 1536,
+        upsert_batch_size: int = DEFAULT_UPSERT_BATCH_SIZE,
+        upsert_concurrency: int = DEFAULT_UPSERT_CONCURRENCY,
+        client: AsyncQdrantClient | None = None,
+        sparse_service: SparseEmbeddingService | None = None,
+        *,
+        prefer_grpc: bool = True,
+        cloud_inference: bool = False,
     ) -> None:
         """Initialize Qdrant Cloud client.
 
+        Construction performs no I/O; call `validate` (or use `create`) before storing documents.
+
         Args:
             url: Qdrant Cloud URL (e.g., 'https://xyz.cloud.qdrant.io')
             api_key: API key for authentication
             collection_name: Name of the collection (e.g., 'cra-collection')
             source: Source prefix for named vectors (e.g., 'cra' -> 'cra-dense', 'cra-sparse')
             vector_size: Dimension of dense embedding vectors (default: 1536 for OpenAI text-embedding-3-small)
+            upsert_batch_size: Maximum number of points sent in a single upsert request
+            upsert_concurrency: Maximum number of upsert requests in flight at once
+            client: Async client to use (default: the shared client for this url/api_key)
+            sparse_service: Computes BM25 sparse vectors before upload. If None, chunk and query text is
+                sent as a `Document` and the BM25 vector is computed during the upsert or query call.
+            prefer_grpc: Use gRPC for the shared client; set False where the gRPC port is unreachable.
+                Ignored when `client` is given.
+            cloud_inference: Have the Qdrant server compute BM25 vectors for `Document`s (use with
+                `sparse_service=None`). Without it, qdrant-client computes them locally, blocking the
+                event loop. Ignored when `client` is given.
         """
         self.url = url
         self.api_key = api_key
@@ -44,45 +161,98 @@ class TaxDataQdrantClient:
         self.vector_size = vector_size
         self.dense_vector_name = f'{source}-dense'
         self.sparse_vector_name = f'{source}-sparse'
+        self.upsert_batch_size = upsert_batch_size
+        self.upsert_concurrency = upsert_concurrency
+        self.sparse_service = sparse_service
 
-        # Initialize Qdrant client
-        self.client = QdrantClient(
-            url=url,
-            api_key=api_key,
+        # (fetched_at, info) from the last get_collection call, and chunks stored by this client since then
+        self._info_cache: tuple[float, Any] | None = None
+        self._stored_since_info = 0
+
+        # LRU cache of search results, cleared whenever this client writes to or deletes the collection
+        self._search_cache: OrderedDict[tuple[str | None, bytes, int], list[Any]] = OrderedDict()
+
+        # Async client, shared per (url, api_key, transport) so every scraper in the process reuses one connection pool
+        self.client = client or get_qdrant_client(
+            url, api_key, prefer_grpc=prefer_grpc, cloud_inference=cloud_inference
         )
 
-        # Validate that collection exists (must be created manually in Qdrant UI)
-        self._validate_collection_exists()
+    @classmethod
+    async def create(
+        cls,
+        url: str,
+        api_key: str,
+        collection_name: str,
+        source: str,
+        *,
+        force_revalidate: bool = False,
+        **kwargs: Any,
+    ) -> 'TaxDataQdrantClient':
+        """Create a client and validate its collection.
+
+        Args:
+            url: Qdrant Cloud URL (e.g., 'https://xyz.cloud.qdrant.io')
+            api_key: API key for authentication
+            collection_name: Name of the collection (e.g., 'cra-collection')
+            source: Source prefix for named vectors (e.g., 'cra' -> 'cra-dense', 'cra-sparse')
+            force_revalidate: Validate even if this collection was already validated in this process.
+            **kwargs: Further arguments for `TaxDataQdrantClient`.
+
+        Raises:
+            RuntimeError: If the collection is missing or misconfigured.
+        """
+        client = cls(url, api_key, collection_name, source, **kwargs)
+        await client.validate(force_revalidate=force_revalidate)
+        return client
+
+    async def validate(self, *, force_revalidate: bool = False) -> None:
+        """Validate that the collection exists and is configured correctly, once per process.
 
-    def _validate_collection_exists(self) -> None:
+        Args:
+            force_revalidate: Validate even if this collection was already validated in this process,
+                e.g. after it was recreated.
+
+        Raises:
+            RuntimeError: If the collection is missing or misconfigured.
+        """
+        validation_key = (self.url, self.collection_name, self.source, self.vector_size)
+        if validation_key in _validated_collections and not force_revalidate:
+            return
+
+        await self._validate_collection_exists()
+        _validated_collections.add(validation_key)
+
+    async def _validate_collection_exists(self) -> None:
         """Validate that the collection and its vector configurations are correct.
 
+        Uses a single `get_collection` call; a not-found response means the collection does not exist.
+
         Checks:
         - Collection exists with the configured name
         - Dense vector '{source}-dense' exists with size=1536 and Cosine distance
         - Sparse vector '{source}-sparse' exists with modifier=IDF (required for BM25)
+        - Scalar int8 quantization is configured (recommended; only a warning is logged if missing)
 
         Raises:
             RuntimeError: If any validation check fails.
         """
         try:
-            # 1. Confirm collection exists
-            collections = self.client.get_collections().collections
-            collection_names = [c.name for c in collections]
-
-            if self.collection_name not in collection_names:
+            # 1. Fetch full collection config to inspect vector settings (not found if it does not exist)
+            try:
+                info = await self._get_collection_cached(refresh=True)
+            except (UnexpectedResponse, grpc.RpcError) as e:
+                if not _is_not_found(e):
+                    raise
                 raise RuntimeError(
                     f"Collection '{self.collection_name}' does not exist in Qdrant Cloud.\n"
-                    f"\n"
-                    f"Please create it manually in the Qdrant UI (https://cloud.qdrant.io) with:\n"
+                    f'\n'
+                    f'Please create it manually in the Qdrant UI (https://cloud.qdrant.io) with:\n'
                     f"  - Dense vector:  '{self.dense_vector_name}' (size={self.vector_size}, distance=Cosine)\n"
                     f"  - Sparse vector: '{self.sparse_vector_name}' (modifier=IDF, required for BM25)\n"
-                )
+                    f'  - Quantization:  scalar int8 (quantile=0.99, always_ram=true), recommended\n'
+                ) from e
 
-            # 2. Fetch full collection config to inspect vector settings
-            info = self.client.get_collection(self.collection_name)
-
-            # 3. Validate dense vector name, dimensions, and distance
+            # 2. Validate dense vector name, dimensions, and distance
             vectors = info.config.params.vectors
             if not isinstance(vectors, dict) or self.dense_vector_name not in vectors:
                 raise RuntimeError(
@@ -96,19 +266,19 @@ class TaxDataQdrantClient:
             if dense_config.size != self.vector_size:
                 raise RuntimeError(
                     f"Dense vector '{self.dense_vector_name}' has size={dense_config.size}, "
-                    f"but expected size={self.vector_size}. "
-                    f"Recreate the collection with the correct vector size."
+                    f'but expected size={self.vector_size}. '
+                    f'Recreate the collection with the correct vector size.'
                 )
 
             distance_value = getattr(dense_config.distance, 'value', dense_config.distance)
             if distance_value.lower() != 'cosine':
                 raise RuntimeError(
                     f"Dense vector '{self.dense_vector_name}' has distance='{distance_value}', "
-                    f"but Cosine distance is required. "
-                    f"Recreate the collection with distance=Cosine."
+                    f'but Cosine distance is required. '
+                    f'Recreate the collection with distance=Cosine.'
                 )
 
-            # 4. Validate sparse vector name
+            # 3. Validate sparse vector name
             # Note: modifier=IDF is not surfaced in the collection config API response,
             # so only presence can be verified here.
             sparse_vectors = info.config.params.sparse_vectors
@@ -117,13 +287,25 @@ class TaxDataQdrantClient:
                     f"Sparse vector '{self.sparse_vector_name}' not found in collection "
                     f"'{self.collection_name}'. "
                     f"Recreate the collection with a named sparse vector '{self.sparse_vector_name}' "
-                    f"and modifier=IDF."
+                    f'and modifier=IDF.'
+                )
+
+            # 4. Recommend scalar quantization (not required: FP32-only collections still work).
+            # It may be configured collection-wide or on the dense vector itself.
+            if info.config.quantization_config is None and dense_config.quantization_config is None:
+                logger.warning(
+                    "Collection '%s' has no quantization configured. "
+                    'Enable scalar int8 quantization (quantile=0.99, always_ram=true) in the Qdrant UI, '
+                    'or set QDRANT_QUANTIZE, to cut dense vector memory ~4x.',
+                    self.collection_name,
                 )
 
             logger.info(
-                f"Collection '{self.collection_name}' validated: "
-                f"dense '{self.dense_vector_name}' (size={self.vector_size}, cosine) ✓  "
-                f"sparse '{self.sparse_vector_name}' ✓"
+                "Collection '%s' validated: dense '%s' (size=%d, cosine) ✓  sparse '%s' ✓",
+                self.collection_name,
+                self.dense_vector_name,
+                self.vector_size,
+                self.sparse_vector_name,
             )
 
         except RuntimeError:
@@ -133,52 +315,314 @@ class TaxDataQdrantClient:
             raise
 
     async def store_documents(
-        self, chunks: list[tuple[str, list[float], dict[str, Any]]]
+        self,
+        texts: list[str],
+        vectors: np.ndarray,
+        metadata: list[dict[str, Any]],
     ) -> None:
         """Store document chunks with hybrid embeddings in Qdrant.
 
-        Each chunk is stored as a separate point with dense and sparse vectors.
-        BM25 sparse vectors are computed by Qdrant using the chunk text directly.
+        Chunks are passed as parallel arrays: row `i` of `vectors` is the dense embedding of
+        `texts[i]`, and `metadata[i]` holds its parent document fields. Each chunk is stored as a
+        separate point with dense and sparse vectors. BM25 sparse vectors are computed once per
+        batch by `sparse_service` (in a worker thread, so the event loop keeps serving uploads),
+        or from the chunk text during upsert if no sparse service is configured.
+
+        Chunks are sent in batches of `upsert_batch_size`, with at most `upsert_concurrency`
+        upsert requests in flight at once. A batch that fails with a transient error is retried,
+        up to `UPSERT_MAX_ATTEMPTS` attempts. Upserts do not wait for the points to be indexed; call
+        `flush` when they must be visible to the next search.
 
         Args:
-            chunks: List of tuples containing (chunk_text, dense_embedding, metadata)
+            texts: Chunk texts.
+            vectors: Dense embeddings, one row per chunk.
+            metadata: Chunk metadata dicts, one per chunk.
+
+        Raises:
+            ValueError: If `texts`, `vectors` and `metadata` differ in length, or `vectors` rows are not
+                `vector_size` wide.
         """
+        if not len(texts) == len(vectors) == len(metadata):
+            raise ValueError(
+                f'Chunk arrays differ in length: {len(texts)} texts, {len(vectors)} vectors, {len(metadata)} metadata'
+            )
+        # One shape check for the whole matrix, rather than letting Qdrant reject each upsert batch
+        if len(vectors) and vectors.shape[1:] != (self.vector_size,):
+            raise ValueError(f'Dense vectors have shape {vectors.shape}, expected (n, {self.vector_size})')
+
+        semaphore = asyncio.Semaphore(self.upsert_concurrency)
+
+        async def upsert_batch(batch: list[PointStruct]) -> None:
+            try:
+                await self._upsert_with_retry(batch)
+            finally:
+                semaphore.release()
+
+        tasks: list[asyncio.Task[None]] = []
         try:
-            points = []
-            for chunk_text, dense_embedding, metadata in chunks:
-                point_id = str(uuid.uuid4())
-
-                point = PointStruct(
-                    id=point_id,
-                    vector={
-                        self.dense_vector_name: dense_embedding,
-                        self.sparse_vector_name: Document(text=chunk_text, model='Qdrant/bm25'),
-                    },
-                    payload={
-                        'chunk_text': chunk_text,
-                        'chunk_index': metadata.get('chunk_index', 0),
-                        'total_chunks': metadata.get('total_chunks', 1),
-                        'title': metadata.get('parent_title', ''),
-                        'url': metadata.get('parent_url', ''),
-                        'source': metadata.get('parent_source', ''),
-                        'doc_type': metadata.get('parent_doc_type', ''),
-                        'scraped_at': metadata.get('parent_scraped_at', ''),
-                    },
-                )
-                points.append(point)
+            for start in range(0, len(texts), self.upsert_batch_size):
+                end = start + self.upsert_batch_size
+                batch_texts = texts[start:end]
+
+                sparse_vectors = None
+                if self.sparse_service is not None:
+                    sparse_vectors = await asyncio.to_thread(self.sparse_service.embed_texts, batch_texts)
+
+                # Wait for a free slot before submitting, so at most `upsert_concurrency` batches are held in memory
+                await semaphore.acquire()
+                points = self._build_points(batch_texts, vectors[start:end], metadata[start:end], sparse_vectors)
+                tasks.append(asyncio.create_task(upsert_batch(points)))
+
+            await asyncio.gather(*tasks)
+
+            self._stored_since_info += len(texts)
+            self.clear_search_cache()
+
+            logger.info("Stored %d chunks in '%s'", len(texts), self.collection_name)
+
+        except BaseException as e:
+            # Don't leave the remaining upserts running unobserved after a failure (or cancellation):
+            # cancel them and wait until they have stopped before raising
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if isinstance(e, Exception):
+                logger.exception('Error storing chunks in Qdrant')
+            raise
+
+    async def _upsert_with_retry(self, points: list[PointStruct]) -> None:
+        """Upsert one batch of points, retrying transient errors with 1s, 2s, ... backoff.
+
+        Point IDs are fixed when the batch is built, so a retried upsert overwrites rather than duplicates.
+        Cancellation, including during a backoff sleep, is never retried.
 
-            self.client.upsert(
+        Args:
+            points: Points to upsert.
+        """
+        for attempt in range(1, UPSERT_MAX_ATTEMPTS + 1):
+            error = await self._try_upsert(points, retryable=attempt < UPSERT_MAX_ATTEMPTS)
+            if error is None:
+                return
+            delay = 2 ** (attempt - 1)
+            logger.warning(
+                'Transient Qdrant error on upsert, retrying in %ds (attempt %d/%d): %s',
+                delay,
+                attempt,
+                UPSERT_MAX_ATTEMPTS,
+                error,
+            )
+            await asyncio.sleep(delay)
+
+    async def _try_upsert(self, points: list[PointStruct], *, retryable: bool) -> Exception | None:
+        """Send one upsert request without waiting for indexing.
+
+        Args:
+            points: Points to upsert.
+            retryable: Whether a transient error is returned for the caller to retry, rather than raised.
+
+        Returns:
+            The transient error if the request failed with one and `retryable` is set, otherwise None.
+        """
+        try:
+            await self.client.upsert(collection_name=self.collection_name, points=points, wait=False)
+        except Exception as e:
+            if not retryable or not _is_transient(e):
+                raise
+            return e
+        return None
+
+    async def bulk_upload(
+        self,
+        texts: list[str],
+        vectors: np.ndarray,
+        metadata: list[dict[str, Any]],
+        *,
+        parallel: int = 4,
+        batch_size: int = 256,
+    ) -> None:
+        """Upload a large set of document chunks using several worker processes.
+
+        Takes the same parallel arrays as `store_documents`, and stores the same points with the same
+        IDs, but hands them to `upload_collection`, which serializes and sends batches from `parallel`
+        OS processes, so protobuf encoding of the dense vectors is not limited by the GIL. Starting the
+        processes costs about a second, so this only pays off for backfills of many thousands of
+        chunks; the crawler's streaming batches use `store_documents`.
+
+        The worker processes are forked from this one, which gRPC does not support while the shared
+        client has channels open, so `parallel` only takes effect on a REST client (`prefer_grpc=False`);
+        over gRPC the upload runs in a single process.
+
+        Args:
+            texts: Chunk texts.
+            vectors: Dense embeddings, one row per chunk.
+            metadata: Chunk metadata dicts, one per chunk.
+            parallel: Number of upload processes (REST clients only).
+            batch_size: Points sent per upsert request by each process.
+
+        Raises:
+            ValueError: If `texts`, `vectors` and `metadata` differ in length.
+        """
+        if not len(texts) == len(vectors) == len(metadata):
+            raise ValueError(
+                f'Chunk arrays differ in length: {len(texts)} texts, {len(vectors)} vectors, {len(metadata)} metadata'
+            )
+
+        if parallel > 1 and self.client.init_options.get('prefer_grpc'):
+            # Worker processes are forked from this process, which holds open gRPC channels in the shared
+            # client; gRPC does not support forking with live channels and the workers can deadlock
+            logger.warning('bulk_upload over gRPC uses one process; use a REST client (prefer_grpc=False) for parallel')
+            parallel = 1
+
+        # Generators: upload_collection pulls one batch at a time, so only `parallel` batches of dense vectors
+        # and sparse vectors exist at once, rather than the whole backfill. They are consumed in the upload
+        # thread, so BM25 embedding runs off the event loop.
+        # IDs are derived from each chunk's parent URL, so re-uploading a document overwrites its points.
+        ids = (_point_id(chunk_metadata) for chunk_metadata in metadata)
+        payloads = (
+            _chunk_payload(chunk_text, chunk_metadata)
+            for chunk_text, chunk_metadata in zip(texts, metadata, strict=True)
+        )
+        point_vectors = self._iter_point_vectors(texts, vectors, batch_size)
+
+        try:
+            # upload_collection blocks until every worker process has finished
+            await asyncio.to_thread(
+                self.client.upload_collection,
                 collection_name=self.collection_name,
-                points=points,
+                vectors=point_vectors,
+                payload=payloads,
+                ids=ids,
+                batch_size=batch_size,
+                parallel=parallel,
+                max_retries=3,
             )
+        except Exception:
+            logger.exception('Error bulk uploading chunks to Qdrant')
+            raise
 
-            logger.info(f"Stored {len(points)} chunks in '{self.collection_name}'")
+        self._stored_since_info += len(texts)
+        self.clear_search_cache()
+        logger.info("Bulk uploaded %d chunks to '%s' with %d processes", len(texts), self.collection_name, parallel)
+
+    def _iter_point_vectors(self, texts: list[str], vectors: np.ndarray, batch_size: int) -> Iterator[dict[str, Any]]:
+        """Yield each chunk's named vectors, computing BM25 sparse vectors one `batch_size` slice at a time."""
+        for start in range(0, len(texts), batch_size):
+            batch_texts = texts[start : start + batch_size]
+            sparse_vectors: Iterable[SparseVector | Document] = (
+                self.sparse_service.embed_texts(batch_texts)
+                if self.sparse_service is not None
+                else (Document(text=chunk_text, model='Qdrant/bm25') for chunk_text in batch_texts)
+            )
+            for dense_embedding, sparse_vector in zip(vectors[start : start + batch_size], sparse_vectors, strict=True):
+                yield {self.dense_vector_name: dense_embedding.tolist(), self.sparse_vector_name: sparse_vector}
 
+    async def flush(self) -> None:
+        """Wait until every upsert sent by `store_documents` has been applied.
+
+        Upserts are sent with `wait=False`, so Qdrant acknowledges them once they are written to its
+        WAL, before they are searchable. This sends an empty delete with `wait=True`: updates are
+        applied in order, so once it completes all earlier upserts are applied too. Call it before
+        `search` or `count_documents` when read-your-writes consistency is required.
+        """
+        try:
+            await self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=[]),
+                wait=True,
+            )
         except Exception:
-            logger.exception('Error storing chunks in Qdrant')
+            logger.exception('Error flushing pending upserts')
             raise
 
-    def search(
+        # Cached counts and results may predate the upserts that were just applied
+        self._info_cache = None
+        self.clear_search_cache()
+
+    async def enable_quantization(self) -> None:
+        """Enable scalar int8 quantization on the dense vector, unless the collection already has quantization.
+
+        The int8 vectors (~4x smaller) are kept in RAM for HNSW search, while the original float32 vectors
+        move to disk and are only read to rescore the oversampled candidates (see `DENSE_SEARCH_PARAMS`).
+        Qdrant quantizes existing points in the background; searches keep working meanwhile.
+        """
+        info = await self._get_collection_cached(refresh=True)
+        dense_config = info.config.params.vectors[self.dense_vector_name]
+        if info.config.quantization_config is not None or dense_config.quantization_config is not None:
+            return
+
+        await self.client.update_collection(
+            collection_name=self.collection_name,
+            vectors_config={
+                self.dense_vector_name: VectorParamsDiff(on_disk=True, quantization_config=DENSE_QUANTIZATION_CONFIG)
+            },
+        )
+        self._info_cache = None
+        logger.info("Scalar int8 quantization enabled on '%s'", self.dense_vector_name)
+
+    @contextlib.asynccontextmanager
+    async def bulk_mode(self) -> AsyncIterator[None]:
+        """Defer HNSW indexing while uploading many documents.
+
+        Sets the collection's indexing threshold to 0 on entry, so Qdrant does not rebuild the HNSW
+        graph while points stream in, and restores the previous threshold on exit (even on error),
+        which triggers a single indexing pass over the uploaded segments. Points uploaded in bulk
+        mode are searchable throughout, via exact search until they are indexed.
+
+        Example:
+            async with client.bulk_mode():
+                await client.store_documents(texts, vectors, metadata)
+        """
+        info = await self.client.get_collection(self.collection_name)
+        # A threshold of 0 is most likely left over from an interrupted bulk upload, so restore the default
+        indexing_threshold = info.config.optimizer_config.indexing_threshold or DEFAULT_INDEXING_THRESHOLD
+
+        await self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizers_config=OptimizersConfigDiff(indexing_threshold=0),
+        )
+        logger.info("Indexing deferred for bulk upload to '%s'", self.collection_name)
+        try:
+            yield
+        finally:
+            await self.client.update_collection(
+                collection_name=self.collection_name,
+                optimizers_config=OptimizersConfigDiff(indexing_threshold=indexing_threshold),
+            )
+            logger.info(
+                "Indexing re-enabled for '%s' (indexing_threshold=%d)", self.collection_name, indexing_threshold
+            )
+
+    def _build_points(
+        self,
+        texts: list[str],
+        vectors: np.ndarray,
+        metadata: list[dict[str, Any]],
+        sparse_vectors: list[SparseVector] | None = None,
+    ) -> list[PointStruct]:
+        """Convert parallel chunk texts, dense embeddings and metadata into Qdrant points.
+
+        Document-level fields are written only on each document's first chunk; see `_chunk_payload`.
+        Uses the precomputed `sparse_vectors` when given, otherwise a BM25 `Document` per chunk.
+        """
+        if sparse_vectors is None:
+            sparse_vectors = [Document(text=chunk_text, model='Qdrant/bm25') for chunk_text in texts]
+
+        # Every field is built here from trusted values, so skip pydantic validation per point
+        return [
+            PointStruct.model_construct(
+                id=_point_id(chunk_metadata),
+                vector={
+                    self.dense_vector_name: dense_embedding,
+                    self.sparse_vector_name: sparse_vector,
+                },
+                payload=_chunk_payload(chunk_text, chunk_metadata),
+            )
+            for chunk_text, dense_embedding, chunk_metadata, sparse_vector in zip(
+                texts, vectors.tolist(), metadata, sparse_vectors, strict=True
+            )
+        ]
+
+    async def search(
         self,
         query_vector: list[float],
         query_text: str | None = None,
@@ -188,73 +632,235 @@ class TaxDataQdrantClient:
 
         Args:
             query_vector: Dense embedding vector for the search query
-            query_text: Query text for BM25 sparse keyword matching
+            query_text: Query text for BM25 sparse keyword matching. Queries shorter than
+                `MIN_HYBRID_QUERY_TOKENS` tokens run a dense-only search.
             limit: Maximum number of results to return
 
+        Results are kept in an LRU cache of `SEARCH_CACHE_SIZE` entries keyed by query text, query
+        vector and limit, so repeated queries skip the round trip to Qdrant. The cache holds its own
+        deep copies of the points and hands out fresh ones, so callers may mutate what they get back.
+        It is cleared whenever this client stores documents or deletes the collection.
+
         Returns:
-            List of search results with scores and payloads
+            List of search results with scores and payloads. Document-level fields (title, url,
+            source, doc_type, scraped_at) are joined onto every result from its document's first chunk.
         """
+        cache_key = (query_text, np.asarray(query_vector, dtype=np.float32).tobytes(), limit)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            self._search_cache.move_to_end(cache_key)
+            return copy.deepcopy(cached)
+
         try:
-            if query_text:
-                # Hybrid search with prefetch
-                results = self.client.query_points(
-                    collection_name=self.collection_name,
-                    prefetch=[
-                        Prefetch(
-                            query=query_vector,
-                            using=self.dense_vector_name,
-                            limit=limit * 2,
-                        ),
-                        Prefetch(
-                            query=Document(text=query_text, model='Qdrant/bm25'),
-                            using=self.sparse_vector_name,
-                            limit=limit * 2,
-                        ),
-                    ],
-                    query=query_vector,
-                    using=self.dense_vector_name,
-                    limit=limit,
+            if _is_keyword_query(query_text):
+                # Embed the query in a worker thread: the first call also loads the FastEmbed model
+                sparse_query = (
+                    await asyncio.to_thread(self.sparse_service.embed_query, query_text)
+                    if self.sparse_service is not None
+                    else Document(text=query_text, model='Qdrant/bm25')
                 )
             else:
-                # Dense-only fallback
-                results = self.client.query_points(
-                    collection_name=self.collection_name,
-                    query=query_vector,
-                    using=self.dense_vector_name,
-                    limit=limit,
-                )
+                sparse_query = None
+
+            params = self._query_params(query_vector, sparse_query, limit)
+            results = await self.client.query_points(
+                collection_name=self.collection_name,
+                search_params=params.pop('params'),
+                **params,
+            )
+            await self._attach_document_payloads(results.points)
         except Exception:
             logger.exception('Error searching Qdrant')
             raise
         else:
+            self._search_cache[cache_key] = copy.deepcopy(results.points)
+            if len(self._search_cache) > SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
             return results.points
 
-    def count_documents(self) -> int:
-        """Count total documents in the collection."""
+    def clear_search_cache(self) -> None:
+        """Drop all cached `search` results."""
+        self._search_cache.clear()
+
+    async def search_batch(
+        self,
+        queries: list[tuple[list[float], str | None]],
+        limit: int | Sequence[int] = 5,
+    ) -> list[list[Any]]:
+        """Run several hybrid searches in a single request.
+
+        Equivalent to calling `search` once per query, but all queries share one round trip (and one
+        payload join), which matters for evaluation harnesses and multi-query retrieval.
+
+        Args:
+            queries: List of (query_vector, query_text) tuples; query_text may be None for dense-only search
+            limit: Maximum number of results to return per query, or one limit for each query
+
+        Returns:
+            One list of search results per query, in the same order as `queries`.
+        """
+        if not queries:
+            return []
+        limits = [limit] * len(queries) if isinstance(limit, int) else list(limit)
+        if len(limits) != len(queries):
+            raise ValueError(f'Got {len(limits)} limits for {len(queries)} queries')
+
+        try:
+            keyword_texts = [query_text if _is_keyword_query(query_text) else None for _, query_text in queries]
+            query_texts = [query_text for query_text in keyword_texts if query_text is not None]
+            if self.sparse_service is not None and query_texts:
+                sparse_vectors = iter(await asyncio.to_thread(self.sparse_service.embed_queries, query_texts))
+                sparse_queries = [next(sparse_vectors) if query_text else None for query_text in keyword_texts]
+            else:
+                sparse_queries = [
+                    Document(text=query_text, model='Qdrant/bm25') if query_text else None
+                    for query_text in keyword_texts
+                ]
+
+            responses = await self.client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=[
+                    QueryRequest(**self._query_params(query_vector, sparse_query, query_limit))
+                    for (query_vector, _), sparse_query, query_limit in zip(
+                        queries, sparse_queries, limits, strict=True
+                    )
+                ],
+            )
+            await self._attach_document_payloads([point for response in responses for point in response.points])
+        except Exception:
+            logger.exception('Error searching Qdrant')
+            raise
+        else:
+            return [response.points for response in responses]
+
+    def _query_params(
+        self,
+        query_vector: list[float],
+        sparse_query: SparseVector | Document | None,
+        limit: int,
+    ) -> dict[str, Any]:
+        """Build the query parameters shared by `search` and `search_batch`.
+
+        With a sparse query, dense and BM25 candidates are prefetched and merged server-side with
+        reciprocal rank fusion; without one, this is a dense-only search. Each leg fetches up to
+        `MAX_PREFETCH_LIMIT` candidates, and dense searches use `DENSE_SEARCH_PARAMS`.
+        Keys match `QueryRequest` fields (`query_points` takes `params` as `search_params`).
+        """
+        params: dict[str, Any] = {
+            'query': query_vector,
+            'using': self.dense_vector_name,
+            'limit': limit,
+            'params': DENSE_SEARCH_PARAMS,
+        }
+        if sparse_query is not None:
+            # Hybrid search: rank-fuse the two legs, so exact BM25 matches (form codes, acronyms) that
+            # embed poorly still rank, and the merged candidates need no second dense scoring pass
+            params['query'] = FusionQuery(fusion=Fusion.RRF)
+            del params['using']
+            params['params'] = None
+            prefetch_limit = min(limit * 2, max(MAX_PREFETCH_LIMIT, limit))
+            params['prefetch'] = [
+                Prefetch(
+                    query=query_vector,
+                    using=self.dense_vector_name,
+                    params=DENSE_SEARCH_PARAMS,
+                    limit=prefetch_limit,
+                ),
+                Prefetch(
+                    query=sparse_query,
+                    using=self.sparse_vector_name,
+                    limit=prefetch_limit,
+                ),
+            ]
+        return params
+
+    async def _attach_document_payloads(self, points: list[Any]) -> None:
+        """Fill in document-level payload fields on chunk results that only carry a `doc_id`.
+
+        All missing documents are fetched in one `retrieve` call, without vectors.
+        """
+        doc_ids = {
+            point.payload['doc_id']
+            for point in points
+            if point.payload and 'doc_id' in point.payload and 'url' not in point.payload
+        }
+        if not doc_ids:
+            return
+
+        documents = await self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=list(doc_ids),
+            with_payload=list(DOCUMENT_PAYLOAD_FIELDS),
+            with_vectors=False,
+        )
+        document_payloads = {str(document.id): document.payload or {} for document in documents}
+
+        for point in points:
+            if point.payload and point.payload.get('doc_id') in document_payloads:
+                point.payload = {**document_payloads[point.payload['doc_id']], **point.payload}
+
+    async def _get_collection_cached(self, *, refresh: bool = False) -> Any:
+        """Return the collection info, reusing a response fetched less than `COLLECTION_INFO_CACHE_TTL` ago.
+
+        Args:
+            refresh: Always fetch from the server (and cache the fresh response).
+        """
+        if (
+            not refresh
+            and self._info_cache is not None
+            and time.monotonic() - self._info_cache[0] < COLLECTION_INFO_CACHE_TTL
+        ):
+            return self._info_cache[1]
+
+        info = await self.client.get_collection(self.collection_name)
+        self._info_cache = (time.monotonic(), info)
+        self._stored_since_info = 0
+        return info
+
+    def _points_count(self, info: Any) -> int:
+        """Return the points count from collection info, advanced by chunks stored since it was fetched.
+
+        Re-stored chunks overwrite existing points, so the count may run ahead of the server until the
+        next refresh.
+        """
+        return (info.points_count or 0) + self._stored_since_info
+
+    async def count_documents(self) -> int:
+        """Count total documents in the collection.
+
+        The server count is cached for `COLLECTION_INFO_CACHE_TTL` seconds and advanced locally by
+        each `store_documents` call in between.
+        """
         try:
-            collection_info = self.client.get_collection(collection_name=self.collection_name)
+            collection_info = await self._get_collection_cached()
         except Exception:
             logger.exception('Error counting documents')
             return 0
         else:
-            return collection_info.points_count or 0
+            return self._points_count(collection_info)
 
-    def delete_collection(self) -> None:
+    async def delete_collection(self) -> None:
         """Delete the entire collection.
 
         Warning: This permanently deletes all documents in the collection.
         """
         try:
-            self.client.delete_collection(collection_name=self.collection_name)
-            logger.info(f"Collection '{self.collection_name}' deleted")
+            await self.client.delete_collection(collection_name=self.collection_name)
+            self.clear_search_cache()
+            self._info_cache = None
+            logger.info("Collection '%s' deleted", self.collection_name)
         except Exception:
             logger.exception('Error deleting collection')
             raise
 
-    def get_collection_info(self) -> dict[str, Any]:
-        """Get information about the collection."""
+    async def get_collection_info(self) -> dict[str, Any]:
+        """Get information about the collection.
+
+        Shares the `count_documents` cache, so polling both costs at most one request per
+        `COLLECTION_INFO_CACHE_TTL` seconds.
+        """
         try:
-            info = self.client.get_collection(collection_name=self.collection_name)
+            info = await self._get_collection_cached()
         except Exception:
             logger.exception('Error getting collection info')
             raise
@@ -262,7 +868,94 @@ class TaxDataQdrantClient:
             return {
                 'name': self.collection_name,
                 'source': self.source,
-                'points_count': info.points_count,
+                'points_count': self._points_count(info),
                 'dense_vector_name': self.dense_vector_name,
                 'sparse_vector_name': self.sparse_vector_name,
             }
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Return whether a REST or gRPC error means the requested resource does not exist."""
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == HTTPStatus.NOT_FOUND
+    if isinstance(error, grpc.RpcError):
+        return error.code() == grpc.StatusCode.NOT_FOUND
+    return False
+
+
+def _is_transient(error: Exception) -> bool:
+    """Return whether a REST or gRPC error is worth retrying (server unavailable, overloaded or timed out)."""
+    if isinstance(error, ResponseHandlingException):
+        # Raised for connection failures and timeouts before any response arrives
+        return True
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code in _TRANSIENT_HTTP_STATUSES
+    if isinstance(error, grpc.RpcError):
+        return error.code() in _TRANSIENT_GRPC_CODES
+    return False
+
+
+def _is_keyword_query(query_text: str | None) -> bool:
+    """Return whether a query has enough tokens for the BM25 leg of a hybrid search."""
+    return bool(query_text) and len(query_text.split()) >= MIN_HYBRID_QUERY_TOKENS
+
+
+def _chunk_payload(chunk_text: str, metadata: dict[str, Any]) -> dict[str, Any]:
+    """Build a chunk's point payload.
+
+    Chunks of a document with a parent URL reference it by `doc_id`, the point ID of its first chunk,
+    and only that first chunk stores the document-level fields. Chunks without a parent URL have no
+    document to join against, so they keep the document-level fields themselves.
+    """
+    payload: dict[str, Any] = {
+        'chunk_text': chunk_text,
+        'chunk_index': metadata.get('chunk_index', 0),
+        'total_chunks': metadata.get('total_chunks', 1),
+    }
+
+    parent_url = metadata.get('parent_url')
+    if parent_url:
+        payload['doc_id'] = _document_id(parent_url)
+
+    if not parent_url or payload['chunk_index'] == 0:
+        for field, key in _DOCUMENT_PAYLOAD_ITEMS:
+            payload[field] = metadata.get(key, '')
+
+    return payload
+
+
+def _point_id(metadata: dict[str, Any]) -> str:
+    """Derive a point ID from the chunk's parent URL and index.
+
+    IDs are deterministic so re-crawling a page overwrites its existing points instead of duplicating them.
+    Chunks without a parent URL fall back to a random ID.
+    """
+    parent_url = metadata.get('parent_url')
+    if not parent_url:
+        return uuid.uuid4().hex
+
+    chunk_index = metadata.get('chunk_index', 0)
+    if chunk_index == 0:
+        return _document_id(parent_url)
+    return _url_uuid5(f'{parent_url}#{chunk_index}')
+
+
+@functools.lru_cache(maxsize=1024)
+def _document_id(parent_url: str) -> str:
+    """Return the point ID of a document's first chunk, which is also the `doc_id` of all its chunks.
+
+    Cached, since every chunk of a document needs it and a batch holds the chunks of only a few documents.
+    """
+    return _url_uuid5(f'{parent_url}#0')
+
+
+def _url_uuid5(name: str) -> str:
+    """Return `str(uuid.uuid5(uuid.NAMESPACE_URL, name))`, without building a `UUID` object.
+
+    Called once per stored chunk; formatting the SHA-1 digest directly is about 3x faster.
+    """
+    digest = bytearray(hashlib.sha1(_NAMESPACE_URL_BYTES + name.encode(), usedforsecurity=False).digest()[:16])
+    digest[6] = (digest[6] & 0x0F) | 0x50  # version 5
+    digest[8] = (digest[8] & 0x3F) | 0x80  # RFC 4122 variant
+    hex_digest = digest.hex()
+    return f'{hex_digest[:8]}-{hex_digest[8:12]}-{hex_digest[12:16]}-{hex_digest[16:20]}-{hex_digest[20:]}'
@@ -1,8 +1,19 @@
 import asyncio
+import json
 import logging
 import os
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
 
-from openai import AsyncOpenAI
+import httpx
+import numpy as np
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from qdrant_client.models import SparseVector
+
+from tax_rag_scraper.utils.ssl_context import get_ssl_context
+
+if TYPE_CHECKING:
+    from fastembed import SparseEmbedding, SparseTextEmbedding
 
 logger = logging.getLogger(__name__)
 
@@ -10,11 +21,39 @@ logger = logging.getLogger(__name__)
 MAX_SAFE_TOKEN_LIMIT = 7000  # Safety margin from 8,192 limit
 TOKEN_WARNING_THRESHOLD = 6000  # Warn when approaching limit
 
+# Characters a chunk may end on when breaking at a sentence boundary
+SENTENCE_ENDS = ('.', '!', '?')
+
+# Request batching for the embeddings API (hard caps are 2048 inputs and 300k tokens per request)
+EMBEDDING_BATCH_SIZE = 256
+MAX_BATCH_TOKENS = 250_000
+
+# Maximum embedding requests (and connections) in flight at once per service
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# OpenAI Batch API: seconds between job status polls, and statuses of jobs that will never complete
+BATCH_API_POLL_INTERVAL = 60.0
+_BATCH_API_FAILED_STATUSES = frozenset({'failed', 'expired', 'cancelled'})
+
+# BM25 sparse model (must match the IDF-modified sparse vector configured on the collection)
+SPARSE_MODEL_NAME = 'Qdrant/bm25'
+SPARSE_BATCH_SIZE = 256
+
+# Embedded chunk batch as parallel arrays: (chunk_texts, float32 embedding matrix with one row per chunk, metadata)
+EmbeddedChunks = tuple[list[str], np.ndarray, list[dict[str, Any]]]
+
 
 class EmbeddingService:
     """Service for generating text embeddings using OpenAI's API."""
 
-    def __init__(self, model_name: str = 'text-embedding-3-small', api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        model_name: str = 'text-embedding-3-small',
+        api_key: str | None = None,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        *,
+        use_batch_api: bool = False,
+    ) -> None:
         """Initialize OpenAI embedding service.
 
         Args:
@@ -22,6 +61,9 @@ class EmbeddingService:
                 - text-embedding-3-small: 1536 dimensions, cost-effective (default)
                 - text-embedding-3-large: 3072 dimensions, higher quality
             api_key: OpenAI API key (if not provided, reads from OPENAI_API_KEY env var).
+            max_concurrent_requests: Maximum embedding requests in flight at once, across all callers.
+            use_batch_api: Embed through the OpenAI Batch API (half the cost, separate rate limits, but
+                results may take up to 24 hours) instead of synchronous requests.
 
         Raises:
             ValueError: If API key is not provided or found in environment.
@@ -32,7 +74,20 @@ class EmbeddingService:
         if not self.api_key:
             raise ValueError('OpenAI API key required. Set OPENAI_API_KEY environment variable.')
 
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        # Cap both in-flight requests and pooled connections, so concurrent flushes can't fan out
+        # past the rate limit
+        self.client = AsyncOpenAI(
+            api_key=self.api_key,
+            http_client=DefaultAsyncHttpxClient(
+                verify=get_ssl_context(),
+                limits=httpx.Limits(
+                    max_connections=max_concurrent_requests,
+                    max_keepalive_connections=max_concurrent_requests,
+                ),
+            ),
+        )
+        self._request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.use_batch_api = use_batch_api
         self.vector_size = 1536  # text-embedding-3-small
 
         logger.info(f'Initialized OpenAI embeddings: {self.model_name}, {self.vector_size} dims')
@@ -79,7 +134,7 @@ class EmbeddingService:
             estimated_tokens = self._estimate_tokens(text)
             if estimated_tokens > MAX_SAFE_TOKEN_LIMIT:
                 # Recursively split if too large
-                logger.warning(f'Text too large ({estimated_tokens} tokens), splitting recursively')
+                logger.warning('Text too large (%d tokens), splitting recursively', estimated_tokens)
                 return self._chunk_text(text, max_words=max_words // 2, overlap_words=overlap_words // 2)
             return [text]
 
@@ -91,17 +146,12 @@ class EmbeddingService:
 
             # Try to break at sentence boundary
             if chunk_end < len(text):
-                # Look for sentence ending within last 500 chars
+                # Look for the last sentence ending within the final 500 chars
                 search_start = max(current_pos, chunk_end - 500)
-                sentence_ends = ['.', '!', '?', '\n\n']
-                best_break = chunk_end
+                last_end = max(text.rfind(end, search_start + 1, chunk_end + 1) for end in SENTENCE_ENDS)
 
-                for i in range(chunk_end, search_start, -1):
-                    if text[i : i + 1] in sentence_ends:
-                        best_break = i + 1
-                        break
-
-                chunk_end = best_break
+                if last_end != -1:
+                    chunk_end = last_end + 1
 
             chunk = text[current_pos:chunk_end].strip()
 
@@ -109,7 +159,7 @@ class EmbeddingService:
             estimated_tokens = self._estimate_tokens(chunk)
             if estimated_tokens > MAX_SAFE_TOKEN_LIMIT:
                 # Chunk still too large, split it further
-                logger.warning(f'Chunk too large ({estimated_tokens} tokens), splitting further')
+                logger.warning('Chunk too large (%d tokens), splitting further', estimated_tokens)
                 sub_chunks = self._chunk_text(chunk, max_words=max_words // 2, overlap_words=overlap_words // 2)
                 chunks.extend(sub_chunks)
             else:
@@ -121,12 +171,10 @@ class EmbeddingService:
                 # Find a good overlap point (prefer word boundary)
                 overlap_start = max(current_pos, chunk_end - overlap_chars)
 
-                # Try to start overlap at a word boundary
-                # Look backwards from chunk_end for a space
-                for i in range(chunk_end - overlap_chars, chunk_end):
-                    if text[i : i + 1] == ' ':
-                        overlap_start = i + 1
-                        break
+                # Try to start overlap at the first word boundary inside the overlap window
+                space = text.find(' ', max(0, chunk_end - overlap_chars), chunk_end)
+                if space != -1:
+                    overlap_start = space + 1
 
                 current_pos = overlap_start
             else:
@@ -162,16 +210,19 @@ class EmbeddingService:
                     f'This should have been caught by chunking logic.'
                 )
             if estimated_tokens > TOKEN_WARNING_THRESHOLD:
-                logger.warning(f'Text {i} approaching limit: {estimated_tokens} estimated tokens ({len(text)} chars)')
+                logger.warning(
+                    'Text %d approaching limit: %d estimated tokens (%d chars)', i, estimated_tokens, len(text)
+                )
 
         for attempt in range(max_retries):
             try:
-                response = await self.client.embeddings.create(
-                    model=self.model_name, input=texts, encoding_format='float'
-                )
+                async with self._request_semaphore:
+                    response = await self.client.embeddings.create(
+                        model=self.model_name, input=texts, encoding_format='float'
+                    )
 
                 embeddings = [item.embedding for item in response.data]
-                logger.info(f'Generated {len(embeddings)} embeddings, {response.usage.total_tokens} tokens')
+                logger.info('Generated %d embeddings, %d tokens', len(embeddings), response.usage.total_tokens)
 
                 return embeddings  # noqa: TRY300
 
@@ -189,7 +240,7 @@ class EmbeddingService:
                 # Check if it's a rate limit error
                 if 'rate_limit_exceeded' in error_msg or '429' in error_msg:
                     wait_time = 2**attempt * 3  # 3s, 6s, 12s
-                    logger.warning(f'Rate limit hit, waiting {wait_time}s (attempt {attempt + 1}/{max_retries})')
+                    logger.warning('Rate limit hit, waiting %ds (attempt %d/%d)', wait_time, attempt + 1, max_retries)
                     await asyncio.sleep(wait_time)
 
                     if attempt == max_retries - 1:
@@ -201,27 +252,152 @@ class EmbeddingService:
 
         return []
 
-    async def embed_documents(self, documents: list[dict]) -> list[tuple[str, list[float], dict]]:
+    async def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Generate embeddings for any number of texts using as few API requests as possible.
+
+        Texts are grouped into requests of at most `EMBEDDING_BATCH_SIZE` inputs and
+        `MAX_BATCH_TOKENS` estimated tokens, so large crawls stay within the per-request limits.
+        The requests are sent concurrently, up to the service's `max_concurrent_requests`, or as a
+        single Batch API job if the service uses the Batch API.
+
+        Args:
+            texts: List of text strings to embed.
+
+        Returns:
+            float32 array of shape (len(texts), dimensions), rows in the same order as `texts`.
+        """
+        batches: list[list[str]] = []
+        batch: list[str] = []
+        batch_tokens = 0
+
+        for text in texts:
+            tokens = self._estimate_tokens(text)
+            if batch and (len(batch) >= EMBEDDING_BATCH_SIZE or batch_tokens + tokens > MAX_BATCH_TOKENS):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += tokens
+
+        if batch:
+            batches.append(batch)
+
+        if not batches:
+            return np.empty((0, 0), dtype=np.float32)
+
+        if self.use_batch_api:
+            return await self._embed_with_batch_api(batches)
+
+        # Each response is packed into float32 as soon as it arrives, so Python float lists only
+        # exist for the requests currently in flight
+        async def embed_request(request_texts: list[str]) -> np.ndarray:
+            return np.asarray(await self.embed_texts(request_texts), dtype=np.float32)
+
+        tasks = [asyncio.create_task(embed_request(request_texts)) for request_texts in batches]
+        try:
+            embeddings = await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't leave the remaining requests running (and holding rate limit) after a failure:
+            # cancel them and wait until they have stopped before raising
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return np.concatenate(embeddings)
+
+    async def _embed_with_batch_api(self, requests: list[list[str]]) -> np.ndarray:
+        """Embed grouped requests as one OpenAI Batch API job and wait for it to complete.
+
+        Batch jobs cost half as much as synchronous requests and have their own rate limits, but only
+        complete within 24 hours, so the job status is polled every `BATCH_API_POLL_INTERVAL` seconds.
+
+        Args:
+            requests: Texts grouped into embedding requests, as built by `embed_batch`.
+
+        Returns:
+            float32 array with one row per text, in request order.
+
+        Raises:
+            RuntimeError: If the job fails, expires or is cancelled, or any request in it fails.
+        """
+        lines = [
+            json.dumps(
+                {
+                    'custom_id': str(i),
+                    'method': 'POST',
+                    'url': '/v1/embeddings',
+                    'body': {'model': self.model_name, 'input': request_texts, 'encoding_format': 'float'},
+                }
+            )
+            for i, request_texts in enumerate(requests)
+        ]
+        input_file = await self.client.files.create(
+            file=('embeddings.jsonl', '\n'.join(lines).encode()),
+            purpose='batch',
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint='/v1/embeddings',
+            completion_window='24h',
+        )
+        logger.info('Submitted OpenAI batch %s with %d embedding requests', batch.id, len(requests))
+
+        while batch.status != 'completed':
+            if batch.status in _BATCH_API_FAILED_STATUSES:
+                raise RuntimeError(f'OpenAI batch {batch.id} ended with status {batch.status!r}: {batch.errors}')
+            await asyncio.sleep(BATCH_API_POLL_INTERVAL)
+            batch = await self.client.batches.retrieve(batch.id)
+
+        # Results come back in any order; failed requests are left out of the output file
+        embeddings: list[np.ndarray | None] = [None] * len(requests)
+        if batch.output_file_id is not None:
+            output = await self.client.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                result = json.loads(line)
+                response = result['response']
+                if result['error'] is None and response['status_code'] == HTTPStatus.OK:
+                    data = response['body']['data']
+                    embeddings[int(result['custom_id'])] = np.asarray(
+                        [item['embedding'] for item in data], dtype=np.float32
+                    )
+
+        failed = sum(embedding is None for embedding in embeddings)
+        if failed:
+            raise RuntimeError(
+                f'OpenAI batch {batch.id}: {failed} of {len(requests)} requests failed (see error file '
+                f'{batch.error_file_id})'
+            )
+
+        logger.info('OpenAI batch %s completed', batch.id)
+        return np.concatenate(embeddings)
+
+    async def embed_documents(self, documents: list[dict]) -> EmbeddedChunks:
         """Generate embeddings from document dictionaries with chunking support.
 
         Each document may be split into multiple chunks. Each chunk is returned
-        as a separate item with its embedding and parent document metadata.
+        as a separate row with its embedding and parent document metadata.
         This enables storing each chunk as a separate vector in Qdrant for
         better retrieval accuracy in RAG applications.
 
+        Chunks from all documents are embedded together via `embed_batch`, so a
+        batch of documents costs one API request per `EMBEDDING_BATCH_SIZE` chunks
+        rather than one per document.
+
         Args:
             documents: List of document dicts (must have 'title' and 'content' keys).
 
         Returns:
-            List of tuples: (chunk_text, embedding_vector, parent_metadata)
-            where parent_metadata includes:
+            Parallel (chunk_texts, embeddings, metadata) where `embeddings` is a float32 array
+            with one row per chunk, and each metadata dict includes:
                 - chunk_index: Position of this chunk (0-indexed)
                 - total_chunks: Total number of chunks from parent document
                 - parent_title: Original document title
                 - parent_url: Original document URL
                 - All other fields from parent document
         """
-        result_chunks = []
+        chunk_texts: list[str] = []
+        chunk_metadata: list[dict[str, Any]] = []
 
         for doc in documents:
             title = doc.get('title', '')
@@ -233,27 +409,30 @@ class EmbeddingService:
 
             if len(text_chunks) > 1:
                 logger.info(
-                    f'Document "{title[:50]}..." too large ({len(full_text)} chars), '
-                    f'splitting into {len(text_chunks)} chunks'
+                    'Document "%s..." too large (%d chars), splitting into %d chunks',
+                    title[:50],
+                    len(full_text),
+                    len(text_chunks),
                 )
 
-            # Generate embeddings for all chunks at once (more efficient)
-            chunk_embeddings = await self.embed_texts(text_chunks)
-
-            # Create result tuples with metadata
-            for i, (chunk_text, embedding) in enumerate(zip(text_chunks, chunk_embeddings, strict=True)):
-                metadata = {
-                    'chunk_index': i,
-                    'total_chunks': len(text_chunks),
-                    'parent_title': title,
-                    'parent_url': doc.get('url', ''),
-                    'parent_source': doc.get('source', ''),
-                    'parent_doc_type': doc.get('doc_type', ''),
-                    'parent_scraped_at': doc.get('scraped_at', ''),
-                }
-                result_chunks.append((chunk_text, embedding, metadata))
+            # Document fields are looked up once and shared by all of its chunks
+            parent_fields = {
+                'parent_title': title,
+                'parent_url': doc.get('url', ''),
+                'parent_source': doc.get('source', ''),
+                'parent_doc_type': doc.get('doc_type', ''),
+                'parent_scraped_at': doc.get('scraped_at', ''),
+            }
 
-        return result_chunks
+            chunk_texts.extend(text_chunks)
+            chunk_metadata.extend(
+                {'chunk_index': i, 'total_chunks': len(text_chunks), **parent_fields} for i in range(len(text_chunks))
+            )
+
+        # Generate embeddings for all chunks across all documents at once
+        embeddings = await self.embed_batch(chunk_texts)
+
+        return chunk_texts, embeddings, chunk_metadata
 
     async def embed_query(self, query: str) -> list[float]:
         """Generate embedding for a single search query.
@@ -268,3 +447,85 @@ class EmbeddingService:
         return embeddings[0] if embeddings else []
 
 
+class SparseEmbeddingService:
+    """Service for generating BM25 sparse vectors locally with FastEmbed.
+
+    Computing sparse vectors up front lets the upload path send ready-made `SparseVector`s
+    instead of `Document` objects that have to be tokenized inside the upsert call.
+    """
+
+    def __init__(
+        self,
+        model_name: str = SPARSE_MODEL_NAME,
+        batch_size: int = SPARSE_BATCH_SIZE,
+        parallel: int | None = None,
+    ) -> None:
+        """Initialize the sparse embedding service.
+
+        The FastEmbed model is loaded on first use, so constructing the service is cheap.
+
+        Args:
+            model_name: FastEmbed sparse model name (default: 'Qdrant/bm25').
+            batch_size: Number of texts FastEmbed processes per internal batch.
+            parallel: Worker processes FastEmbed spreads `embed_texts` batches over (0 = one per CPU core).
+                None embeds in-process, which is faster for the few hundred chunks of a crawl batch;
+                worker processes only pay off for large backfills.
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.parallel = parallel
+        self._model: SparseTextEmbedding | None = None
+
+    @property
+    def model(self) -> 'SparseTextEmbedding':
+        """Return the FastEmbed model, loading it on first access."""
+        if self._model is None:
+            from fastembed import SparseTextEmbedding  # noqa: PLC0415
+
+            self._model = SparseTextEmbedding(model_name=self.model_name)
+            logger.info(f'Initialized sparse embeddings: {self.model_name}')
+        return self._model
+
+    def embed_texts(self, texts: list[str]) -> list[SparseVector]:
+        """Generate BM25 sparse vectors for document texts in a single batched model call.
+
+        Args:
+            texts: List of text strings to embed.
+
+        Returns:
+            List of sparse vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        embeddings = self.model.embed(texts, batch_size=self.batch_size, parallel=self.parallel)
+        return [_to_sparse_vector(embedding) for embedding in embeddings]
+
+    def embed_query(self, query: str) -> SparseVector:
+        """Generate a BM25 sparse vector for a search query.
+
+        Args:
+            query: Search query string.
+
+        Returns:
+            Sparse vector for the query.
+        """
+        return _to_sparse_vector(next(iter(self.model.query_embed(query))))
+
+    def embed_queries(self, queries: list[str]) -> list[SparseVector]:
+        """Generate BM25 sparse vectors for several search queries in one model call.
+
+        Args:
+            queries: List of search query strings.
+
+        Returns:
+            List of sparse vectors, in the same order as `queries`.
+        """
+        if not queries:
+            return []
+        return [_to_sparse_vector(embedding) for embedding in self.model.query_embed(queries)]
+
+
+def _to_sparse_vector(embedding: 'SparseEmbedding') -> SparseVector:
+    """Convert a FastEmbed sparse embedding into a Qdrant `SparseVector`."""
+    # FastEmbed emits unique int indices and float values, so skip pydantic validation of every element
+    return SparseVector.model_construct(indices=embedding.indices.tolist(), values=embedding.values.tolist())
@@ -1,20 +1,40 @@
+import functools
 from urllib.parse import ParseResult, urljoin, urlparse
 
 from bs4 import BeautifulSoup
 
+from tax_rag_scraper.utils.url_filter import UrlPatterns, matches_url_patterns
+
+# Maximum number of distinct URLs whose pattern decisions are cached per extractor
+URL_FILTER_CACHE_SIZE = 200_000
+
 
 class LinkExtractor:
     """Extract and filter links from HTML pages for deep crawling."""
 
-    def __init__(self, allowed_domains: set[str] | None = None, max_depth: int = 3) -> None:
+    def __init__(
+        self,
+        allowed_domains: set[str] | None = None,
+        max_depth: int = 3,
+        *,
+        allowed_patterns: UrlPatterns | None = None,
+        excluded_patterns: UrlPatterns | None = None,
+    ) -> None:
         """Initialize link extractor.
 
         Args:
             allowed_domains: Set of domains to crawl (None = same domain only).
             max_depth: Maximum crawl depth (0 = seed URLs only, 1 = seed + 1 level).
+            allowed_patterns: Compiled URL patterns a link must match (takes precedence over allowed_domains).
+            excluded_patterns: Compiled URL patterns a link must not match.
         """
         self.allowed_domains = allowed_domains or set()
         self.max_depth = max_depth
+        self.allowed_patterns = allowed_patterns or {}
+        self.excluded_patterns = excluded_patterns or {}
+
+        # Index pages link to the same targets over and over, so evaluate the patterns once per unique URL
+        self._match_patterns = functools.lru_cache(maxsize=URL_FILTER_CACHE_SIZE)(self._match_patterns_uncached)
 
     def extract_links(self, soup: BeautifulSoup, base_url: str, current_depth: int = 0) -> set[str]:
         """Extract valid links from page.
@@ -46,29 +66,45 @@ class LinkExtractor:
             absolute_url = urljoin(base_url, href)
             parsed = urlparse(absolute_url)
 
-            # Apply filters
-            if self._is_valid_link(parsed, absolute_url, base_domain):
-                # Remove fragments (anchors) but keep query strings
-                clean_url = f'{parsed.scheme}://{parsed.netloc}{parsed.path}'
-                if parsed.query:
-                    clean_url += f'?{parsed.query}'
+            # Remove fragments (anchors) but keep query strings
+            clean_url = f'{parsed.scheme}://{parsed.netloc}{parsed.path}'
+            if parsed.query:
+                clean_url += f'?{parsed.query}'
 
+            # Apply filters
+            if self._is_valid_link(parsed, clean_url, base_domain):
                 links.add(clean_url)
 
         return links
 
-    def _is_valid_link(self, parsed: ParseResult, absolute_url: str, base_domain: str) -> bool:  # noqa: ARG002
+    def _match_patterns_uncached(self, url: str) -> tuple[bool, bool]:
+        """Match a URL against the allowed and excluded patterns.
+
+        Args:
+            url: Absolute URL string without fragment.
+
+        Returns:
+            Tuple of (matches allowed_patterns, matches excluded_patterns).
+        """
+        return (
+            matches_url_patterns(self.allowed_patterns, url),
+            matches_url_patterns(self.excluded_patterns, url),
+        )
+
+    def _is_valid_link(self, parsed: ParseResult, absolute_url: str, base_domain: str) -> bool:
         """Determine if a link should be followed.
 
         Filters out:
             - Non-HTTP(S) schemes (mailto:, javascript:, etc.)
+            - URLs not matching allowed_patterns (when configured)
             - Different domains (unless in allowed_domains)
+            - URLs matching excluded_patterns
             - File downloads (PDF, ZIP, etc.)
             - Anchor-only links
 
         Args:
             parsed: Parsed URL object.
-            absolute_url: Absolute URL string.
+            absolute_url: Absolute URL string without fragment.
             base_domain: Base domain for comparison.
 
         Returns:
@@ -78,8 +114,14 @@ class LinkExtractor:
         if parsed.scheme not in ('http', 'https'):
             return False
 
+        allowed_match, excluded_match = self._match_patterns(absolute_url)
+
         # Check domain restrictions
-        if self.allowed_domains:
+        if self.allowed_patterns:
+            # If allowed_patterns specified, URL must match one of them
+            if not allowed_match:
+                return False
+        elif self.allowed_domains:
             # If allowed_domains specified, must be in the list
             if parsed.netloc not in self.allowed_domains:
                 return False
@@ -87,6 +129,10 @@ class LinkExtractor:
         elif not parsed.netloc.endswith(base_domain):
             return False
 
+        # Skip explicitly excluded URLs
+        if excluded_match:
+            return False
+
         # Skip file downloads
         path_lower = parsed.path.lower()
         if any(path_lower.endswith(ext) for ext in ['.pdf', '.zip', '.doc', '.docx', '.xls', '.xlsx']):
@@ -0,0 +1,16 @@
+"""Shared SSL context for outgoing HTTPS clients."""
+
+import functools
+import ssl
+
+import httpx
+
+
+@functools.cache
+def get_ssl_context() -> ssl.SSLContext:
+    """Return a process-wide SSL context verifying against the default CA bundle.
+
+    Loading the CA bundle takes tens of milliseconds, so it is done once and the context shared by every
+    HTTP client (crawler and OpenAI) instead of being rebuilt per client.
+    """
+    return httpx.create_ssl_context()
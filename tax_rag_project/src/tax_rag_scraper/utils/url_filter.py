@@ -0,0 +1,68 @@
+"""Precompiled URL allow/deny pattern matching for scraper link filtering."""
+
+import re
+from collections.abc import Iterable
+from urllib.parse import urlparse
+
+# Hostname -> single compiled alternation of every pattern for that host.
+# Patterns with a wildcard in the hostname are stored under WILDCARD_HOST and tested for every URL.
+UrlPatterns = dict[str, re.Pattern[str]]
+
+WILDCARD_HOST = '*'
+
+
+def _translate(pattern: str) -> str:
+    """Translate a glob-style URL pattern into a regex fragment.
+
+    `**` matches any characters (including '/'), `*` matches any characters except '/'.
+    Everything else, including '?' in query strings, is matched literally.
+    """
+    parts = []
+    for i, segment in enumerate(pattern.split('**')):
+        if i:
+            parts.append('.*')
+        parts.append('[^/]*'.join(re.escape(piece) for piece in segment.split('*')))
+    return ''.join(parts)
+
+
+def _build_matcher(patterns: Iterable[str]) -> re.Pattern[str]:
+    """Compile glob-style URL patterns into a single alternation regex."""
+    return re.compile('|'.join(f'(?:{_translate(pattern)})' for pattern in patterns))
+
+
+def compile_url_patterns(patterns: Iterable[str]) -> UrlPatterns:
+    """Compile glob-style URL patterns into hostname-indexed regexes.
+
+    Bucketing by hostname means a URL is only tested against the patterns for its own host,
+    so matching costs one dict lookup plus one regex match regardless of the number of patterns.
+
+    Args:
+        patterns: Glob-style URL patterns (e.g. 'https://example.com/docs/**').
+
+    Returns:
+        Mapping of hostname to a compiled regex matching any of that host's patterns.
+    """
+    buckets: dict[str, list[str]] = {}
+    for pattern in patterns:
+        host = urlparse(pattern).netloc
+        buckets.setdefault(WILDCARD_HOST if '*' in host else host, []).append(pattern)
+
+    return {host: _build_matcher(host_patterns) for host, host_patterns in buckets.items()}
+
+
+def matches_url_patterns(patterns: UrlPatterns, url: str) -> bool:
+    """Check whether a URL matches any of the compiled patterns.
+
+    Args:
+        patterns: Hostname-indexed regexes from `compile_url_patterns`.
+        url: Absolute URL to test.
+
+    Returns:
+        True if the URL fully matches at least one pattern.
+    """
+    matcher = patterns.get(urlparse(url).netloc)
+    if matcher is not None and matcher.fullmatch(url):
+        return True
+
+    wildcard_matcher = patterns.get(WILDCARD_HOST)
+    return wildcard_matcher is not None and wildcard_matcher.fullmatch(url) is not None
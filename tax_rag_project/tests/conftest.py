@@ -8,62 +8,74 @@ This conftest provides:
 """
 
 import sys
+from collections.abc import AsyncGenerator, Callable, Generator
 from pathlib import Path
-from typing import AsyncGenerator, Generator
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import (
+    Distance,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    ScoredPoint,
+    SparseVector,
+)
 
 # Add the src directory to Python path so imports work
 src_path = Path(__file__).parent.parent / 'src'
 if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
 
+if TYPE_CHECKING:
+    from tax_rag_scraper.storage.qdrant_client import TaxDataQdrantClient
+
 
 # ============================================================================
 # SECTION 1: Pytest Configuration
 # ============================================================================
 
+
 def pytest_configure(config):
     """Register custom markers."""
-    config.addinivalue_line(
-        "markers", "unit: mark test as unit test (no external dependencies, fast)"
-    )
-    config.addinivalue_line(
-        "markers", "integration: mark test as integration test (requires real Qdrant)"
-    )
-    config.addinivalue_line(
-        "markers", "slow: mark test as slow running"
-    )
+    config.addinivalue_line('markers', 'unit: mark test as unit test (no external dependencies, fast)')
+    config.addinivalue_line('markers', 'integration: mark test as integration test (requires real Qdrant)')
+    config.addinivalue_line('markers', 'slow: mark test as slow running')
 
 
 # ============================================================================
 # SECTION 2: Configuration Fixtures
 # ============================================================================
 
+
 @pytest.fixture
 def mock_openai_api_key() -> str:
     """Provide a mock OpenAI API key for testing."""
-    return "test-openai-key-12345"
+    return 'test-openai-key-12345'
 
 
 @pytest.fixture
 def mock_qdrant_url() -> str:
     """Provide a mock Qdrant Cloud URL."""
-    return "https://test-cluster.cloud.qdrant.io"
+    return 'https://test-cluster.cloud.qdrant.io'
 
 
 @pytest.fixture
 def mock_qdrant_api_key() -> str:
     """Provide a mock Qdrant API key."""
-    return "test-qdrant-key-12345"
+    return 'test-qdrant-key-12345'
 
 
 # ============================================================================
 # SECTION 3: Sample Document Fixtures
 # ============================================================================
 
+
 @pytest.fixture
 def sample_tax_document() -> dict:
     """Provide a sample tax document for testing."""
@@ -110,6 +122,7 @@ def sample_document_batch() -> list[dict]:
 # SECTION 4: Embedding Fixtures
 # ============================================================================
 
+
 @pytest.fixture
 def mock_dense_embedding() -> list[float]:
     """Provide a mock dense embedding (1536 dimensions for text-embedding-3-small)."""
@@ -124,51 +137,134 @@ def mock_embedding_service(mock_openai_api_key, mock_dense_embedding):
     service = EmbeddingService(api_key=mock_openai_api_key)
 
     # Mock the OpenAI client
-    mock_response = MagicMock()
-    mock_response.data = [MagicMock(embedding=mock_dense_embedding)]
-    mock_response.usage.total_tokens = 100
+    mock_response = SimpleNamespace(
+        data=[SimpleNamespace(embedding=mock_dense_embedding)],
+        usage=SimpleNamespace(total_tokens=100),
+    )
 
     service.client.embeddings.create = AsyncMock(return_value=mock_response)
 
     return service
 
 
+@pytest.fixture
+def mock_sparse_service() -> MagicMock:
+    """Provide a mocked SparseEmbeddingService returning one-term BM25 vectors."""
+    from tax_rag_scraper.utils.embeddings import SparseEmbeddingService
+
+    service = MagicMock(spec=SparseEmbeddingService)
+    service.embed_texts.side_effect = lambda texts: [SparseVector(indices=[i], values=[1.0]) for i in range(len(texts))]
+    service.embed_query.return_value = SparseVector(indices=[7], values=[1.0])
+    service.embed_queries.side_effect = lambda queries: [
+        SparseVector(indices=[100 + i], values=[1.0]) for i in range(len(queries))
+    ]
+
+    return service
+
+
 # ============================================================================
 # SECTION 5: Qdrant Client Mocks
 # ============================================================================
 
+SCALAR_INT8 = ScalarQuantization(scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True))
+
+
 @pytest.fixture
-def mock_qdrant_client():
-    """Provide a fully mocked QdrantClient for unit tests."""
-    mock_client = MagicMock(spec=QdrantClient)
+def make_collection_info() -> Callable[..., MagicMock]:
+    """Provide a factory for mocked `get_collection()` responses with valid named vectors."""
+
+    def _make(
+        source: str = 'cra',
+        vector_size: int = 1536,
+        points_count: int = 100,
+        quantization_config: ScalarQuantization | None = SCALAR_INT8,
+        indexing_threshold: int | None = 20000,
+    ) -> MagicMock:
+        return MagicMock(
+            points_count=points_count,
+            config=MagicMock(
+                params=MagicMock(
+                    vectors={
+                        f'{source}-dense': MagicMock(
+                            size=vector_size, distance=Distance.COSINE, quantization_config=None
+                        )
+                    },
+                    sparse_vectors={f'{source}-sparse': MagicMock()},
+                ),
+                quantization_config=quantization_config,
+                optimizer_config=MagicMock(indexing_threshold=indexing_threshold),
+            ),
+        )
+
+    return _make
+
+
+@pytest.fixture(autouse=True)
+def _reset_validated_collections() -> Generator[None, None, None]:
+    """Forget collections validated by earlier tests, so each test's mocks are exercised."""
+    from tax_rag_scraper.storage import qdrant_client
+
+    qdrant_client._validated_collections.clear()
+    yield
+    qdrant_client._validated_collections.clear()
 
-    # Mock get_collections() for validation
-    mock_collection = MagicMock()
-    mock_collection.name = 'cra-collection'
-    mock_client.get_collections.return_value = MagicMock(collections=[mock_collection])
 
-    # Mock get_collection() for info
-    mock_client.get_collection.return_value = MagicMock(points_count=100)
+@pytest.fixture
+def mock_qdrant_client(make_collection_info: Callable[..., MagicMock]) -> MagicMock:
+    """Provide a fully mocked AsyncQdrantClient for unit tests (its async methods are AsyncMocks)."""
+    mock_client = MagicMock(spec=AsyncQdrantClient)
 
-    # Mock upsert() for storage
-    mock_client.upsert.return_value = None
+    # Mock get_collection() for validation and info
+    mock_client.get_collection.return_value = make_collection_info('cra')
 
     # Mock query_points() for search
     mock_result = MagicMock()
     mock_result.points = [
-        MagicMock(id='1', score=0.95, payload={'chunk_text': 'Result 1'}),
-        MagicMock(id='2', score=0.85, payload={'chunk_text': 'Result 2'}),
+        ScoredPoint(id='1', version=0, score=0.95, payload={'chunk_text': 'Result 1'}),
+        ScoredPoint(id='2', version=0, score=0.85, payload={'chunk_text': 'Result 2'}),
     ]
     mock_client.query_points.return_value = mock_result
 
+    # Mock upsert() for storage
+    mock_client.upsert.return_value = None
+
     return mock_client
 
 
 @pytest.fixture
-def mock_qdrant_client_no_collection():
-    """Provide a mocked QdrantClient with no collections (for validation testing)."""
-    mock_client = MagicMock(spec=QdrantClient)
-    mock_client.get_collections.return_value = MagicMock(collections=[])
+def make_cra_client(mock_qdrant_client: MagicMock) -> Callable[..., 'TaxDataQdrantClient']:
+    """Provide a factory for 'cra' TaxDataQdrantClients backed by `mock_qdrant_client`."""
+    from tax_rag_scraper.storage.qdrant_client import TaxDataQdrantClient
+
+    def _make(**kwargs: Any) -> 'TaxDataQdrantClient':
+        return TaxDataQdrantClient(
+            url='https://test.cloud.qdrant.io',
+            api_key='test-key',
+            collection_name='cra-collection',
+            source='cra',
+            client=mock_qdrant_client,
+            **kwargs,
+        )
+
+    return _make
+
+
+@pytest.fixture
+def cra_client(make_cra_client: Callable[..., 'TaxDataQdrantClient']) -> 'TaxDataQdrantClient':
+    """Provide a TaxDataQdrantClient for the 'cra' source, backed by `mock_qdrant_client`."""
+    return make_cra_client()
+
+
+@pytest.fixture
+def mock_qdrant_client_no_collection() -> MagicMock:
+    """Provide a mocked AsyncQdrantClient with no collections (for validation testing)."""
+    mock_client = MagicMock(spec=AsyncQdrantClient)
+    mock_client.get_collection.side_effect = UnexpectedResponse(
+        status_code=404,
+        reason_phrase='Not Found',
+        content=b'{"status": {"error": "Not found: Collection doesn\'t exist!"}}',
+        headers=httpx.Headers(),
+    )
     return mock_client
 
 
@@ -176,10 +272,12 @@ def mock_qdrant_client_no_collection():
 # SECTION 6: Integration Test Fixtures (Real Qdrant - Optional)
 # ============================================================================
 
+
 @pytest.fixture
 def real_qdrant_available() -> bool:
     """Check if real Qdrant instance is available for integration tests."""
     import os
+
     return bool(os.getenv('QDRANT_URL') and os.getenv('QDRANT_API_KEY'))
 
 
@@ -196,12 +294,13 @@ async def real_qdrant_client(real_qdrant_available) -> AsyncGenerator:
     Tests will be skipped if these variables are not set.
     """
     if not real_qdrant_available:
-        pytest.skip("Real Qdrant not available (set QDRANT_URL and QDRANT_API_KEY)")
+        pytest.skip('Real Qdrant not available (set QDRANT_URL and QDRANT_API_KEY)')
 
     import os
+
     from tax_rag_scraper.storage.qdrant_client import TaxDataQdrantClient
 
-    client = TaxDataQdrantClient(
+    client = await TaxDataQdrantClient.create(
         url=os.getenv('QDRANT_URL'),
         api_key=os.getenv('QDRANT_API_KEY'),
         collection_name=os.getenv('QDRANT_TEST_COLLECTION', 'test-collection'),
@@ -211,4 +310,4 @@ async def real_qdrant_client(real_qdrant_available) -> AsyncGenerator:
     yield client
 
     # Cleanup: optionally delete test data
-    # client.delete_collection()  # Uncomment if you want cleanup
+    # await client.delete_collection()  # Uncomment if you want cleanup
@@ -1,15 +1,34 @@
 """Integration tests for hybrid search pipeline.
 
 Tests the complete end-to-end workflow:
-document → dense embedding → sparse embedding → storage → hybrid search
+document → dense embedding → storage (BM25 computed by Qdrant) → hybrid search
 """
 
+import itertools
+from collections.abc import Callable
+from types import SimpleNamespace
+
+import numpy as np
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
-from tax_rag_scraper.utils.embeddings import EmbeddingService, SparseEmbeddingService
+from unittest.mock import MagicMock, AsyncMock
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import Document, Fusion, FusionQuery
+from tax_rag_scraper.utils.embeddings import EmbeddingService
 from tax_rag_scraper.storage.qdrant_client import TaxDataQdrantClient
 
 
+def mock_embeddings_create(embedding_for_text: Callable[[str], list[float]] = lambda _: [0.1] * 1536) -> AsyncMock:
+    """Mock `embeddings.create` returning one response per batched request."""
+
+    async def create(*, input: list[str], **_: object) -> SimpleNamespace:  # noqa: A002
+        return SimpleNamespace(
+            data=[SimpleNamespace(embedding=embedding_for_text(text)) for text in input],
+            usage=SimpleNamespace(total_tokens=50 * len(input)),
+        )
+
+    return AsyncMock(side_effect=create)
+
+
 @pytest.mark.integration
 class TestHybridSearchPipeline:
     """Test complete pipeline from document to search."""
@@ -17,162 +36,118 @@ class TestHybridSearchPipeline:
     @pytest.mark.asyncio
     async def test_end_to_end_pipeline(
         self,
-        sample_tax_document,
-        mock_openai_api_key,
-        mock_qdrant_url,
-        mock_qdrant_api_key,
+        sample_tax_document: dict,
+        mock_openai_api_key: str,
+        mock_qdrant_url: str,
+        mock_qdrant_api_key: str,
+        make_collection_info: Callable[..., MagicMock],
     ) -> None:
-        """Test full pipeline: document → dense embed → sparse embed → store → hybrid search."""
-
-        # Setup services
-        with patch('tax_rag_scraper.storage.qdrant_client.QdrantClient') as mock_qdrant_class:
-            mock_client = MagicMock()
-            mock_collection = MagicMock()
-            mock_collection.name = 'test-collection'
-            mock_client.get_collections.return_value = MagicMock(collections=[mock_collection])
-            mock_qdrant_class.return_value = mock_client
-
-            # Initialize services
-            dense_service = EmbeddingService(api_key=mock_openai_api_key)
-            sparse_service = SparseEmbeddingService()
-            qdrant_client = TaxDataQdrantClient(
-                url=mock_qdrant_url,
-                api_key=mock_qdrant_api_key,
-                collection_name='test-collection',
-                source='test',
-            )
+        """Test full pipeline: document → dense embed → store with server-side BM25 → hybrid search."""
+        mock_client = MagicMock(spec=AsyncQdrantClient)
+        mock_client.get_collection.return_value = make_collection_info('test')
+        mock_client.query_points.return_value = MagicMock(points=[])
 
-            # Mock OpenAI response
-            mock_response = MagicMock()
-            mock_response.data = [MagicMock(embedding=[0.1] * 1536)]
-            mock_response.usage.total_tokens = 50
-            dense_service.client.embeddings.create = AsyncMock(return_value=mock_response)
-
-            # Step 1: Generate dense embeddings
-            dense_chunks = await dense_service.embed_documents([sample_tax_document])
-            assert len(dense_chunks) > 0, "Dense embeddings should be generated"
-
-            # Step 2: Generate sparse embeddings
-            chunk_texts = [text for text, _, _ in dense_chunks]
-            sparse_vectors = sparse_service.embed_texts(chunk_texts)
-            assert len(sparse_vectors) == len(dense_chunks), "Sparse vectors should match dense chunks"
-
-            # Step 3: Combine into hybrid chunks (4-tuples)
-            hybrid_chunks = [
-                (text, dense, sparse, metadata)
-                for (text, dense, metadata), sparse in zip(dense_chunks, sparse_vectors)
-            ]
-
-            # Verify hybrid chunk structure
-            assert len(hybrid_chunks) > 0
-            for chunk in hybrid_chunks:
-                assert len(chunk) == 4, "Hybrid chunk should have 4 elements: text, dense, sparse, metadata"
-                text, dense_vec, sparse_vec, metadata = chunk
-                assert isinstance(text, str)
-                assert len(dense_vec) == 1536
-                assert sparse_vec.indices is not None
-                assert isinstance(metadata, dict)
-
-            # Step 4: Store in Qdrant
-            await qdrant_client.store_documents(hybrid_chunks)
-
-            # Verify storage called
-            assert mock_client.upsert.called, "Qdrant upsert should be called"
-
-            # Step 5: Hybrid search
-            query_dense = [0.2] * 1536
-            query_sparse = sparse_service.embed_query('tax deduction')
-
-            mock_client.query_points.return_value = MagicMock(points=[])
-            results = qdrant_client.search(
-                query_vector=query_dense,
-                sparse_vector=query_sparse,
-                limit=5
-            )
-
-            # Verify hybrid search executed with prefetch
-            assert mock_client.query_points.called, "Qdrant query should be called"
-            call_args = mock_client.query_points.call_args
-            assert 'prefetch' in call_args.kwargs, "Hybrid search should use prefetch"
+        # Initialize services
+        dense_service = EmbeddingService(api_key=mock_openai_api_key)
+        dense_service.client.embeddings.create = mock_embeddings_create()
+        qdrant_client = await TaxDataQdrantClient.create(
+            url=mock_qdrant_url,
+            api_key=mock_qdrant_api_key,
+            collection_name='test-collection',
+            source='test',
+            client=mock_client,
+        )
+
+        # Step 1: Generate dense embeddings
+        chunk_texts, vectors, metadata = await dense_service.embed_documents([sample_tax_document])
+        assert len(chunk_texts) > 0, 'Dense embeddings should be generated'
+        assert vectors.shape == (len(chunk_texts), 1536)
+        assert len(metadata) == len(chunk_texts)
+
+        # Step 2: Store in Qdrant; BM25 sparse vectors are computed from the chunk text by the server
+        await qdrant_client.store_documents(chunk_texts, vectors, metadata)
+
+        assert mock_client.upsert.called, 'Qdrant upsert should be called'
+        points = [p for call in mock_client.upsert.call_args_list for p in call.kwargs['points']]
+        assert len(points) == len(chunk_texts)
+        assert np.asarray([point.vector['test-dense'] for point in points]).shape == (len(chunk_texts), 1536)
+        assert [point.vector['test-sparse'] for point in points] == [
+            Document(text=text, model='Qdrant/bm25') for text in chunk_texts
+        ]
+
+        # Step 3: Hybrid search
+        await qdrant_client.search(query_vector=[0.2] * 1536, query_text='tax deduction', limit=5)
+
+        # Verify hybrid search executed with prefetch and a server-side BM25 query
+        assert mock_client.query_points.called, 'Qdrant query should be called'
+        call_args = mock_client.query_points.call_args
+        assert 'prefetch' in call_args.kwargs, 'Hybrid search should use prefetch'
+        assert call_args.kwargs['query'] == FusionQuery(fusion=Fusion.RRF)
+        sparse_prefetch = next(p for p in call_args.kwargs['prefetch'] if p.using == 'test-sparse')
+        assert sparse_prefetch.query == Document(text='tax deduction', model='Qdrant/bm25')
 
     @pytest.mark.asyncio
     async def test_metadata_preserved_through_pipeline(
         self,
-        sample_tax_document,
-        mock_openai_api_key,
+        sample_tax_document: dict,
+        mock_openai_api_key: str,
     ) -> None:
         """Test that metadata is preserved throughout the entire pipeline."""
         dense_service = EmbeddingService(api_key=mock_openai_api_key)
-
-        # Mock OpenAI
-        mock_response = MagicMock()
-        mock_response.data = [MagicMock(embedding=[0.1] * 1536)]
-        mock_response.usage.total_tokens = 50
-        dense_service.client.embeddings.create = AsyncMock(return_value=mock_response)
+        dense_service.client.embeddings.create = mock_embeddings_create()
 
         # Generate embeddings
-        chunks = await dense_service.embed_documents([sample_tax_document])
+        chunk_texts, _, chunk_metadata = await dense_service.embed_documents([sample_tax_document])
 
         # Verify metadata is preserved
-        assert len(chunks) > 0
-        for text, embedding, metadata in chunks:
+        assert len(chunk_texts) > 0
+        for metadata in chunk_metadata:
             # Check all metadata fields
-            assert metadata['parent_title'] == sample_tax_document['title'], \
-                "parent_title should be preserved"
-            assert metadata['parent_url'] == sample_tax_document['url'], \
-                "parent_url should be preserved"
-            assert metadata['parent_source'] == sample_tax_document['source'], \
-                "parent_source should be preserved"
-            assert metadata['parent_doc_type'] == sample_tax_document['doc_type'], \
-                "parent_doc_type should be preserved"
-            assert metadata['parent_scraped_at'] == sample_tax_document['scraped_at'], \
-                "parent_scraped_at should be preserved"
+            assert metadata['parent_title'] == sample_tax_document['title'], 'parent_title should be preserved'
+            assert metadata['parent_url'] == sample_tax_document['url'], 'parent_url should be preserved'
+            assert metadata['parent_source'] == sample_tax_document['source'], 'parent_source should be preserved'
+            assert metadata['parent_doc_type'] == sample_tax_document['doc_type'], 'parent_doc_type should be preserved'
+            assert metadata['parent_scraped_at'] == sample_tax_document['scraped_at'], (
+                'parent_scraped_at should be preserved'
+            )
 
             # Check chunk metadata
             assert 'chunk_index' in metadata
             assert 'total_chunks' in metadata
             assert metadata['chunk_index'] >= 0
             assert metadata['total_chunks'] >= 1
-            assert metadata['chunk_index'] < metadata['total_chunks'], \
-                "chunk_index should be less than total_chunks"
+            assert metadata['chunk_index'] < metadata['total_chunks'], 'chunk_index should be less than total_chunks'
 
     @pytest.mark.asyncio
     async def test_pipeline_with_large_document(
         self,
-        sample_large_document,
-        mock_openai_api_key,
+        sample_large_document: dict,
+        mock_openai_api_key: str,
     ) -> None:
         """Test pipeline with large document requiring chunking."""
         dense_service = EmbeddingService(api_key=mock_openai_api_key)
-        sparse_service = SparseEmbeddingService()
 
         # Determine expected number of chunks
-        full_text = f"Title: {sample_large_document['title']}\nContent: {sample_large_document['content']}"
+        full_text = f'Title: {sample_large_document["title"]}\nContent: {sample_large_document["content"]}'
         expected_chunks = dense_service._chunk_text(full_text)
         num_expected_chunks = len(expected_chunks)
 
-        # Mock OpenAI to return embeddings for each chunk
-        mock_response = MagicMock()
-        mock_response.data = [MagicMock(embedding=[float(i) / 10] * 1536) for i in range(num_expected_chunks)]
-        mock_response.usage.total_tokens = 1000
-        dense_service.client.embeddings.create = AsyncMock(return_value=mock_response)
+        # Mock OpenAI to return a distinct embedding for each chunk, in request order
+        positions = itertools.count()
+        dense_service.client.embeddings.create = mock_embeddings_create(lambda _: [next(positions) / 10] * 1536)
 
         # Generate dense embeddings
-        dense_chunks = await dense_service.embed_documents([sample_large_document])
+        chunk_texts, vectors, chunk_metadata = await dense_service.embed_documents([sample_large_document])
 
         # Should create multiple chunks
-        assert len(dense_chunks) > 1, "Large document should be split into multiple chunks"
-        assert len(dense_chunks) == num_expected_chunks
-
-        # Generate sparse embeddings for all chunks
-        chunk_texts = [text for text, _, _ in dense_chunks]
-        sparse_vectors = sparse_service.embed_texts(chunk_texts)
-
-        assert len(sparse_vectors) == len(dense_chunks), \
-            "Should have one sparse vector per dense chunk"
+        assert len(chunk_texts) > 1, 'Large document should be split into multiple chunks'
+        assert len(chunk_texts) == num_expected_chunks
+        assert np.allclose(vectors[:, 0], [i / 10 for i in range(num_expected_chunks)]), (
+            'Embedding rows should stay aligned with their chunks'
+        )
 
         # Verify all chunks have correct metadata
-        for i, (text, dense_vec, metadata) in enumerate(dense_chunks):
+        for i, metadata in enumerate(chunk_metadata):
             assert metadata['chunk_index'] == i
             assert metadata['total_chunks'] == num_expected_chunks
             assert metadata['parent_title'] == sample_large_document['title']
@@ -3,11 +3,16 @@
 Tests chunking with overlap, token estimation, and embedding generation.
 """
 
+import asyncio
+import json
 import os
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
+import numpy as np
 import pytest
-from tax_rag_scraper.utils.embeddings import EmbeddingService
+from qdrant_client.models import SparseVector
+from tax_rag_scraper.utils.embeddings import EmbeddingService, SparseEmbeddingService
 
 
 class TestEmbeddingService:
@@ -107,6 +112,17 @@ class TestEmbeddingService:
         for chunk in chunks[:-1]:
             assert chunk.rstrip().endswith(('.', '!', '?')), 'Chunk should end at sentence boundary'
 
+    def test_chunk_text_breaks_at_last_sentence_end(self) -> None:
+        """Test that a chunk breaks at the last sentence ending in the search window."""
+        service = EmbeddingService(api_key='test_key')
+
+        # Two sentence endings in the last 500 chars of the first chunk (max_chars = 700)
+        text = 'word ' * 100 + 'first! ' + 'word ' * 20 + 'second? ' + 'word ' * 200
+
+        chunks = service._chunk_text(text, max_words=100, overlap_words=10)
+
+        assert chunks[0].endswith('second?')
+
     def test_chunk_text_respects_token_limits(self) -> None:
         """Test that all chunks are within token limits."""
         service = EmbeddingService(api_key='test_key')
@@ -142,12 +158,13 @@ class TestEmbeddingService:
         service = EmbeddingService(api_key='test_key')
 
         # Mock the OpenAI client
-        mock_response = MagicMock()
-        mock_response.data = [
-            MagicMock(embedding=[0.1] * 1536),
-            MagicMock(embedding=[0.2] * 1536),
-        ]
-        mock_response.usage.total_tokens = 100
+        mock_response = SimpleNamespace(
+            data=[
+                SimpleNamespace(embedding=[0.1] * 1536),
+                SimpleNamespace(embedding=[0.2] * 1536),
+            ],
+            usage=SimpleNamespace(total_tokens=100),
+        )
 
         service.client.embeddings.create = AsyncMock(return_value=mock_response)
 
@@ -178,9 +195,10 @@ class TestEmbeddingService:
         service = EmbeddingService(api_key='test_key')
 
         # Mock the OpenAI client
-        mock_response = MagicMock()
-        mock_response.data = [MagicMock(embedding=[0.1] * 1536)]
-        mock_response.usage.total_tokens = 50
+        mock_response = SimpleNamespace(
+            data=[SimpleNamespace(embedding=[0.1] * 1536)],
+            usage=SimpleNamespace(total_tokens=50),
+        )
 
         service.client.embeddings.create = AsyncMock(return_value=mock_response)
 
@@ -188,11 +206,13 @@ class TestEmbeddingService:
         documents = [{'title': 'Test Doc', 'content': 'Test content', 'url': 'http://example.com'}]
         chunks = await service.embed_documents(documents)
 
-        # Verify results - should return list of tuples
-        assert len(chunks) == 1
-        chunk_text, embedding, metadata = chunks[0]
-        assert isinstance(chunk_text, str)
-        assert len(embedding) == 1536
+        # Verify results - should return parallel (texts, embeddings, metadata) arrays
+        texts, embeddings, metadata_list = chunks
+        assert len(texts) == 1
+        assert isinstance(texts[0], str)
+        assert embeddings.shape == (1, 1536)
+        assert embeddings.dtype == np.float32
+        metadata = metadata_list[0]
         assert metadata['chunk_index'] == 0
         assert metadata['total_chunks'] == 1
         assert metadata['parent_title'] == 'Test Doc'
@@ -213,20 +233,22 @@ class TestEmbeddingService:
         num_chunks = len(text_chunks)
 
         # Mock the OpenAI client to return different embeddings for each chunk
-        mock_response = MagicMock()
-        mock_response.data = [MagicMock(embedding=[float(i) / 10] * 1536) for i in range(num_chunks)]
-        mock_response.usage.total_tokens = 1000
+        mock_response = SimpleNamespace(
+            data=[SimpleNamespace(embedding=[float(i) / 10] * 1536) for i in range(num_chunks)],
+            usage=SimpleNamespace(total_tokens=1000),
+        )
 
         service.client.embeddings.create = AsyncMock(return_value=mock_response)
 
         chunks = await service.embed_documents(documents)
 
         # Should return multiple chunks (one per text chunk)
-        assert len(chunks) == num_chunks
+        texts, embeddings, metadata_list = chunks
+        assert len(texts) == num_chunks
         assert num_chunks > 1, 'Document should be split into multiple chunks'
 
         # Verify all chunks have correct structure and metadata
-        for i, (chunk_text, embedding, metadata) in enumerate(chunks):
+        for i, (chunk_text, embedding, metadata) in enumerate(zip(texts, embeddings, metadata_list, strict=True)):
             assert isinstance(chunk_text, str)
             assert len(chunk_text) > 0
             assert len(embedding) == 1536
@@ -235,15 +257,213 @@ class TestEmbeddingService:
             assert metadata['parent_title'] == 'Large Doc'
             assert metadata['parent_url'] == 'http://example.com/large'
 
+    @pytest.mark.asyncio
+    async def test_embed_documents_batches_across_documents(self) -> None:
+        """Test that chunks from several documents are embedded in a single API request"""
+        service = EmbeddingService(api_key='test_key')
+
+        mock_response = SimpleNamespace(
+            data=[SimpleNamespace(embedding=[float(i)] * 1536) for i in range(3)],
+            usage=SimpleNamespace(total_tokens=30),
+        )
+        service.client.embeddings.create = AsyncMock(return_value=mock_response)
+
+        documents = [
+            {'title': f'Doc {i}', 'content': f'Content {i}', 'url': f'http://example.com/{i}'} for i in range(3)
+        ]
+        chunks = await service.embed_documents(documents)
+
+        service.client.embeddings.create.assert_awaited_once()
+        assert len(service.client.embeddings.create.call_args.kwargs['input']) == 3
+        _, embeddings, metadata_list = chunks
+        for i, (embedding, metadata) in enumerate(zip(embeddings, metadata_list, strict=True)):
+            assert embedding.tolist() == [float(i)] * 1536
+            assert metadata['parent_url'] == f'http://example.com/{i}'
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_splits_requests(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that embed_batch splits inputs into requests of at most EMBEDDING_BATCH_SIZE texts"""
+        monkeypatch.setattr('tax_rag_scraper.utils.embeddings.EMBEDDING_BATCH_SIZE', 2)
+        service = EmbeddingService(api_key='test_key')
+
+        async def create(*, input: list[str], **_: object) -> SimpleNamespace:  # noqa: A002
+            return SimpleNamespace(
+                data=[SimpleNamespace(embedding=[float(text[-1])]) for text in input],
+                usage=SimpleNamespace(total_tokens=len(input)),
+            )
+
+        service.client.embeddings.create = AsyncMock(side_effect=create)
+
+        embeddings = await service.embed_batch([f'text {i}' for i in range(5)])
+
+        assert [len(call.kwargs['input']) for call in service.client.embeddings.create.call_args_list] == [2, 2, 1]
+        assert embeddings.tolist() == [[float(i)] for i in range(5)]
+        assert embeddings.dtype == np.float32
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_concurrent_requests(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that embed_batch overlaps its requests and keeps rows in input order"""
+        monkeypatch.setattr('tax_rag_scraper.utils.embeddings.EMBEDDING_BATCH_SIZE', 2)
+        service = EmbeddingService(api_key='test_key', max_concurrent_requests=3)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def create(*, input: list[str], **_: object) -> SimpleNamespace:  # noqa: A002
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            # Later requests finish first
+            await asyncio.sleep({'text 0': 0.03, 'text 2': 0.02, 'text 4': 0.01}[input[0]])
+            in_flight -= 1
+            return SimpleNamespace(
+                data=[SimpleNamespace(embedding=[float(text[-1])]) for text in input],
+                usage=SimpleNamespace(total_tokens=len(input)),
+            )
+
+        service.client.embeddings.create = AsyncMock(side_effect=create)
+
+        embeddings = await service.embed_batch([f'text {i}' for i in range(6)])
+
+        assert max_in_flight == 3
+        assert embeddings.tolist() == [[float(i)] for i in range(6)]
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_failure_cancels_pending(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a failed request cancels the other requests of the batch and waits for them to stop"""
+        monkeypatch.setattr('tax_rag_scraper.utils.embeddings.EMBEDDING_BATCH_SIZE', 1)
+        service = EmbeddingService(api_key='test_key')
+        completed = []
+        cancelled = []
+
+        async def create(*, input: list[str], **_: object) -> MagicMock:  # noqa: A002
+            if input == ['text 0']:
+                raise RuntimeError('invalid input')
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                cancelled.append(input)
+                raise
+            completed.append(input)
+            return MagicMock()
+
+        service.client.embeddings.create = AsyncMock(side_effect=create)
+
+        with pytest.raises(RuntimeError, match='invalid input'):
+            await service.embed_batch([f'text {i}' for i in range(3)])
+
+        # The other requests have already stopped when embed_batch raises
+        assert sorted(cancelled) == [['text 1'], ['text 2']]
+        await asyncio.sleep(0.1)
+        assert completed == []
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_with_batch_api(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the Batch API path submits one job, polls it and reorders the results"""
+        monkeypatch.setattr('tax_rag_scraper.utils.embeddings.EMBEDDING_BATCH_SIZE', 2)
+        monkeypatch.setattr('tax_rag_scraper.utils.embeddings.BATCH_API_POLL_INTERVAL', 0)
+        service = EmbeddingService(api_key='test_key', use_batch_api=True)
+        service.client.embeddings.create = AsyncMock()
+
+        submitted = {}
+
+        async def create_file(*, file: tuple[str, bytes], purpose: str) -> SimpleNamespace:
+            assert purpose == 'batch'
+            submitted['requests'] = [json.loads(line) for line in file[1].decode().splitlines()]
+            return SimpleNamespace(id='file-in')
+
+        def result(custom_id: str, texts: list[str]) -> str:
+            data = [{'embedding': [float(text[-1])]} for text in texts]
+            return json.dumps(
+                {'custom_id': custom_id, 'response': {'status_code': 200, 'body': {'data': data}}, 'error': None}
+            )
+
+        service.client.files.create = AsyncMock(side_effect=create_file)
+        service.client.batches.create = AsyncMock(return_value=SimpleNamespace(id='batch-1', status='validating'))
+        service.client.batches.retrieve = AsyncMock(
+            side_effect=[
+                SimpleNamespace(id='batch-1', status='in_progress'),
+                SimpleNamespace(id='batch-1', status='completed', output_file_id='file-out', error_file_id=None),
+            ]
+        )
+        # Results arrive out of request order
+        service.client.files.content = AsyncMock(
+            return_value=SimpleNamespace(
+                text='\n'.join([result('1', ['text 2', 'text 3']), result('0', ['text 0', 'text 1'])])
+            )
+        )
+
+        embeddings = await service.embed_batch([f'text {i}' for i in range(4)])
+
+        service.client.embeddings.create.assert_not_called()
+        assert [request['body']['input'] for request in submitted['requests']] == [
+            ['text 0', 'text 1'],
+            ['text 2', 'text 3'],
+        ]
+        assert service.client.batches.create.call_args.kwargs['endpoint'] == '/v1/embeddings'
+        assert service.client.batches.retrieve.await_count == 2
+        assert embeddings.dtype == np.float32
+        assert embeddings.tolist() == [[0.0], [1.0], [2.0], [3.0]]
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_with_batch_api_failure(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a Batch API job that never completes raises instead of returning partial results"""
+        monkeypatch.setattr('tax_rag_scraper.utils.embeddings.BATCH_API_POLL_INTERVAL', 0)
+        service = EmbeddingService(api_key='test_key', use_batch_api=True)
+        service.client.files.create = AsyncMock(return_value=SimpleNamespace(id='file-in'))
+        service.client.batches.create = AsyncMock(
+            return_value=SimpleNamespace(id='batch-1', status='expired', errors=None)
+        )
+
+        with pytest.raises(RuntimeError, match="status 'expired'"):
+            await service.embed_batch(['text 0'])
+
+    @pytest.mark.asyncio
+    async def test_embed_batch_empty(self) -> None:
+        """Test that embed_batch returns an empty 2-D array without calling the API."""
+        service = EmbeddingService(api_key='test_key')
+        service.client.embeddings.create = AsyncMock()
+
+        embeddings = await service.embed_batch([])
+
+        service.client.embeddings.create.assert_not_called()
+        assert embeddings.shape == (0, 0)
+        assert embeddings.dtype == np.float32
+
+    @pytest.mark.asyncio
+    async def test_embed_texts_concurrency_bounded(self) -> None:
+        """Test that concurrent callers never exceed max_concurrent_requests in-flight API requests"""
+        service = EmbeddingService(api_key='test_key', max_concurrent_requests=2)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def create(*, input: list[str], **_: object) -> SimpleNamespace:  # noqa: A002
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return SimpleNamespace(
+                data=[SimpleNamespace(embedding=[0.1]) for _ in input],
+                usage=SimpleNamespace(total_tokens=len(input)),
+            )
+
+        service.client.embeddings.create = AsyncMock(side_effect=create)
+
+        await asyncio.gather(*(service.embed_texts([f'text {i}']) for i in range(6)))
+
+        assert service.client.embeddings.create.await_count == 6
+        assert max_in_flight == 2
+
     @pytest.mark.asyncio
     async def test_embed_query(self) -> None:
         """Test embed_query for single query"""
         service = EmbeddingService(api_key='test_key')
 
         # Mock the OpenAI client
-        mock_response = MagicMock()
-        mock_response.data = [MagicMock(embedding=[0.5] * 1536)]
-        mock_response.usage.total_tokens = 10
+        mock_response = SimpleNamespace(
+            data=[SimpleNamespace(embedding=[0.5] * 1536)],
+            usage=SimpleNamespace(total_tokens=10),
+        )
 
         service.client.embeddings.create = AsyncMock(return_value=mock_response)
 
@@ -256,6 +476,80 @@ class TestEmbeddingService:
         assert embedding == [0.5] * 1536
 
 
+class TestSparseEmbeddingService:
+    """Test cases for SparseEmbeddingService class."""
+
+    def test_model_loaded_lazily(self) -> None:
+        """Test that constructing the service does not load the FastEmbed model."""
+        service = SparseEmbeddingService()
+
+        assert service.model_name == 'Qdrant/bm25'
+        assert service._model is None
+
+    def test_embed_texts_single_batched_call(self) -> None:
+        """Test that all texts are embedded with one model call and converted to SparseVectors."""
+        service = SparseEmbeddingService(batch_size=64)
+        service._model = MagicMock()
+        service._model.embed.return_value = iter(
+            [
+                MagicMock(indices=np.array([1, 5]), values=np.array([0.5, 1.5])),
+                MagicMock(indices=np.array([2]), values=np.array([1.0])),
+            ]
+        )
+
+        vectors = service.embed_texts(['first text', 'second text'])
+
+        service._model.embed.assert_called_once_with(['first text', 'second text'], batch_size=64, parallel=None)
+        assert vectors == [
+            SparseVector(indices=[1, 5], values=[0.5, 1.5]),
+            SparseVector(indices=[2], values=[1.0]),
+        ]
+
+    def test_embed_texts_parallel(self) -> None:
+        """Test that the configured worker process count is passed to FastEmbed."""
+        service = SparseEmbeddingService(parallel=0)
+        service._model = MagicMock()
+        service._model.embed.return_value = iter([MagicMock(indices=np.array([1]), values=np.array([1.0]))])
+
+        service.embed_texts(['text'])
+
+        assert service._model.embed.call_args.kwargs['parallel'] == 0
+
+    def test_embed_texts_empty(self) -> None:
+        """Test that an empty input skips the model entirely."""
+        service = SparseEmbeddingService()
+
+        assert service.embed_texts([]) == []
+        assert service._model is None
+
+    def test_embed_query(self) -> None:
+        """Test that queries use the model's query embedding."""
+        service = SparseEmbeddingService()
+        service._model = MagicMock()
+        service._model.query_embed.return_value = iter([MagicMock(indices=np.array([3]), values=np.array([1.0]))])
+
+        vector = service.embed_query('tax deduction')
+
+        service._model.query_embed.assert_called_once_with('tax deduction')
+        assert vector == SparseVector(indices=[3], values=[1.0])
+
+    def test_embed_queries_single_call(self) -> None:
+        """Test that several queries are embedded with one query_embed call."""
+        service = SparseEmbeddingService()
+        service._model = MagicMock()
+        service._model.query_embed.return_value = iter(
+            [
+                MagicMock(indices=np.array([3]), values=np.array([1.0])),
+                MagicMock(indices=np.array([4]), values=np.array([1.0])),
+            ]
+        )
+
+        vectors = service.embed_queries(['tax deduction', 'gst rebate'])
+
+        service._model.query_embed.assert_called_once_with(['tax deduction', 'gst rebate'])
+        assert vectors == [SparseVector(indices=[3], values=[1.0]), SparseVector(indices=[4], values=[1.0])]
+
+
 class TestChunkingOverlap:
     """Specific tests for chunk overlap functionality."""
 
@@ -363,31 +657,35 @@ class TestIntegrationRealisticDocument:
         service = EmbeddingService(api_key='test_key')
 
         # Mock OpenAI client
-        mock_response = MagicMock()
-        mock_response.data = [MagicMock(embedding=[0.1] * 1536)]
-        mock_response.usage.total_tokens = 50
+        mock_response = SimpleNamespace(
+            data=[SimpleNamespace(embedding=[0.1] * 1536)],
+            usage=SimpleNamespace(total_tokens=50),
+        )
         service.client.embeddings.create = AsyncMock(return_value=mock_response)
 
         # Document with all new metadata fields
-        documents = [{
-            'title': 'Tax Deduction Guide',
-            'content': 'Information about tax deductions for individuals.',
-            'url': 'https://www.canada.ca/en/revenue-agency/services/tax/individuals/topics/about-your-tax-return/tax-return/completing-a-tax-return/deductions-credits-expenses/deductions-credits-expenses.html',
-            'source': 'CRA',
-            'doc_type': 'CRA_Guide',
-            'scraped_at': '2024-01-15T10:30:00Z',
-        }]
+        documents = [
+            {
+                'title': 'Tax Deduction Guide',
+                'content': 'Information about tax deductions for individuals.',
+                'url': 'https://www.canada.ca/en/revenue-agency/services/tax/individuals/topics/about-your-tax-return/tax-return/completing-a-tax-return/deductions-credits-expenses/deductions-credits-expenses.html',
+                'source': 'CRA',
+                'doc_type': 'CRA_Guide',
+                'scraped_at': '2024-01-15T10:30:00Z',
+            }
+        ]
 
         chunks = await service.embed_documents(documents)
 
         # Verify new metadata fields are preserved
-        assert len(chunks) == 1
-        _, _, metadata = chunks[0]
+        _, _, metadata_list = chunks
+        assert len(metadata_list) == 1
+        metadata = metadata_list[0]
 
         # Check all new metadata fields
-        assert metadata['parent_source'] == 'CRA', "parent_source should be preserved"
-        assert metadata['parent_doc_type'] == 'CRA_Guide', "parent_doc_type should be preserved"
-        assert metadata['parent_scraped_at'] == '2024-01-15T10:30:00Z', "parent_scraped_at should be preserved"
+        assert metadata['parent_source'] == 'CRA', 'parent_source should be preserved'
+        assert metadata['parent_doc_type'] == 'CRA_Guide', 'parent_doc_type should be preserved'
+        assert metadata['parent_scraped_at'] == '2024-01-15T10:30:00Z', 'parent_scraped_at should be preserved'
 
         # Also verify existing metadata fields still work
         assert metadata['parent_title'] == 'Tax Deduction Guide'
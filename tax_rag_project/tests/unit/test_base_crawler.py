@@ -3,9 +3,14 @@
 Tests document batching, flushing, and error handling in the base crawler.
 """
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from tax_rag_scraper.crawlers.base_crawler import TaxDataCrawler
+from tax_rag_scraper.crawlers.base_crawler import PIPELINE_QUEUE_SIZE, TaxDataCrawler
 from tax_rag_scraper.config.settings import Settings
 
 
@@ -22,19 +27,86 @@ class TestTaxDataCrawlerBatching:
         settings.QDRANT_SOURCE = 'test'
 
         # Mock Qdrant client to avoid initialization errors
-        with patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient'):
-            with patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'):
-                crawler = TaxDataCrawler(
-                    settings=settings,
-                    use_qdrant=True,
-                    qdrant_url='https://test.cloud.qdrant.io',
-                    qdrant_api_key='test-key',
-                )
-
-                # Verify batch initialization
-                assert crawler.batch_size == 10
-                assert crawler.document_batch == []
-                assert isinstance(crawler.document_batch, list)
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient'),
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'),
+        ):
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+            # Verify batch initialization
+            assert crawler.batch_size == 10
+            assert crawler.document_batch == []
+            assert isinstance(crawler.document_batch, list)
+
+    def test_upsert_tuning_from_settings(self) -> None:
+        """Test that upsert batch size and concurrency are passed from settings to the Qdrant client."""
+        settings = Settings()
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+        settings.UPSERT_BATCH_SIZE = 64
+        settings.UPSERT_CONCURRENCY = 2
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'),
+        ):
+            TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+        assert mock_qdrant_class.call_args.kwargs['upsert_batch_size'] == 64
+        assert mock_qdrant_class.call_args.kwargs['upsert_concurrency'] == 2
+
+    def test_server_side_sparse_embeddings(self) -> None:
+        """Test that SPARSE_EMBEDDING_LOCAL=False skips the local BM25 model and enables cloud inference."""
+        settings = Settings()
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+        settings.SPARSE_EMBEDDING_LOCAL = False
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'),
+        ):
+            TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+        assert mock_qdrant_class.call_args.kwargs['sparse_service'] is None
+        assert mock_qdrant_class.call_args.kwargs['cloud_inference'] is True
+
+    def test_batch_api_mode(self) -> None:
+        """Test that EMBEDDING_BATCH_API embeds through the Batch API in large document batches."""
+        settings = Settings()
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+        settings.EMBEDDING_BATCH_API = True
+        settings.EMBEDDING_BATCH_API_SIZE = 1000
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient'),
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+        ):
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+        assert crawler.batch_size == 1000
+        assert mock_embedding_class.call_args.kwargs['use_batch_api'] is True
 
     def test_batch_initialization_without_qdrant(self) -> None:
         """Test that batch_size is 0 when Qdrant is disabled."""
@@ -55,26 +127,28 @@ class TestTaxDataCrawlerBatching:
         settings.QDRANT_COLLECTION = 'test-collection'
         settings.QDRANT_SOURCE = 'test'
 
-        with patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient'):
-            with patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'):
-                crawler = TaxDataCrawler(
-                    settings=settings,
-                    use_qdrant=True,
-                    qdrant_url='https://test.cloud.qdrant.io',
-                    qdrant_api_key='test-key',
-                )
-
-                # Add documents to batch
-                doc1 = {'title': 'Doc 1', 'content': 'Content 1'}
-                doc2 = {'title': 'Doc 2', 'content': 'Content 2'}
-
-                await crawler._store_document(doc1)
-                assert len(crawler.document_batch) == 1
-                assert crawler.document_batch[0] == doc1
-
-                await crawler._store_document(doc2)
-                assert len(crawler.document_batch) == 2
-                assert crawler.document_batch[1] == doc2
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient'),
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'),
+        ):
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+            # Add documents to batch
+            doc1 = {'title': 'Doc 1', 'content': 'Content 1'}
+            doc2 = {'title': 'Doc 2', 'content': 'Content 2'}
+
+            await crawler._store_document(doc1)
+            assert len(crawler.document_batch) == 1
+            assert crawler.document_batch[0] == doc1
+
+            await crawler._store_document(doc2)
+            assert len(crawler.document_batch) == 2
+            assert crawler.document_batch[1] == doc2
 
     @pytest.mark.asyncio
     async def test_batch_flush_on_size(self) -> None:
@@ -84,45 +158,49 @@ class TestTaxDataCrawlerBatching:
         settings.QDRANT_COLLECTION = 'test-collection'
         settings.QDRANT_SOURCE = 'test'
 
-        with patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class:
-            with patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class:
-                # Setup mocks
-                mock_qdrant = MagicMock()
-                mock_qdrant.store_documents = AsyncMock()
-                mock_qdrant_class.return_value = mock_qdrant
-
-                mock_embedding = MagicMock()
-                # Mock embed_documents to return 3-tuples: (text, embedding, metadata)
-                mock_embedding.embed_documents = AsyncMock(return_value=[
-                    ('Chunk 1', [0.1] * 1536, {'chunk_index': 0}),
-                    ('Chunk 2', [0.2] * 1536, {'chunk_index': 1}),
-                    ('Chunk 3', [0.3] * 1536, {'chunk_index': 2}),
-                ])
-                mock_embedding_class.return_value = mock_embedding
-
-                crawler = TaxDataCrawler(
-                    settings=settings,
-                    use_qdrant=True,
-                    qdrant_url='https://test.cloud.qdrant.io',
-                    qdrant_api_key='test-key',
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+        ):
+            # Setup mocks
+            mock_qdrant = MagicMock()
+            mock_qdrant.store_documents = AsyncMock()
+            mock_qdrant_class.return_value = mock_qdrant
+
+            mock_embedding = MagicMock()
+            # Mock embed_documents to return parallel (texts, embeddings, metadata) arrays
+            mock_embedding.embed_documents = AsyncMock(
+                return_value=(
+                    ['Chunk 1', 'Chunk 2', 'Chunk 3'],
+                    np.full((3, 1536), 0.1, dtype=np.float32),
+                    [{'chunk_index': 0}, {'chunk_index': 1}, {'chunk_index': 2}],
                 )
+            )
+            mock_embedding_class.return_value = mock_embedding
 
-                # Add documents one by one
-                await crawler._store_document({'title': 'Doc 1', 'content': 'Content 1'})
-                assert len(crawler.document_batch) == 1
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
 
-                await crawler._store_document({'title': 'Doc 2', 'content': 'Content 2'})
-                assert len(crawler.document_batch) == 2
+            # Add documents one by one
+            await crawler._store_document({'title': 'Doc 1', 'content': 'Content 1'})
+            assert len(crawler.document_batch) == 1
 
-                # Adding third document should trigger flush
-                await crawler._store_document({'title': 'Doc 3', 'content': 'Content 3'})
+            await crawler._store_document({'title': 'Doc 2', 'content': 'Content 2'})
+            assert len(crawler.document_batch) == 2
 
-                # Batch should be empty after flush
-                assert len(crawler.document_batch) == 0
+            # Adding third document should trigger flush
+            await crawler._store_document({'title': 'Doc 3', 'content': 'Content 3'})
 
-                # Verify embedding service was called
-                mock_embedding.embed_documents.assert_called_once()
-                mock_qdrant.store_documents.assert_called_once()
+            # Batch should be empty after flush
+            assert len(crawler.document_batch) == 0
+
+            # Verify embedding service was called
+            mock_embedding.embed_documents.assert_called_once()
+            mock_qdrant.store_documents.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_batch_flush_on_completion(self) -> None:
@@ -132,139 +210,259 @@ class TestTaxDataCrawlerBatching:
         settings.QDRANT_COLLECTION = 'test-collection'
         settings.QDRANT_SOURCE = 'test'
 
-        with patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class:
-            with patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class:
-                # Setup mocks
-                mock_qdrant = MagicMock()
-                mock_qdrant.store_documents = AsyncMock()
-                mock_qdrant.count_documents = MagicMock(return_value=2)
-                mock_qdrant_class.return_value = mock_qdrant
-
-                mock_embedding = MagicMock()
-                mock_embedding.embed_documents = AsyncMock(return_value=[
-                    ('Chunk 1', [0.1] * 1536, {'chunk_index': 0}),
-                    ('Chunk 2', [0.2] * 1536, {'chunk_index': 1}),
-                ])
-                mock_embedding_class.return_value = mock_embedding
-
-                crawler = TaxDataCrawler(
-                    settings=settings,
-                    use_qdrant=True,
-                    qdrant_url='https://test.cloud.qdrant.io',
-                    qdrant_api_key='test-key',
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+        ):
+            # Setup mocks
+            mock_qdrant = MagicMock()
+            mock_qdrant.store_documents = AsyncMock()
+            mock_qdrant.validate = AsyncMock()
+            mock_qdrant.count_documents = AsyncMock(return_value=2)
+            mock_qdrant.flush = AsyncMock()
+            mock_qdrant_class.return_value = mock_qdrant
+
+            mock_embedding = MagicMock()
+            mock_embedding.embed_documents = AsyncMock(
+                return_value=(
+                    ['Chunk 1', 'Chunk 2'],
+                    np.full((2, 1536), 0.1, dtype=np.float32),
+                    [{'chunk_index': 0}, {'chunk_index': 1}],
                 )
+            )
+            mock_embedding_class.return_value = mock_embedding
 
-                # Add 2 documents (less than batch_size)
-                crawler.document_batch = [
-                    {'title': 'Doc 1', 'content': 'Content 1'},
-                    {'title': 'Doc 2', 'content': 'Content 2'},
-                ]
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
 
-                # Mock the crawler.run() method to simulate completion
-                crawler.crawler.run = AsyncMock()
+            # Add 2 documents (less than batch_size)
+            crawler.document_batch = [
+                {'title': 'Doc 1', 'content': 'Content 1'},
+                {'title': 'Doc 2', 'content': 'Content 2'},
+            ]
 
-                # Run the crawler
-                await crawler.run(['https://example.com'])
+            # Mock the crawler.run() method to simulate completion
+            crawler.crawler.run = AsyncMock()
 
-                # Verify batch was flushed despite not reaching batch_size
-                assert len(crawler.document_batch) == 0
-                mock_embedding.embed_documents.assert_called_once()
-                mock_qdrant.store_documents.assert_called_once()
+            # Run the crawler
+            await crawler.run(['https://example.com'])
+
+            # Verify batch was flushed despite not reaching batch_size
+            assert len(crawler.document_batch) == 0
+            mock_embedding.embed_documents.assert_called_once()
+            mock_qdrant.store_documents.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_flush_batch_calls_embedding_service(self) -> None:
-        """Test that _flush_batch calls the dense embedding service."""
+    async def test_run_bulk_mode_wraps_ingest(self) -> None:
+        """Test that QDRANT_BULK_MODE keeps indexing deferred until the final batch is stored."""
         settings = Settings()
         settings.EMBEDDING_BATCH_SIZE = 5
         settings.QDRANT_COLLECTION = 'test-collection'
         settings.QDRANT_SOURCE = 'test'
-
-        with patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class:
-            with patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class:
-                # Setup mocks
-                mock_qdrant = MagicMock()
-                mock_qdrant.store_documents = AsyncMock()
-                mock_qdrant_class.return_value = mock_qdrant
-
-                mock_embedding = MagicMock()
-                dense_chunks = [
-                    ('Chunk 1', [0.1] * 1536, {'chunk_index': 0, 'parent_title': 'Doc 1'}),
-                    ('Chunk 2', [0.2] * 1536, {'chunk_index': 1, 'parent_title': 'Doc 2'}),
-                ]
-                mock_embedding.embed_documents = AsyncMock(return_value=dense_chunks)
-                mock_embedding_class.return_value = mock_embedding
-
-                crawler = TaxDataCrawler(
-                    settings=settings,
-                    use_qdrant=True,
-                    qdrant_url='https://test.cloud.qdrant.io',
-                    qdrant_api_key='test-key',
+        settings.QDRANT_BULK_MODE = True
+        events = []
+
+        @contextlib.asynccontextmanager
+        async def bulk_mode() -> AsyncIterator[None]:
+            events.append('enter')
+            yield
+            events.append('exit')
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+        ):
+            mock_qdrant = MagicMock()
+            mock_qdrant.store_documents = AsyncMock(side_effect=lambda *_: events.append('store'))
+            mock_qdrant.validate = AsyncMock()
+            mock_qdrant.count_documents = AsyncMock(return_value=1)
+            mock_qdrant.flush = AsyncMock(side_effect=lambda: events.append('flush'))
+            mock_qdrant.bulk_mode = bulk_mode
+            mock_qdrant_class.return_value = mock_qdrant
+
+            mock_embedding = MagicMock()
+            mock_embedding.embed_documents = AsyncMock(
+                return_value=(
+                    ['Chunk 1'],
+                    np.full((1, 1536), 0.1, dtype=np.float32),
+                    [{'chunk_index': 0}],
                 )
+            )
+            mock_embedding_class.return_value = mock_embedding
 
-                # Add documents to batch
-                documents = [
-                    {'title': 'Doc 1', 'content': 'Content 1'},
-                    {'title': 'Doc 2', 'content': 'Content 2'},
-                ]
-                crawler.document_batch = documents
-
-                # Flush batch
-                await crawler._flush_batch()
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+            crawler.document_batch = [{'title': 'Doc 1', 'content': 'Content 1'}]
+            crawler.crawler.run = AsyncMock()
 
-                # Verify dense embedding service was called with original documents
-                mock_embedding.embed_documents.assert_called_once_with(documents)
+            await crawler.run(['https://example.com'])
 
-                # Verify Qdrant was called with the dense chunks directly (BM25 computed by Qdrant)
-                mock_qdrant.store_documents.assert_called_once_with(dense_chunks)
+        assert events == ['enter', 'store', 'exit', 'flush']
 
     @pytest.mark.asyncio
-    async def test_flush_batch_stores_in_qdrant(self) -> None:
-        """Test that _flush_batch calls qdrant_client.store_documents() with 3-tuple chunks."""
+    async def test_run_enables_quantization(self) -> None:
+        """Test that QDRANT_QUANTIZE enables quantization after validation, before crawling."""
         settings = Settings()
-        settings.EMBEDDING_BATCH_SIZE = 5
         settings.QDRANT_COLLECTION = 'test-collection'
         settings.QDRANT_SOURCE = 'test'
+        settings.QDRANT_QUANTIZE = True
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'),
+        ):
+            mock_qdrant = MagicMock()
+            mock_qdrant.validate = AsyncMock()
+            mock_qdrant.enable_quantization = AsyncMock()
+            mock_qdrant.count_documents = AsyncMock(return_value=0)
+            mock_qdrant.flush = AsyncMock()
+            mock_qdrant_class.return_value = mock_qdrant
+
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+            # Quantization is enabled before crawling starts
+            crawler.crawler.run = AsyncMock(side_effect=lambda _: mock_qdrant.enable_quantization.assert_awaited_once())
+
+            await crawler.run(['https://example.com'])
+
+        mock_qdrant.validate.assert_awaited_once()
 
-        with patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class:
-            with patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class:
-                # Setup mocks
-                mock_qdrant = MagicMock()
-                mock_qdrant.store_documents = AsyncMock()
-                mock_qdrant_class.return_value = mock_qdrant
-
-                mock_embedding = MagicMock()
-                dense_chunks = [
-                    ('Chunk 1', [0.1] * 1536, {'chunk_index': 0}),
-                ]
-                mock_embedding.embed_documents = AsyncMock(return_value=dense_chunks)
-                mock_embedding_class.return_value = mock_embedding
-
-                crawler = TaxDataCrawler(
-                    settings=settings,
-                    use_qdrant=True,
-                    qdrant_url='https://test.cloud.qdrant.io',
-                    qdrant_api_key='test-key',
-                )
+    @pytest.mark.asyncio
+    async def test_run_writes_metrics_when_qdrant_flush_fails(self) -> None:
+        """Test that a failed post-crawl flush still counts documents and writes the run's metrics."""
+        settings = Settings()
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
 
-                # Add document to batch
-                crawler.document_batch = [{'title': 'Doc 1', 'content': 'Content 1'}]
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'),
+        ):
+            mock_qdrant = MagicMock()
+            mock_qdrant.validate = AsyncMock()
+            mock_qdrant.count_documents = AsyncMock(return_value=0)
+            mock_qdrant.flush = AsyncMock(side_effect=ConnectionError('Qdrant unreachable'))
+            mock_qdrant_class.return_value = mock_qdrant
+
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+            crawler.crawler.run = AsyncMock()
+
+            with patch.object(crawler, '_write_metrics') as mock_write_metrics:
+                await crawler.run(['https://example.com'], crawl_type='daily')
+
+        mock_qdrant.count_documents.assert_awaited_once()
+        mock_write_metrics.assert_called_once_with('daily')
 
-                # Flush batch
-                await crawler._flush_batch()
+    @pytest.mark.asyncio
+    async def test_flush_batch_calls_embedding_service(self) -> None:
+        """Test that _flush_batch calls the dense embedding service."""
+        settings = Settings()
+        settings.EMBEDDING_BATCH_SIZE = 5
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
 
-                # Verify Qdrant store_documents was called
-                mock_qdrant.store_documents.assert_called_once()
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+        ):
+            # Setup mocks
+            mock_qdrant = MagicMock()
+            mock_qdrant.store_documents = AsyncMock()
+            mock_qdrant_class.return_value = mock_qdrant
+
+            mock_embedding = MagicMock()
+            dense_chunks = (
+                ['Chunk 1', 'Chunk 2'],
+                np.full((2, 1536), 0.1, dtype=np.float32),
+                [{'chunk_index': 0, 'parent_title': 'Doc 1'}, {'chunk_index': 1, 'parent_title': 'Doc 2'}],
+            )
+            mock_embedding.embed_documents = AsyncMock(return_value=dense_chunks)
+            mock_embedding_class.return_value = mock_embedding
+
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+            # Add documents to batch
+            documents = [
+                {'title': 'Doc 1', 'content': 'Content 1'},
+                {'title': 'Doc 2', 'content': 'Content 2'},
+            ]
+            crawler.document_batch = documents
+
+            # Flush batch
+            await crawler._flush_batch()
+
+            # Verify dense embedding service was called with original documents
+            mock_embedding.embed_documents.assert_called_once_with(documents)
+
+            # Verify Qdrant was called with the chunk arrays directly (BM25 computed by Qdrant)
+            mock_qdrant.store_documents.assert_called_once_with(*dense_chunks)
 
-                # Verify 3-tuple chunk structure (text, dense, metadata)
-                call_args = mock_qdrant.store_documents.call_args[0][0]
-                assert len(call_args) == 1
-                chunk = call_args[0]
-                assert len(chunk) == 3  # (text, dense, metadata)
+    @pytest.mark.asyncio
+    async def test_flush_batch_stores_in_qdrant(self) -> None:
+        """Test that _flush_batch calls qdrant_client.store_documents() with parallel chunk arrays."""
+        settings = Settings()
+        settings.EMBEDDING_BATCH_SIZE = 5
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
 
-                text, dense, metadata = chunk
-                assert text == 'Chunk 1'
-                assert dense == [0.1] * 1536
-                assert metadata == {'chunk_index': 0}
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+        ):
+            # Setup mocks
+            mock_qdrant = MagicMock()
+            mock_qdrant.store_documents = AsyncMock()
+            mock_qdrant_class.return_value = mock_qdrant
+
+            mock_embedding = MagicMock()
+            dense_chunks = (['Chunk 1'], np.full((1, 1536), 0.1, dtype=np.float32), [{'chunk_index': 0}])
+            mock_embedding.embed_documents = AsyncMock(return_value=dense_chunks)
+            mock_embedding_class.return_value = mock_embedding
+
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+            # Add document to batch
+            crawler.document_batch = [{'title': 'Doc 1', 'content': 'Content 1'}]
+
+            # Flush batch
+            await crawler._flush_batch()
+
+            # Verify Qdrant store_documents was called
+            mock_qdrant.store_documents.assert_called_once()
+
+            # Verify parallel chunk arrays (texts, dense matrix, metadata)
+            texts, vectors, metadata = mock_qdrant.store_documents.call_args.args
+            assert texts == ['Chunk 1']
+            assert vectors.shape == (1, 1536)
+            assert vectors.dtype == np.float32
+            assert metadata == [{'chunk_index': 0}]
 
     @pytest.mark.asyncio
     async def test_flush_batch_error_handling(self) -> None:
@@ -274,35 +472,37 @@ class TestTaxDataCrawlerBatching:
         settings.QDRANT_COLLECTION = 'test-collection'
         settings.QDRANT_SOURCE = 'test'
 
-        with patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class:
-            with patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class:
-                with patch('tax_rag_scraper.crawlers.base_crawler.logger') as mock_logger:
-                    # Setup mocks to raise error
-                    mock_qdrant = MagicMock()
-                    mock_qdrant_class.return_value = mock_qdrant
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.logger') as mock_logger,
+        ):
+            # Setup mocks to raise error
+            mock_qdrant = MagicMock()
+            mock_qdrant_class.return_value = mock_qdrant
 
-                    mock_embedding = MagicMock()
-                    mock_embedding.embed_documents = AsyncMock(side_effect=Exception('Embedding failed'))
-                    mock_embedding_class.return_value = mock_embedding
+            mock_embedding = MagicMock()
+            mock_embedding.embed_documents = AsyncMock(side_effect=Exception('Embedding failed'))
+            mock_embedding_class.return_value = mock_embedding
 
-                    crawler = TaxDataCrawler(
-                        settings=settings,
-                        use_qdrant=True,
-                        qdrant_url='https://test.cloud.qdrant.io',
-                        qdrant_api_key='test-key',
-                    )
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
 
-                    # Add document to batch
-                    crawler.document_batch = [{'title': 'Doc 1', 'content': 'Content 1'}]
+            # Add document to batch
+            crawler.document_batch = [{'title': 'Doc 1', 'content': 'Content 1'}]
 
-                    # Flush batch - should not raise
-                    await crawler._flush_batch()
+            # Flush batch - should not raise
+            await crawler._flush_batch()
 
-                    # Verify error was logged
-                    mock_logger.exception.assert_called_once_with('Error flushing batch')
+            # Verify error was logged
+            mock_logger.exception.assert_called_once_with('Error flushing batch')
 
-                    # Batch should NOT be cleared on error (cleared inside try block)
-                    assert len(crawler.document_batch) == 1
+            # Batch should NOT be cleared on error (cleared inside try block)
+            assert len(crawler.document_batch) == 1
 
     @pytest.mark.asyncio
     async def test_empty_batch_no_flush(self) -> None:
@@ -312,30 +512,444 @@ class TestTaxDataCrawlerBatching:
         settings.QDRANT_COLLECTION = 'test-collection'
         settings.QDRANT_SOURCE = 'test'
 
-        with patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class:
-            with patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class:
-                # Setup mocks
-                mock_qdrant = MagicMock()
-                mock_qdrant.store_documents = AsyncMock()
-                mock_qdrant_class.return_value = mock_qdrant
-
-                mock_embedding = MagicMock()
-                mock_embedding.embed_documents = AsyncMock()
-                mock_embedding_class.return_value = mock_embedding
-
-                crawler = TaxDataCrawler(
-                    settings=settings,
-                    use_qdrant=True,
-                    qdrant_url='https://test.cloud.qdrant.io',
-                    qdrant_api_key='test-key',
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+        ):
+            # Setup mocks
+            mock_qdrant = MagicMock()
+            mock_qdrant.store_documents = AsyncMock()
+            mock_qdrant_class.return_value = mock_qdrant
+
+            mock_embedding = MagicMock()
+            mock_embedding.embed_documents = AsyncMock()
+            mock_embedding_class.return_value = mock_embedding
+
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+            # Ensure batch is empty
+            crawler.document_batch = []
+
+            # Flush batch, both inline and while the ingest pipeline is running
+            with patch('tax_rag_scraper.crawlers.base_crawler.logger') as mock_logger:
+                await crawler._flush_batch()
+                crawler._document_queue = asyncio.Queue()
+                await crawler._flush_batch()
+
+            # Verify nothing was embedded, stored, queued or logged
+            mock_embedding.embed_documents.assert_not_called()
+            mock_qdrant.store_documents.assert_not_called()
+            assert crawler._document_queue.empty()
+            assert not mock_logger.mock_calls
+
+    @pytest.mark.asyncio
+    async def test_run_pipelines_batches(self) -> None:
+        """Test that batches flushed during run() are embedded and stored by the ingest pipeline."""
+        settings = Settings()
+        settings.EMBEDDING_BATCH_SIZE = 2
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+        ):
+            mock_qdrant = MagicMock()
+            mock_qdrant.store_documents = AsyncMock()
+            mock_qdrant.validate = AsyncMock()
+            mock_qdrant.count_documents = AsyncMock(return_value=5)
+            mock_qdrant.flush = AsyncMock()
+            mock_qdrant_class.return_value = mock_qdrant
+
+            mock_embedding = MagicMock()
+            mock_embedding.embed_documents = AsyncMock(
+                side_effect=lambda docs: (
+                    [doc['title'] for doc in docs],
+                    np.full((len(docs), 1536), 0.1, dtype=np.float32),
+                    [{'chunk_index': 0} for _ in docs],
                 )
+            )
+            mock_embedding_class.return_value = mock_embedding
 
-                # Ensure batch is empty
-                crawler.document_batch = []
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
 
-                # Flush batch
-                await crawler._flush_batch()
+            async def crawl(_: list[str]) -> None:
+                for i in range(5):
+                    await crawler._store_document({'title': f'Doc {i}', 'content': f'Content {i}'})
+                    # Full batches are handed off, not embedded inline
+                    assert len(crawler.document_batch) == (i + 1) % 2
+
+            crawler.crawler.run = AsyncMock(side_effect=crawl)
+
+            await crawler.run(['https://example.com'])
 
-                # Verify no embedding or storage calls were made
-                mock_embedding.embed_documents.assert_not_called()
-                mock_qdrant.store_documents.assert_not_called()
+            # Five documents -> two full batches plus the final partial batch, stored in order
+            stored = [call.args[0] for call in mock_qdrant.store_documents.call_args_list]
+            assert stored == [['Doc 0', 'Doc 1'], ['Doc 2', 'Doc 3'], ['Doc 4']]
+            assert crawler._document_queue is None
+
+    @pytest.mark.asyncio
+    async def test_run_pipeline_continues_after_error(self) -> None:
+        """Test that a failed batch in the ingest pipeline is logged and later batches are still stored."""
+        settings = Settings()
+        settings.EMBEDDING_BATCH_SIZE = 1
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.logger') as mock_logger,
+        ):
+            mock_qdrant = MagicMock()
+            mock_qdrant.store_documents = AsyncMock()
+            mock_qdrant.validate = AsyncMock()
+            mock_qdrant.count_documents = AsyncMock(return_value=1)
+            mock_qdrant.flush = AsyncMock()
+            mock_qdrant_class.return_value = mock_qdrant
+
+            mock_embedding = MagicMock()
+            mock_embedding.embed_documents = AsyncMock(
+                side_effect=[
+                    Exception('Embedding failed'),
+                    (['Chunk'], np.full((1, 1536), 0.1, dtype=np.float32), [{'chunk_index': 0}]),
+                ]
+            )
+            mock_embedding_class.return_value = mock_embedding
+
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+            async def crawl(_: list[str]) -> None:
+                await crawler._store_document({'title': 'Doc 1', 'content': 'Content 1'})
+                await crawler._store_document({'title': 'Doc 2', 'content': 'Content 2'})
+
+            crawler.crawler.run = AsyncMock(side_effect=crawl)
+
+            await crawler.run(['https://example.com'])
+
+            mock_logger.exception.assert_called_once_with('Error flushing batch')
+            mock_qdrant.store_documents.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_run_pipeline_overlaps_embedding_and_upload(self) -> None:
+        """Test that the next batch is embedded while the previous batch is still being stored."""
+        settings = Settings()
+        settings.EMBEDDING_BATCH_SIZE = 1
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+        ):
+            second_batch_embedding = asyncio.Event()
+
+            async def embed_documents(docs: list[dict]) -> tuple:
+                if docs[0]['title'] == 'Doc 2':
+                    second_batch_embedding.set()
+                return [doc['title'] for doc in docs], np.full((len(docs), 1536), 0.1), [{}]
+
+            async def store_documents(texts: list[str], *_: object) -> None:
+                # The first upsert only completes once the second batch has started embedding
+                if texts == ['Doc 1']:
+                    await second_batch_embedding.wait()
+
+            mock_qdrant = MagicMock()
+            mock_qdrant.store_documents = AsyncMock(side_effect=store_documents)
+            mock_qdrant.validate = AsyncMock()
+            mock_qdrant.count_documents = AsyncMock(return_value=2)
+            mock_qdrant.flush = AsyncMock()
+            mock_qdrant_class.return_value = mock_qdrant
+
+            mock_embedding = MagicMock()
+            mock_embedding.embed_documents = AsyncMock(side_effect=embed_documents)
+            mock_embedding_class.return_value = mock_embedding
+
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+            async def crawl(_: list[str]) -> None:
+                await crawler._store_document({'title': 'Doc 1', 'content': 'Content 1'})
+                await crawler._store_document({'title': 'Doc 2', 'content': 'Content 2'})
+
+            crawler.crawler.run = AsyncMock(side_effect=crawl)
+
+            await asyncio.wait_for(crawler.run(['https://example.com']), timeout=5)
+
+            assert mock_qdrant.store_documents.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_handoff_keeps_documents(self) -> None:
+        """Test that a handler cancelled while the pipeline is full leaves its batch for a later flush."""
+        settings = Settings()
+        settings.EMBEDDING_BATCH_SIZE = 2
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient'),
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'),
+        ):
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+        # A backed-up pipeline: the queue is full and nothing is draining it
+        crawler._document_queue = asyncio.Queue(maxsize=1)
+        crawler._document_queue.put_nowait([{'title': 'Queued'}])
+
+        await crawler._store_document({'title': 'Doc 1'})
+        handler = asyncio.create_task(crawler._store_document({'title': 'Doc 2'}))
+        await asyncio.sleep(0)
+
+        # Documents from other handlers are buffered while the first one waits for room
+        await crawler._store_document({'title': 'Doc 3'})
+
+        # The request handler timeout cancels the waiting handler
+        handler.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await handler
+
+        assert [doc['title'] for doc in crawler.document_batch] == ['Doc 1', 'Doc 2', 'Doc 3']
+        assert crawler._document_queue.qsize() == 1
+
+        # Once the pipeline drains, the next flush hands over every buffered document
+        crawler._document_queue.get_nowait()
+        await crawler._flush_batch()
+
+        assert [doc['title'] for doc in crawler._document_queue.get_nowait()] == ['Doc 1', 'Doc 2', 'Doc 3']
+        assert crawler.document_batch == []
+
+    @pytest.mark.asyncio
+    async def test_handoff_timeout_keeps_documents(self) -> None:
+        """Test that a handler gives up waiting for a backed-up pipeline and keeps the batch buffered."""
+        settings = Settings()
+        settings.EMBEDDING_BATCH_SIZE = 1
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient'),
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'),
+        ):
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+        crawler._document_queue = asyncio.Queue(maxsize=1)
+        crawler._document_queue.put_nowait([{'title': 'Queued'}])
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.PIPELINE_PUT_TIMEOUT', 0.01),
+            patch('tax_rag_scraper.crawlers.base_crawler.logger') as mock_logger,
+        ):
+            await crawler._store_document({'title': 'Doc 1'})
+
+        mock_logger.warning.assert_called_once()
+        assert crawler.document_batch == [{'title': 'Doc 1'}]
+        assert not crawler._handoff_lock.locked()
+
+    @pytest.mark.asyncio
+    async def test_handoff_asyncio_timeout_keeps_documents(self) -> None:
+        """Test that asyncio.TimeoutError, raised by wait_for on Python 3.10, keeps the batch buffered."""
+        settings = Settings()
+        settings.EMBEDDING_BATCH_SIZE = 1
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient'),
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'),
+        ):
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+        crawler._document_queue = MagicMock(put=AsyncMock(side_effect=asyncio.TimeoutError))
+
+        with patch('tax_rag_scraper.crawlers.base_crawler.logger') as mock_logger:
+            await crawler._store_document({'title': 'Doc 1'})
+
+        mock_logger.warning.assert_called_once()
+        assert crawler.document_batch == [{'title': 'Doc 1'}]
+
+    @pytest.mark.asyncio
+    async def test_handoff_queues_a_snapshot(self) -> None:
+        """Test that documents added while a batch is being handed off stay buffered, not in the queued batch."""
+        settings = Settings()
+        settings.EMBEDDING_BATCH_SIZE = 1
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient'),
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService'),
+        ):
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+        queued: list[list[dict]] = []
+        queued_event = asyncio.Event()
+        release = asyncio.Event()
+
+        async def put(batch: list[dict]) -> None:
+            # The embed worker takes the batch while the handing-off handler is still suspended
+            queued.append(batch)
+            queued_event.set()
+            await release.wait()
+
+        crawler._document_queue = MagicMock(put=AsyncMock(side_effect=put))
+
+        handler = asyncio.create_task(crawler._store_document({'title': 'Doc 1'}))
+        await queued_event.wait()
+        await crawler._store_document({'title': 'Doc 2'})
+        release.set()
+        await handler
+
+        assert queued == [[{'title': 'Doc 1'}]]
+        assert crawler.document_batch == [{'title': 'Doc 2'}]
+
+    @pytest.mark.asyncio
+    async def test_run_batch_api_does_not_block_crawl(self) -> None:
+        """Test that Batch API jobs run in the background and are awaited after the crawl."""
+        settings = Settings()
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+        settings.EMBEDDING_BATCH_API = True
+        settings.EMBEDDING_BATCH_API_SIZE = 1
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+        ):
+            crawl_finished = asyncio.Event()
+
+            async def embed_documents(docs: list[dict]) -> tuple:
+                # A Batch API job only completes after the whole crawl has been scheduled
+                await crawl_finished.wait()
+                return [doc['title'] for doc in docs], np.full((len(docs), 1536), 0.1), [{}]
+
+            mock_qdrant = MagicMock()
+            mock_qdrant.store_documents = AsyncMock()
+            mock_qdrant.validate = AsyncMock()
+            mock_qdrant.count_documents = AsyncMock(return_value=3)
+            mock_qdrant.flush = AsyncMock()
+            mock_qdrant_class.return_value = mock_qdrant
+
+            mock_embedding = MagicMock()
+            mock_embedding.embed_documents = AsyncMock(side_effect=embed_documents)
+            mock_embedding_class.return_value = mock_embedding
+
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+            async def crawl(_: list[str]) -> None:
+                # More batches than the pipeline queues hold, none of them waiting on a job
+                for i in range(PIPELINE_QUEUE_SIZE * 2 + 1):
+                    await crawler._store_document({'title': f'Doc {i}', 'content': f'Content {i}'})
+                crawl_finished.set()
+
+            crawler.crawler.run = AsyncMock(side_effect=crawl)
+
+            await asyncio.wait_for(crawler.run(['https://example.com']), timeout=5)
+
+            stored = sorted(call.args[0][0] for call in mock_qdrant.store_documents.call_args_list)
+            assert stored == [f'Doc {i}' for i in range(PIPELINE_QUEUE_SIZE * 2 + 1)]
+            assert not crawler._batch_api_tasks
+
+    @pytest.mark.asyncio
+    async def test_run_batch_api_caps_jobs_and_isolates_failures(self) -> None:
+        """Test that at most EMBEDDING_BATCH_API_MAX_JOBS jobs run at once and a failed job keeps the others."""
+        settings = Settings()
+        settings.QDRANT_COLLECTION = 'test-collection'
+        settings.QDRANT_SOURCE = 'test'
+        settings.EMBEDDING_BATCH_API = True
+        settings.EMBEDDING_BATCH_API_SIZE = 1
+        settings.EMBEDDING_BATCH_API_MAX_JOBS = 2
+
+        with (
+            patch('tax_rag_scraper.crawlers.base_crawler.TaxDataQdrantClient') as mock_qdrant_class,
+            patch('tax_rag_scraper.crawlers.base_crawler.EmbeddingService') as mock_embedding_class,
+        ):
+            running = 0
+            max_running = 0
+
+            async def embed_documents(docs: list[dict]) -> tuple:
+                nonlocal running, max_running
+                running += 1
+                max_running = max(max_running, running)
+                try:
+                    await asyncio.sleep(0.01)
+                    if docs[0]['title'] == 'Doc 0':
+                        # Escapes _ingest_documents' error handling, like a job cancelled from outside
+                        raise asyncio.CancelledError
+                finally:
+                    running -= 1
+                return [doc['title'] for doc in docs], np.full((len(docs), 1536), 0.1), [{}]
+
+            mock_qdrant = MagicMock()
+            mock_qdrant.store_documents = AsyncMock()
+            mock_qdrant.validate = AsyncMock()
+            mock_qdrant.count_documents = AsyncMock(return_value=4)
+            mock_qdrant.flush = AsyncMock()
+            mock_qdrant_class.return_value = mock_qdrant
+
+            mock_embedding = MagicMock()
+            mock_embedding.embed_documents = AsyncMock(side_effect=embed_documents)
+            mock_embedding_class.return_value = mock_embedding
+
+            crawler = TaxDataCrawler(
+                settings=settings,
+                use_qdrant=True,
+                qdrant_url='https://test.cloud.qdrant.io',
+                qdrant_api_key='test-key',
+            )
+
+            async def crawl(_: list[str]) -> None:
+                for i in range(5):
+                    await crawler._store_document({'title': f'Doc {i}', 'content': f'Content {i}'})
+
+            crawler.crawler.run = AsyncMock(side_effect=crawl)
+
+            await asyncio.wait_for(crawler.run(['https://example.com']), timeout=5)
+
+        assert max_running == 2
+        stored = sorted(call.args[0][0] for call in mock_qdrant.store_documents.call_args_list)
+        assert stored == ['Doc 1', 'Doc 2', 'Doc 3', 'Doc 4']
+        assert not crawler._batch_api_tasks
@@ -0,0 +1,50 @@
+"""Test suite for process-wide .env loading."""
+
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from tax_rag_scraper.config import env
+
+
+@pytest.fixture(autouse=True)
+def _reset_env_cache() -> Generator[None, None, None]:
+    env.ensure_env_loaded.cache_clear()
+    yield
+    env.ensure_env_loaded.cache_clear()
+
+
+@pytest.mark.unit
+class TestEnsureEnvLoaded:
+    """Test that the .env file is resolved and loaded once per process."""
+
+    def test_env_path_is_project_root(self) -> None:
+        """Test that ENV_PATH points at tax_rag_project/.env."""
+        project_root = Path(__file__).resolve().parents[2]
+
+        assert project_root / '.env' == env.ENV_PATH
+
+    def test_loads_once(self, tmp_path: Path) -> None:
+        """Test that repeated calls read the .env file only once."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('TAX_RAG_TEST_VAR=1\n')
+
+        with (
+            patch.object(env, 'ENV_PATH', env_file),
+            patch.object(env, 'load_dotenv') as mock_load_dotenv,
+        ):
+            assert env.ensure_env_loaded() is True
+            assert env.ensure_env_loaded() is True
+
+        mock_load_dotenv.assert_called_once_with(env_file)
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        """Test that a missing .env file is reported without loading anything."""
+        with (
+            patch.object(env, 'ENV_PATH', tmp_path / '.env'),
+            patch.object(env, 'load_dotenv') as mock_load_dotenv,
+        ):
+            assert env.ensure_env_loaded() is False
+
+        mock_load_dotenv.assert_not_called()
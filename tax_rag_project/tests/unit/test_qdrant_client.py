@@ -4,133 +4,324 @@ Tests the Qdrant Cloud client for storing tax documentation with
 hybrid vector embeddings (dense + sparse).
 """
 
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+
+import grpc
+import httpx
+import numpy as np
 import pytest
-from unittest.mock import MagicMock, patch
-from qdrant_client.models import Document, PointStruct
-from tax_rag_scraper.storage.qdrant_client import TaxDataQdrantClient
+from unittest.mock import AsyncMock, MagicMock, patch
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import Document, Fusion, FusionQuery, PointStruct, ScalarType, SparseVector
+from tax_rag_scraper.storage._client_pool import close_qdrant_clients, get_qdrant_client
+from tax_rag_scraper.storage.qdrant_client import TaxDataQdrantClient, _url_uuid5
+
+
+def to_arrays(chunks: list[tuple]) -> tuple[list[str], np.ndarray, list[dict]]:
+    """Split (chunk_text, dense_embedding, metadata) tuples into the parallel arrays store_documents takes."""
+    texts, vectors, metadata = zip(*chunks, strict=True)
+    return list(texts), np.asarray(vectors, dtype=np.float32), list(metadata)
 
 
 @pytest.mark.unit
 class TestTaxDataQdrantClientInit:
     """Test initialization and validation."""
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
-    def test_init_success(self, mock_qdrant_class, mock_qdrant_client) -> None:
+    @pytest.mark.asyncio
+    async def test_init_success(self, mock_qdrant_client: MagicMock) -> None:
         """Test successful initialization with existing collection."""
-        mock_qdrant_class.return_value = mock_qdrant_client
-
-        client = TaxDataQdrantClient(
+        client = await TaxDataQdrantClient.create(
             url='https://test.cloud.qdrant.io',
             api_key='test-key',
             collection_name='cra-collection',
             source='cra',
+            client=mock_qdrant_client,
         )
 
         assert client.collection_name == 'cra-collection'
         assert client.source == 'cra'
         assert client.dense_vector_name == 'cra-dense'
         assert client.sparse_vector_name == 'cra-sparse'
+        mock_qdrant_client.get_collection.assert_awaited_once_with('cra-collection')
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
-    def test_init_collection_not_exists(
-        self, mock_qdrant_class, mock_qdrant_client_no_collection
-    ) -> None:
-        """Test initialization fails when collection doesn't exist."""
-        mock_qdrant_class.return_value = mock_qdrant_client_no_collection
+    def test_init_performs_no_io(self, mock_qdrant_client: MagicMock) -> None:
+        """Test that the constructor only wires up the client and leaves validation to validate()."""
+        client = TaxDataQdrantClient(
+            url='https://test.cloud.qdrant.io',
+            api_key='test-key',
+            collection_name='cra-collection',
+            source='cra',
+            client=mock_qdrant_client,
+        )
+
+        assert client.client is mock_qdrant_client
+        mock_qdrant_client.get_collection.assert_not_called()
 
-        with pytest.raises(RuntimeError, match="does not exist in Qdrant Cloud"):
-            TaxDataQdrantClient(
+    @pytest.mark.asyncio
+    async def test_init_collection_not_exists(self, mock_qdrant_client_no_collection: MagicMock) -> None:
+        """Test initialization fails when collection doesn't exist."""
+        with pytest.raises(RuntimeError, match='does not exist in Qdrant Cloud'):
+            await TaxDataQdrantClient.create(
                 url='https://test.cloud.qdrant.io',
                 api_key='test-key',
                 collection_name='nonexistent-collection',
                 source='cra',
+                client=mock_qdrant_client_no_collection,
             )
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
-    def test_init_custom_vector_size(self, mock_qdrant_class, mock_qdrant_client) -> None:
-        """Test initialization with custom vector size."""
-        mock_qdrant_class.return_value = mock_qdrant_client
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ('error', 'expected', 'match'),
+        [
+            # gRPC NOT_FOUND is also reported as a missing collection
+            (
+                grpc.aio.AioRpcError(
+                    code=grpc.StatusCode.NOT_FOUND,
+                    initial_metadata=grpc.aio.Metadata(),
+                    trailing_metadata=grpc.aio.Metadata(),
+                    details="Collection `cra-collection` doesn't exist!",
+                ),
+                RuntimeError,
+                'does not exist in Qdrant Cloud',
+            ),
+            # Other errors are re-raised rather than reported as missing
+            (
+                UnexpectedResponse(status_code=403, reason_phrase='Forbidden', content=b'', headers=httpx.Headers()),
+                UnexpectedResponse,
+                None,
+            ),
+        ],
+        ids=['grpc-not-found', 'forbidden'],
+    )
+    async def test_init_validation_errors(
+        self, error: Exception, expected: type[Exception], match: str | None, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test how errors from get_collection surface from create()."""
+        mock_qdrant_client.get_collection.side_effect = error
 
-        client = TaxDataQdrantClient(
+        with pytest.raises(expected, match=match):
+            await TaxDataQdrantClient.create(
+                url='https://test.cloud.qdrant.io',
+                api_key='test-key',
+                collection_name='cra-collection',
+                source='cra',
+                client=mock_qdrant_client,
+            )
+
+    @pytest.mark.asyncio
+    async def test_init_validates_once_per_collection(
+        self, mock_qdrant_client: MagicMock, make_collection_info: Callable[..., MagicMock]
+    ) -> None:
+        """Test that validation runs once per collection and is skipped on later constructions."""
+        for _ in range(3):
+            await TaxDataQdrantClient.create(
+                url='https://test.cloud.qdrant.io',
+                api_key='test-key',
+                collection_name='cra-collection',
+                source='cra',
+                client=mock_qdrant_client,
+            )
+
+        mock_qdrant_client.get_collection.assert_awaited_once_with('cra-collection')
+
+        # force_revalidate bypasses the memo
+        await TaxDataQdrantClient.create(
             url='https://test.cloud.qdrant.io',
             api_key='test-key',
             collection_name='cra-collection',
             source='cra',
-            vector_size=3072,  # text-embedding-3-large
+            client=mock_qdrant_client,
+            force_revalidate=True,
         )
+        assert mock_qdrant_client.get_collection.await_count == 2
 
-        assert client.vector_size == 3072
+        # A different collection is validated on its own
+        mock_qdrant_client.get_collection.return_value = make_collection_info('dof')
+        await TaxDataQdrantClient.create(
+            url='https://test.cloud.qdrant.io',
+            api_key='test-key',
+            collection_name='dof-collection',
+            source='dof',
+            client=mock_qdrant_client,
+        )
+
+        assert mock_qdrant_client.get_collection.await_count == 3
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
-    def test_named_vectors_correctly_formatted(
-        self, mock_qdrant_class, mock_qdrant_client
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('vector_size', [512, 3072])  # reduced text-embedding-3-small, text-embedding-3-large
+    async def test_init_custom_vector_size(
+        self, vector_size: int, mock_qdrant_client: MagicMock, make_collection_info: Callable[..., MagicMock]
     ) -> None:
-        """Test that named vectors are correctly formatted: 'cra' → 'cra-dense', 'cra-sparse'."""
-        # Setup mock to accept multiple collection names
-        def get_collections_side_effect():
-            # Return different collections based on which client was created
-            mock_collection = MagicMock()
-            # Return collection that matches whatever was requested
-            if hasattr(get_collections_side_effect, 'call_count'):
-                get_collections_side_effect.call_count += 1
-                if get_collections_side_effect.call_count == 1:
-                    mock_collection.name = 'cra-collection'
-                else:
-                    mock_collection.name = 'dof-collection'
-            else:
-                get_collections_side_effect.call_count = 1
-                mock_collection.name = 'cra-collection'
-            return MagicMock(collections=[mock_collection])
-
-        mock_qdrant_client.get_collections = get_collections_side_effect
-        mock_qdrant_class.return_value = mock_qdrant_client
+        """Test initialization with custom vector size."""
+        mock_qdrant_client.get_collection.return_value = make_collection_info('cra', vector_size=vector_size)
 
-        client = TaxDataQdrantClient(
+        client = await TaxDataQdrantClient.create(
             url='https://test.cloud.qdrant.io',
             api_key='test-key',
             collection_name='cra-collection',
             source='cra',
+            client=mock_qdrant_client,
+            vector_size=vector_size,
         )
 
-        assert client.dense_vector_name == 'cra-dense'
-        assert client.sparse_vector_name == 'cra-sparse'
+        assert client.vector_size == vector_size
 
-        # Test with different source
-        # Reset mock for second client
-        mock_dof_collection = MagicMock()
-        mock_dof_collection.name = 'dof-collection'
-        mock_qdrant_client.get_collections.return_value = MagicMock(collections=[mock_dof_collection])
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ('overrides', 'warnings'),
+        [({'quantization_config': None}, 1), ({}, 0)],
+        ids=['unquantized', 'scalar-int8'],
+    )
+    async def test_init_quantization_warning(
+        self,
+        overrides: dict[str, object],
+        warnings: int,
+        mock_qdrant_client: MagicMock,
+        make_collection_info: Callable[..., MagicMock],
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test that only a collection without scalar quantization is accepted with a warning."""
+        mock_qdrant_client.get_collection.return_value = make_collection_info('cra', **overrides)
+
+        with caplog.at_level(logging.WARNING, logger='tax_rag_scraper.storage.qdrant_client'):
+            await TaxDataQdrantClient.create(
+                url='https://test.cloud.qdrant.io',
+                api_key='test-key',
+                collection_name='cra-collection',
+                source='cra',
+                client=mock_qdrant_client,
+            )
+
+        assert sum('no quantization configured' in record.getMessage() for record in caplog.records) == warnings
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('source', ['cra', 'dof'])
+    async def test_named_vectors_correctly_formatted(
+        self, source: str, mock_qdrant_client: MagicMock, make_collection_info: Callable[..., MagicMock]
+    ) -> None:
+        """Test that named vectors are correctly formatted: 'cra' → 'cra-dense', 'cra-sparse'."""
+        mock_qdrant_client.get_collection.return_value = make_collection_info(source)
 
-        client2 = TaxDataQdrantClient(
+        client = await TaxDataQdrantClient.create(
+            url='https://test.cloud.qdrant.io',
+            api_key='test-key',
+            collection_name=f'{source}-collection',
+            source=source,
+            client=mock_qdrant_client,
+        )
+
+        assert client.dense_vector_name == f'{source}-dense'
+        assert client.sparse_vector_name == f'{source}-sparse'
+
+    @patch.dict('tax_rag_scraper.storage._client_pool._clients', clear=True)
+    @patch('tax_rag_scraper.storage._client_pool.AsyncQdrantClient')
+    def test_client_shared_per_endpoint(self, mock_async_qdrant_class: MagicMock) -> None:
+        """Test that clients for the same endpoint share one async client (and connection pool)."""
+        cra_client = TaxDataQdrantClient(
+            url='https://test.cloud.qdrant.io',
+            api_key='test-key',
+            collection_name='cra-collection',
+            source='cra',
+        )
+        dof_client = TaxDataQdrantClient(
             url='https://test.cloud.qdrant.io',
             api_key='test-key',
             collection_name='dof-collection',
             source='dof',
         )
 
-        assert client2.dense_vector_name == 'dof-dense'
-        assert client2.sparse_vector_name == 'dof-sparse'
+        assert mock_async_qdrant_class.call_count == 1
+        assert cra_client.client is dof_client.client
 
+    @patch.dict('tax_rag_scraper.storage._client_pool._clients', clear=True)
+    @patch('tax_rag_scraper.storage._client_pool.AsyncQdrantClient')
+    def test_client_prefers_grpc(self, mock_async_qdrant_class: MagicMock) -> None:
+        """Test that the shared client uses gRPC."""
+        TaxDataQdrantClient(
+            url='https://test.cloud.qdrant.io',
+            api_key='test-key',
+            collection_name='cra-collection',
+            source='cra',
+        )
 
-@pytest.mark.unit
-class TestTaxDataQdrantClientStorage:
-    """Test document storage with hybrid vectors."""
+        mock_async_qdrant_class.assert_called_once()
+        kwargs = mock_async_qdrant_class.call_args.kwargs
+        assert kwargs['prefer_grpc'] is True
+        assert kwargs['grpc_port'] == 6334
+        assert kwargs['pool_size'] == 16
+        assert kwargs['cloud_inference'] is False
+
+    @patch.dict('tax_rag_scraper.storage._client_pool._clients', clear=True)
+    @patch('tax_rag_scraper.storage._client_pool.AsyncQdrantClient')
+    def test_client_cloud_inference(self, mock_async_qdrant_class: MagicMock) -> None:
+        """Test that cloud_inference is passed to the shared client so BM25 Documents are embedded server-side."""
+        TaxDataQdrantClient(
+            url='https://test.cloud.qdrant.io',
+            api_key='test-key',
+            collection_name='cra-collection',
+            source='cra',
+            cloud_inference=True,
+        )
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
-    @pytest.mark.asyncio
-    async def test_store_documents_single_chunk(
-        self, mock_qdrant_class, mock_qdrant_client
-    ) -> None:
-        """Test storing a single document chunk with dual vectors."""
-        mock_qdrant_class.return_value = mock_qdrant_client
+        assert mock_async_qdrant_class.call_args.kwargs['cloud_inference'] is True
 
-        client = TaxDataQdrantClient(
+    @patch.dict('tax_rag_scraper.storage._client_pool._clients', clear=True)
+    @patch('tax_rag_scraper.storage._client_pool.AsyncQdrantClient')
+    def test_client_rest_fallback(self, mock_async_qdrant_class: MagicMock) -> None:
+        """Test that prefer_grpc=False gets its own REST client rather than the shared gRPC one."""
+        mock_async_qdrant_class.side_effect = lambda **_: MagicMock()
+        grpc_client = TaxDataQdrantClient(
             url='https://test.cloud.qdrant.io',
             api_key='test-key',
             collection_name='cra-collection',
             source='cra',
         )
+        rest_client = TaxDataQdrantClient(
+            url='https://test.cloud.qdrant.io',
+            api_key='test-key',
+            collection_name='cra-collection',
+            source='cra',
+            prefer_grpc=False,
+        )
+
+        assert mock_async_qdrant_class.call_count == 2
+        assert mock_async_qdrant_class.call_args.kwargs['prefer_grpc'] is False
+        assert grpc_client.client is not rest_client.client
 
+    @pytest.mark.asyncio
+    @patch.dict('tax_rag_scraper.storage._client_pool._clients', clear=True)
+    @patch('tax_rag_scraper.storage._client_pool.AsyncQdrantClient')
+    async def test_close_qdrant_clients(self, mock_async_qdrant_class: MagicMock) -> None:
+        """Test that closing the shared clients closes each one and forgets it."""
+        mock_async_qdrant_class.return_value.close = AsyncMock()
+        TaxDataQdrantClient(
+            url='https://test.cloud.qdrant.io',
+            api_key='test-key',
+            collection_name='cra-collection',
+            source='cra',
+        )
+
+        await close_qdrant_clients()
+
+        mock_async_qdrant_class.return_value.close.assert_awaited_once()
+        assert get_qdrant_client('https://test.cloud.qdrant.io', 'test-key') is not None
+        assert mock_async_qdrant_class.call_count == 2
+
+
+@pytest.mark.unit
+class TestTaxDataQdrantClientStorage:
+    """Test document storage with hybrid vectors."""
+
+    @pytest.mark.asyncio
+    async def test_store_documents_single_chunk(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test storing a single document chunk with dual vectors."""
         chunks = [
             (
                 'Tax deduction information',
@@ -143,18 +334,17 @@ class TestTaxDataQdrantClientStorage:
                     'parent_source': 'CRA',
                     'parent_doc_type': 'Guide',
                     'parent_scraped_at': '2024-01-15',
-                }
+                },
             )
         ]
 
-        await client.store_documents(chunks)
+        await cra_client.store_documents(*to_arrays(chunks))
 
         # Verify upsert was called once
         assert mock_qdrant_client.upsert.call_count == 1
 
         # Verify point structure
-        call_args = mock_qdrant_client.upsert.call_args
-        points = call_args.kwargs['points']
+        points = mock_qdrant_client.upsert.call_args.kwargs['points']
         assert len(points) == 1
 
         point = points[0]
@@ -166,62 +356,35 @@ class TestTaxDataQdrantClientStorage:
         assert point.payload['chunk_text'] == 'Tax deduction information'
         assert point.payload['title'] == 'Tax Guide'
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
     @pytest.mark.asyncio
     async def test_store_documents_multiple_chunks(
-        self, mock_qdrant_class, mock_qdrant_client
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
     ) -> None:
         """Test storing multiple document chunks."""
-        mock_qdrant_class.return_value = mock_qdrant_client
-
-        client = TaxDataQdrantClient(
-            url='https://test.cloud.qdrant.io',
-            api_key='test-key',
-            collection_name='cra-collection',
-            source='cra',
-        )
-
-        chunks = [
-            (
-                f'Chunk {i}',
-                [float(i)] * 1536,
-                {
-                    'chunk_index': i,
-                    'total_chunks': 3,
-                    'parent_title': 'Doc',
-                    'parent_url': 'http://example.com',
-                    'parent_source': 'CRA',
-                    'parent_doc_type': 'Guide',
-                    'parent_scraped_at': '2024-01-15',
-                },
-            )
-            for i in range(3)
-        ]
+        metadata = {
+            'total_chunks': 3,
+            'parent_title': 'Doc',
+            'parent_url': 'http://example.com',
+            'parent_source': 'CRA',
+            'parent_doc_type': 'Guide',
+            'parent_scraped_at': '2024-01-15',
+        }
+        texts = [f'Chunk {i}' for i in range(3)]
+        vectors = np.repeat(np.arange(3, dtype=np.float32)[:, None], 1536, axis=1)
 
-        await client.store_documents(chunks)
+        await cra_client.store_documents(texts, vectors, [{**metadata, 'chunk_index': i} for i in range(3)])
 
-        # Verify all chunks stored
-        call_args = mock_qdrant_client.upsert.call_args
-        points = call_args.kwargs['points']
+        # Verify all chunks stored, each with its own dense row
+        points = mock_qdrant_client.upsert.call_args.kwargs['points']
         assert len(points) == 3
+        assert [point.vector['cra-dense'][0] for point in points] == [0.0, 1.0, 2.0]
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
     @pytest.mark.asyncio
     async def test_store_documents_metadata_preservation(
-        self, mock_qdrant_class, mock_qdrant_client
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
     ) -> None:
-        """Test that all payload fields are preserved."""
-        mock_qdrant_class.return_value = mock_qdrant_client
-
-        client = TaxDataQdrantClient(
-            url='https://test.cloud.qdrant.io',
-            api_key='test-key',
-            collection_name='cra-collection',
-            source='cra',
-        )
-
+        """Test that document fields are stored once, on the first chunk, and referenced by doc_id."""
         metadata = {
-            'chunk_index': 2,
             'total_chunks': 5,
             'parent_title': 'Complete Tax Guide',
             'parent_url': 'https://canada.ca/tax-guide',
@@ -231,178 +394,715 @@ class TestTaxDataQdrantClientStorage:
         }
 
         chunks = [
-            (
-                'Content',
-                [0.1] * 1536,
-                metadata,
-            )
+            ('First', [0.1] * 1536, {**metadata, 'chunk_index': 0}),
+            ('Content', [0.1] * 1536, {**metadata, 'chunk_index': 2}),
         ]
 
-        await client.store_documents(chunks)
+        await cra_client.store_documents(*to_arrays(chunks))
+
+        # Verify document metadata is preserved on the first chunk
+        first, point = mock_qdrant_client.upsert.call_args.kwargs['points']
 
-        # Verify metadata is preserved in payload
-        call_args = mock_qdrant_client.upsert.call_args
-        point = call_args.kwargs['points'][0]
+        assert first.payload['doc_id'] == first.id
+        assert first.payload['title'] == 'Complete Tax Guide'
+        assert first.payload['url'] == 'https://canada.ca/tax-guide'
+        assert first.payload['source'] == 'CRA'
+        assert first.payload['doc_type'] == 'CRA_Guide'
+        assert first.payload['scraped_at'] == '2024-01-15T10:30:00Z'
 
-        assert point.payload['chunk_index'] == 2
-        assert point.payload['total_chunks'] == 5
-        assert point.payload['title'] == 'Complete Tax Guide'
-        assert point.payload['url'] == 'https://canada.ca/tax-guide'
-        assert point.payload['source'] == 'CRA'
-        assert point.payload['doc_type'] == 'CRA_Guide'
-        assert point.payload['scraped_at'] == '2024-01-15T10:30:00Z'
+        # Later chunks carry only chunk fields plus the doc_id
+        assert point.payload == {
+            'chunk_text': 'Content',
+            'chunk_index': 2,
+            'total_chunks': 5,
+            'doc_id': first.id,
+        }
+
+    @pytest.mark.asyncio
+    async def test_store_documents_without_parent_url_keeps_document_fields(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that chunks without a parent URL keep document fields, having no document to join."""
+        chunks = [('Content', [0.1] * 1536, {'chunk_index': 1, 'parent_title': 'Untitled'})]
+
+        await cra_client.store_documents(*to_arrays(chunks))
+
+        point = mock_qdrant_client.upsert.call_args.kwargs['points'][0]
+        assert 'doc_id' not in point.payload
+        assert point.payload['title'] == 'Untitled'
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
     @pytest.mark.asyncio
     async def test_store_documents_uuid_generation(
-        self, mock_qdrant_class, mock_qdrant_client
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
     ) -> None:
         """Test that unique IDs are generated for each point."""
-        mock_qdrant_class.return_value = mock_qdrant_client
+        chunks = [(f'Chunk {i}', [0.1] * 1536, {'chunk_index': i, 'total_chunks': 2}) for i in range(2)]
 
-        client = TaxDataQdrantClient(
-            url='https://test.cloud.qdrant.io',
-            api_key='test-key',
-            collection_name='cra-collection',
-            source='cra',
-        )
+        await cra_client.store_documents(*to_arrays(chunks))
+
+        # Verify unique IDs
+        points = mock_qdrant_client.upsert.call_args.kwargs['points']
+        ids = [point.id for point in points]
+
+        assert len(ids) == 2
+        assert ids[0] != ids[1], 'Each point should have a unique ID'
+        assert all(uuid.UUID(point_id).hex == point_id for point_id in ids), 'Random IDs use the compact hex form'
 
+    @pytest.mark.asyncio
+    async def test_store_documents_deterministic_ids(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that point IDs derive from parent URL + chunk index, so re-crawls overwrite points."""
         chunks = [
-            (
-                f'Chunk {i}',
-                [0.1] * 1536,
-                {'chunk_index': i, 'total_chunks': 2},
+            (f'Chunk {i}', [0.1] * 1536, {'chunk_index': i, 'parent_url': 'https://canada.ca/guide'}) for i in range(2)
+        ]
+
+        await cra_client.store_documents(*to_arrays(chunks))
+        first_ids = [p.id for p in mock_qdrant_client.upsert.call_args.kwargs['points']]
+
+        await cra_client.store_documents(*to_arrays(chunks))
+        second_ids = [p.id for p in mock_qdrant_client.upsert.call_args.kwargs['points']]
+
+        assert first_ids == second_ids
+        assert first_ids[0] != first_ids[1]
+        assert first_ids[0] == str(uuid.uuid5(uuid.NAMESPACE_URL, 'https://canada.ca/guide#0'))
+
+    @pytest.mark.asyncio
+    async def test_store_documents_batched_upserts(
+        self, mock_qdrant_client: MagicMock, make_cra_client: Callable[..., TaxDataQdrantClient]
+    ) -> None:
+        """Test that chunks are split into upsert batches sent without waiting for indexing."""
+        client = make_cra_client(upsert_batch_size=2)
+
+        chunks = [(f'Chunk {i}', [0.1] * 1536, {'chunk_index': i, 'total_chunks': 5}) for i in range(5)]
+
+        await client.store_documents(*to_arrays(chunks))
+
+        # 5 chunks in batches of 2 -> 3 upsert requests
+        assert mock_qdrant_client.upsert.call_count == 3
+        batch_sizes = [len(c.kwargs['points']) for c in mock_qdrant_client.upsert.call_args_list]
+        assert batch_sizes == [2, 2, 1]
+        assert all(c.kwargs['wait'] is False for c in mock_qdrant_client.upsert.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_store_documents_length_mismatch(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that chunk arrays of different lengths or vector width are rejected before any upsert."""
+        with pytest.raises(ValueError, match='differ in length'):
+            await cra_client.store_documents(['Chunk 0', 'Chunk 1'], np.zeros((1, 1536), dtype=np.float32), [{}, {}])
+        with pytest.raises(ValueError, match=r'expected \(n, 1536\)'):
+            await cra_client.store_documents(['Chunk 0'], np.zeros((1, 768), dtype=np.float32), [{}])
+
+        mock_qdrant_client.upsert.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_store_documents_retries_transient_errors(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that an upsert failing with UNAVAILABLE is retried with the same points."""
+        unavailable = grpc.aio.AioRpcError(
+            code=grpc.StatusCode.UNAVAILABLE,
+            initial_metadata=grpc.aio.Metadata(),
+            trailing_metadata=grpc.aio.Metadata(),
+        )
+        mock_qdrant_client.upsert.side_effect = [unavailable, None]
+
+        with patch('tax_rag_scraper.storage.qdrant_client.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            await cra_client.store_documents(['Chunk'], np.zeros((1, 1536), dtype=np.float32), [{'chunk_index': 0}])
+
+        assert mock_qdrant_client.upsert.await_count == 2
+        first, second = mock_qdrant_client.upsert.call_args_list
+        assert first.kwargs['points'] is second.kwargs['points']
+        mock_sleep.assert_awaited_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_store_documents_does_not_retry_permanent_errors(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that a rejected upsert (e.g. a wrong vector size) fails without retrying."""
+        mock_qdrant_client.upsert.side_effect = UnexpectedResponse(
+            status_code=400, reason_phrase='Bad Request', content=b'Wrong input', headers=httpx.Headers()
+        )
+
+        with pytest.raises(UnexpectedResponse):
+            await cra_client.store_documents(['Chunk'], np.zeros((1, 1536), dtype=np.float32), [{'chunk_index': 0}])
+
+        assert mock_qdrant_client.upsert.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_store_documents_retry_backoff_is_cancellable(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that cancelling store_documents during a retry backoff stops the upsert instead of retrying it."""
+        unavailable = grpc.aio.AioRpcError(
+            code=grpc.StatusCode.UNAVAILABLE,
+            initial_metadata=grpc.aio.Metadata(),
+            trailing_metadata=grpc.aio.Metadata(),
+        )
+        mock_qdrant_client.upsert.side_effect = unavailable
+        backoff_started = asyncio.Event()
+
+        async def sleep(_: float) -> None:
+            backoff_started.set()
+            await asyncio.Event().wait()
+
+        with patch('tax_rag_scraper.storage.qdrant_client.asyncio.sleep', new=sleep):
+            store = asyncio.create_task(
+                cra_client.store_documents(['Chunk'], np.zeros((1, 1536), dtype=np.float32), [{'chunk_index': 0}])
             )
+            await backoff_started.wait()
+            store.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await store
+
+        assert mock_qdrant_client.upsert.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_store_documents_failure_cancels_pending_upserts(
+        self, mock_qdrant_client: MagicMock, make_cra_client: Callable[..., TaxDataQdrantClient]
+    ) -> None:
+        """Test that a failed upsert cancels and awaits the batches still in flight before raising."""
+        client = make_cra_client(upsert_batch_size=1)
+        cancelled = []
+
+        async def upsert(*, points: list[PointStruct], **_: object) -> None:
+            if points[0].payload['chunk_text'] == 'Chunk 0':
+                raise UnexpectedResponse(
+                    status_code=400, reason_phrase='Bad Request', content=b'Wrong input', headers=httpx.Headers()
+                )
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(points[0].payload['chunk_text'])
+                raise
+
+        mock_qdrant_client.upsert.side_effect = upsert
+        chunks = [(f'Chunk {i}', [0.1] * 1536, {'chunk_index': i}) for i in range(3)]
+
+        with pytest.raises(UnexpectedResponse):
+            await client.store_documents(*to_arrays(chunks))
+
+        assert sorted(cancelled) == ['Chunk 1', 'Chunk 2']
+
+    @pytest.mark.asyncio
+    async def test_store_documents_build_failure_cancels_submitted_upserts(
+        self,
+        mock_qdrant_client: MagicMock,
+        make_cra_client: Callable[..., TaxDataQdrantClient],
+        mock_sparse_service: MagicMock,
+    ) -> None:
+        """Test that a sparse embedding failure partway through cancels the upserts already submitted."""
+        client = make_cra_client(upsert_batch_size=1, sparse_service=mock_sparse_service)
+        mock_sparse_service.embed_texts.side_effect = [[SparseVector(indices=[0], values=[1.0])], OSError('boom')]
+        upsert_started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def upsert(**_: object) -> None:
+            upsert_started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        mock_qdrant_client.upsert.side_effect = upsert
+        chunks = [(f'Chunk {i}', [0.1] * 1536, {'chunk_index': i}) for i in range(2)]
+
+        with pytest.raises(OSError, match='boom'):
+            await client.store_documents(*to_arrays(chunks))
+
+        assert upsert_started.is_set()
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_store_documents_precomputed_sparse_vectors(
+        self,
+        mock_qdrant_client: MagicMock,
+        make_cra_client: Callable[..., TaxDataQdrantClient],
+        mock_sparse_service: MagicMock,
+    ) -> None:
+        """Test that a sparse service replaces BM25 Documents with one precomputed batch per upsert."""
+        client = make_cra_client(upsert_batch_size=2, sparse_service=mock_sparse_service)
+
+        chunks = [(f'Chunk {i}', [0.1] * 1536, {'chunk_index': i}) for i in range(3)]
+
+        await client.store_documents(*to_arrays(chunks))
+
+        assert [call.args[0] for call in mock_sparse_service.embed_texts.call_args_list] == [
+            ['Chunk 0', 'Chunk 1'],
+            ['Chunk 2'],
+        ]
+        points = [p for call in mock_qdrant_client.upsert.call_args_list for p in call.kwargs['points']]
+        assert all(isinstance(point.vector['cra-sparse'], SparseVector) for point in points)
+
+    @pytest.mark.asyncio
+    async def test_bulk_upload(
+        self,
+        mock_qdrant_client: MagicMock,
+        make_cra_client: Callable[..., TaxDataQdrantClient],
+        mock_sparse_service: MagicMock,
+    ) -> None:
+        """Test that bulk_upload streams aligned ids, vectors and payloads to upload_collection."""
+        client = make_cra_client(sparse_service=mock_sparse_service)
+        mock_qdrant_client.init_options = {'prefer_grpc': False}
+        metadata = [
+            {'chunk_index': i, 'total_chunks': 2, 'parent_url': 'https://example.com/doc', 'parent_title': 'Doc'}
             for i in range(2)
         ]
+        uploaded = {}
 
-        await client.store_documents(chunks)
+        def upload_collection(*, ids: Iterable, payload: Iterable, vectors: Iterable, **_: object) -> None:
+            # Nothing is embedded until upload_collection pulls the vectors
+            uploaded['embedded_before_upload'] = mock_sparse_service.embed_texts.call_count
+            uploaded.update(ids=list(ids), payload=list(payload), vectors=list(vectors))
 
-        # Verify unique IDs
-        call_args = mock_qdrant_client.upsert.call_args
-        points = call_args.kwargs['points']
-        ids = [point.id for point in points]
+        mock_qdrant_client.upload_collection.side_effect = upload_collection
 
-        assert len(ids) == 2
-        assert ids[0] != ids[1], "Each point should have a unique ID"
+        texts = ['Chunk 0', 'Chunk 1']
+        vectors = np.full((2, 1536), 0.1, dtype=np.float32)
+
+        await client.bulk_upload(texts, vectors, metadata, parallel=2, batch_size=1)
+
+        kwargs = mock_qdrant_client.upload_collection.call_args.kwargs
+        assert kwargs['collection_name'] == 'cra-collection'
+        assert kwargs['parallel'] == 2
+        assert kwargs['batch_size'] == 1
+
+        # Sparse vectors are computed one upload batch at a time, as the batches are consumed
+        assert uploaded['embedded_before_upload'] == 0
+        assert [call.args[0] for call in mock_sparse_service.embed_texts.call_args_list] == [['Chunk 0'], ['Chunk 1']]
+
+        # Same deterministic IDs and compact payloads as store_documents
+        sparse_vectors = [SparseVector(indices=[0], values=[1.0])] * 2
+        points = client._build_points(texts, vectors, metadata, sparse_vectors)
+        assert uploaded['ids'] == [point.id for point in points]
+        assert uploaded['payload'] == [point.payload for point in points]
+        assert uploaded['vectors'] == [point.vector for point in points]
+
+    @pytest.mark.asyncio
+    async def test_bulk_upload_over_grpc_uses_one_process(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that bulk_upload does not fork worker processes from a client holding gRPC channels."""
+        mock_qdrant_client.init_options = {'prefer_grpc': True}
+
+        await cra_client.bulk_upload(['Chunk'], np.zeros((1, 1536), dtype=np.float32), [{}], parallel=4)
+
+        assert mock_qdrant_client.upload_collection.call_args.kwargs['parallel'] == 1
+
+    @pytest.mark.asyncio
+    async def test_bulk_upload_length_mismatch(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that bulk_upload rejects misaligned chunk arrays."""
+        with pytest.raises(ValueError, match='differ in length'):
+            await cra_client.bulk_upload(['Chunk'], np.zeros((2, 1536), dtype=np.float32), [{}])
+        mock_qdrant_client.upload_collection.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bulk_mode_defers_indexing(
+        self,
+        cra_client: TaxDataQdrantClient,
+        mock_qdrant_client: MagicMock,
+        make_collection_info: Callable[..., MagicMock],
+    ) -> None:
+        """Test that bulk_mode disables indexing and restores the previous threshold, even on error."""
+        mock_qdrant_client.get_collection.return_value = make_collection_info('cra', indexing_threshold=10000)
+
+        async def failing_upload() -> None:
+            async with cra_client.bulk_mode():
+                raise RuntimeError('upload failed')
+
+        with pytest.raises(RuntimeError, match='upload failed'):
+            await failing_upload()
+
+        disable, restore = mock_qdrant_client.update_collection.call_args_list
+        assert disable.kwargs['optimizers_config'].indexing_threshold == 0
+        assert restore.kwargs['collection_name'] == 'cra-collection'
+        assert restore.kwargs['optimizers_config'].indexing_threshold == 10000
+
+    @pytest.mark.asyncio
+    async def test_bulk_mode_restores_default_after_interrupted_run(
+        self,
+        cra_client: TaxDataQdrantClient,
+        mock_qdrant_client: MagicMock,
+        make_collection_info: Callable[..., MagicMock],
+    ) -> None:
+        """Test that a threshold of 0 left by an interrupted bulk upload is restored to Qdrant's default."""
+        mock_qdrant_client.get_collection.return_value = make_collection_info('cra', indexing_threshold=0)
+
+        async with cra_client.bulk_mode():
+            pass
+
+        restore = mock_qdrant_client.update_collection.call_args
+        assert restore.kwargs['optimizers_config'].indexing_threshold == 20000
+
+    @pytest.mark.asyncio
+    async def test_enable_quantization(
+        self,
+        cra_client: TaxDataQdrantClient,
+        mock_qdrant_client: MagicMock,
+        make_collection_info: Callable[..., MagicMock],
+    ) -> None:
+        """Test that int8 quantization is added to an unquantized dense vector and left alone otherwise."""
+        # Already quantized collection-wide: nothing to do
+        await cra_client.enable_quantization()
+        mock_qdrant_client.update_collection.assert_not_called()
+
+        mock_qdrant_client.get_collection.return_value = make_collection_info('cra', quantization_config=None)
+        await cra_client.enable_quantization()
+
+        mock_qdrant_client.update_collection.assert_awaited_once()
+        dense_diff = mock_qdrant_client.update_collection.call_args.kwargs['vectors_config']['cra-dense']
+        assert dense_diff.on_disk is True
+        assert dense_diff.quantization_config.scalar.type == ScalarType.INT8
+        assert dense_diff.quantization_config.scalar.always_ram is True
+
+    @pytest.mark.parametrize(
+        'name',
+        ['https://canada.ca/guide#0', 'https://www.canada.ca/en/revenue-agency/services/tax.html#17', 'https://é.ca#3'],
+    )
+    def test_url_uuid5_matches_uuid_module(self, name: str) -> None:
+        """Test that the fast point ID formatter produces the same IDs as uuid.uuid5."""
+        assert _url_uuid5(name) == str(uuid.uuid5(uuid.NAMESPACE_URL, name))
 
 
 @pytest.mark.unit
 class TestTaxDataQdrantClientSearch:
     """Test hybrid search functionality."""
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
-    def test_search_dense_only(self, mock_qdrant_class, mock_qdrant_client) -> None:
+    @pytest.mark.asyncio
+    async def test_search_dense_only(self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock) -> None:
         """Test search with dense vectors only (fallback when sparse_vector=None)."""
-        mock_qdrant_class.return_value = mock_qdrant_client
-
-        client = TaxDataQdrantClient(
-            url='https://test.cloud.qdrant.io',
-            api_key='test-key',
-            collection_name='cra-collection',
-            source='cra',
-        )
-
         query_vector = [0.5] * 1536
-        results = client.search(query_vector=query_vector, limit=5)
+        results = await cra_client.search(query_vector=query_vector, limit=5)
 
         # Verify query_points called with correct params
-        mock_qdrant_client.query_points.assert_called_once()
-        call_args = mock_qdrant_client.query_points.call_args
-        assert call_args.kwargs['using'] == 'cra-dense'
-        assert call_args.kwargs['limit'] == 5
-        assert 'prefetch' not in call_args.kwargs, "Dense-only search should not use prefetch"
+        mock_qdrant_client.query_points.assert_awaited_once()
+        kwargs = mock_qdrant_client.query_points.call_args.kwargs
+        assert kwargs['using'] == 'cra-dense'
+        assert kwargs['limit'] == 5
+        assert 'prefetch' not in kwargs, 'Dense-only search should not use prefetch'
+        quantization = kwargs['search_params'].quantization
+        assert quantization.rescore is True
+        assert quantization.oversampling == 2.0
 
         # Verify results returned
         assert len(results) == 2
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
-    def test_search_hybrid(self, mock_qdrant_class, mock_qdrant_client) -> None:
-        """Test hybrid search with both dense and BM25 sparse vectors using Prefetch."""
-        mock_qdrant_class.return_value = mock_qdrant_client
-
-        client = TaxDataQdrantClient(
-            url='https://test.cloud.qdrant.io',
-            api_key='test-key',
-            collection_name='cra-collection',
-            source='cra',
+    @pytest.mark.asyncio
+    async def test_search_joins_document_payloads(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that compact chunk results get document fields from one retrieve of their first chunks."""
+        mock_qdrant_client.query_points.return_value = MagicMock(
+            points=[
+                MagicMock(id='doc-a-2', payload={'chunk_text': 'A2', 'chunk_index': 2, 'doc_id': 'doc-a'}),
+                MagicMock(id='doc-a-3', payload={'chunk_text': 'A3', 'chunk_index': 3, 'doc_id': 'doc-a'}),
+                MagicMock(id='doc-b', payload={'chunk_text': 'B0', 'doc_id': 'doc-b', 'url': 'https://b'}),
+            ]
         )
+        mock_qdrant_client.retrieve.return_value = [
+            MagicMock(id='doc-a', payload={'title': 'Doc A', 'url': 'https://a'}),
+        ]
+
+        results = await cra_client.search(query_vector=[0.5] * 1536, limit=3)
+
+        # Only documents missing from the results are fetched, once each and without vectors
+        mock_qdrant_client.retrieve.assert_awaited_once()
+        retrieve_kwargs = mock_qdrant_client.retrieve.call_args.kwargs
+        assert retrieve_kwargs['ids'] == ['doc-a']
+        assert retrieve_kwargs['with_vectors'] is False
 
+        assert [result.payload.get('url') for result in results] == ['https://a', 'https://a', 'https://b']
+        assert results[0].payload['title'] == 'Doc A'
+        assert results[0].payload['chunk_text'] == 'A2'
+
+    @pytest.mark.asyncio
+    async def test_search_hybrid(self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock) -> None:
+        """Test hybrid search with both dense and BM25 sparse vectors using Prefetch."""
         query_vector = [0.5] * 1536
 
-        results = client.search(
+        results = await cra_client.search(
             query_vector=query_vector,
             query_text='tax deduction information',
             limit=5,
         )
 
         # Verify prefetch search was used
-        call_args = mock_qdrant_client.query_points.call_args
-        assert 'prefetch' in call_args.kwargs
-        prefetch = call_args.kwargs['prefetch']
-        assert len(prefetch) == 2, "Should prefetch from both dense and sparse vectors"
+        kwargs = mock_qdrant_client.query_points.call_args.kwargs
+        assert 'prefetch' in kwargs
+        prefetch = kwargs['prefetch']
+        assert len(prefetch) == 2, 'Should prefetch from both dense and sparse vectors'
+
+        # Both legs are merged server-side by reciprocal rank fusion
+        assert kwargs['query'] == FusionQuery(fusion=Fusion.RRF)
+        assert 'using' not in kwargs
+        assert kwargs['search_params'] is None
 
         # Verify the sparse prefetch uses BM25 Document
         sparse_prefetch = next(p for p in prefetch if p.using == 'cra-sparse')
         assert isinstance(sparse_prefetch.query, Document)
         assert sparse_prefetch.query.model == 'Qdrant/bm25'
+        assert sparse_prefetch.params is None
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
-    def test_search_limit_parameter(self, mock_qdrant_class, mock_qdrant_client) -> None:
-        """Test that limit parameter is correctly passed."""
-        mock_qdrant_class.return_value = mock_qdrant_client
+        # The dense prefetch searches with hnsw_ef=128, and oversamples quantized candidates and rescores them
+        dense_prefetch = next(p for p in prefetch if p.using == 'cra-dense')
+        assert dense_prefetch.params.hnsw_ef == 128
+        assert dense_prefetch.params.quantization.rescore is True
 
-        client = TaxDataQdrantClient(
-            url='https://test.cloud.qdrant.io',
-            api_key='test-key',
-            collection_name='cra-collection',
-            source='cra',
+    @pytest.mark.asyncio
+    async def test_search_hybrid_precomputed_sparse_query(
+        self,
+        mock_qdrant_client: MagicMock,
+        make_cra_client: Callable[..., TaxDataQdrantClient],
+        mock_sparse_service: MagicMock,
+    ) -> None:
+        """Test that hybrid search uses the sparse service's query vector when configured."""
+        client = make_cra_client(sparse_service=mock_sparse_service)
+
+        sparse_query = SparseVector(indices=[1], values=[1.0])
+        embed_threads = []
+
+        def embed_query(_: str) -> SparseVector:
+            embed_threads.append(threading.get_ident())
+            return sparse_query
+
+        mock_sparse_service.embed_query.side_effect = embed_query
+
+        await client.search(query_vector=[0.5] * 1536, query_text='tax deduction', limit=5)
+
+        mock_sparse_service.embed_query.assert_called_once_with('tax deduction')
+        assert embed_threads != [threading.get_ident()], 'Query embedding should run off the event loop thread'
+        prefetch = mock_qdrant_client.query_points.call_args.kwargs['prefetch']
+        sparse_prefetch = next(p for p in prefetch if p.using == 'cra-sparse')
+        assert sparse_prefetch.query == sparse_query
+
+    @pytest.mark.asyncio
+    async def test_search_batch_single_request(
+        self,
+        mock_qdrant_client: MagicMock,
+        make_cra_client: Callable[..., TaxDataQdrantClient],
+        mock_sparse_service: MagicMock,
+    ) -> None:
+        """Test that search_batch sends all queries in one request and splits results per query."""
+        mock_qdrant_client.query_batch_points.return_value = [
+            MagicMock(points=[MagicMock(id='1', payload={'chunk_text': 'A'})]),
+            MagicMock(points=[MagicMock(id='2', payload={'chunk_text': 'B'})]),
+            MagicMock(points=[]),
+        ]
+
+        client = make_cra_client(sparse_service=mock_sparse_service)
+
+        results = await client.search_batch(
+            [([0.1] * 1536, 'tax deduction'), ([0.2] * 1536, None), ([0.3] * 1536, 'gst rebate')],
+            limit=3,
         )
 
+        mock_qdrant_client.query_batch_points.assert_awaited_once()
+        mock_qdrant_client.query_points.assert_not_called()
+        mock_sparse_service.embed_queries.assert_called_once_with(['tax deduction', 'gst rebate'])
+
+        hybrid, dense_only, second_hybrid = mock_qdrant_client.query_batch_points.call_args.kwargs['requests']
+        assert all(request.limit == 3 for request in (hybrid, dense_only, second_hybrid))
+        assert dense_only.prefetch is None
+        assert dense_only.using == 'cra-dense'
+        assert hybrid.query == second_hybrid.query == FusionQuery(fusion=Fusion.RRF)
+        assert next(p for p in hybrid.prefetch if p.using == 'cra-sparse').query.indices == [100]
+        assert next(p for p in second_hybrid.prefetch if p.using == 'cra-sparse').query.indices == [101]
+
+        assert [[point.payload['chunk_text'] for point in points] for points in results] == [['A'], ['B'], []]
+
+    @pytest.mark.asyncio
+    async def test_search_batch_empty(self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock) -> None:
+        """Test that an empty batch makes no request."""
+        assert await cra_client.search_batch([]) == []
+        mock_qdrant_client.query_batch_points.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('limit', [1, 5, 10])
+    async def test_search_limit_parameter(
+        self, limit: int, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that limit parameter is correctly passed."""
+        await cra_client.search(query_vector=[0.5] * 1536, limit=limit)
+
+        mock_qdrant_client.query_points.assert_awaited_once()
+        assert mock_qdrant_client.query_points.call_args.kwargs['limit'] == limit
+
+    @pytest.mark.asyncio
+    async def test_search_batch_per_query_limits(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that search_batch sends a different limit per query in one request."""
+        mock_qdrant_client.query_batch_points.return_value = [MagicMock(points=[]) for _ in range(3)]
+        queries = [([0.5] * 1536, None)] * 3
+
+        await cra_client.search_batch(queries, limit=[1, 5, 10])
+
+        mock_qdrant_client.query_batch_points.assert_awaited_once()
+        requests = mock_qdrant_client.query_batch_points.call_args.kwargs['requests']
+        assert [request.limit for request in requests] == [1, 5, 10]
+
+        with pytest.raises(ValueError, match='2 limits for 3 queries'):
+            await cra_client.search_batch(queries, limit=[1, 5])
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('query_text', ['   ', 'RRSP', '  T2125 '])
+    async def test_search_short_text_is_dense_only(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock, query_text: str
+    ) -> None:
+        """Test that blank or single-token query text skips the BM25 prefetch."""
+        await cra_client.search(query_vector=[0.5] * 1536, query_text=query_text)
+
+        kwargs = mock_qdrant_client.query_points.call_args.kwargs
+        assert 'prefetch' not in kwargs
+        assert kwargs['search_params'].hnsw_ef == 128
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(('limit', 'prefetch_limit'), [(5, 10), (40, 50), (60, 60)])
+    async def test_search_prefetch_limit_capped(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock, limit: int, prefetch_limit: int
+    ) -> None:
+        """Test that each hybrid leg prefetches 2x limit, capped at 50 but never below limit."""
+        await cra_client.search(query_vector=[0.5] * 1536, query_text='RRSP deduction', limit=limit)
+
+        prefetch = mock_qdrant_client.query_points.call_args.kwargs['prefetch']
+        assert [p.limit for p in prefetch] == [prefetch_limit, prefetch_limit]
+
+    @pytest.mark.asyncio
+    async def test_search_cache(self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock) -> None:
+        """Test that repeated searches are served from cache until the collection is written to."""
+        query_vector = [0.5] * 1536
+
+        first = await cra_client.search(query_vector=query_vector, query_text='tax deduction')
+        second = await cra_client.search(query_vector=query_vector, query_text='tax deduction')
+        assert second == first
+        assert mock_qdrant_client.query_points.await_count == 1
+
+        # A different text, vector or limit is a different cache entry
+        await cra_client.search(query_vector=query_vector, query_text='gst rebate')
+        await cra_client.search(query_vector=[0.4] * 1536, query_text='tax deduction')
+        await cra_client.search(query_vector=query_vector, query_text='tax deduction', limit=10)
+        assert mock_qdrant_client.query_points.await_count == 4
+
+        # Storing documents invalidates cached results
+        await cra_client.store_documents(['Chunk'], np.full((1, 1536), 0.1, dtype=np.float32), [{'chunk_index': 0}])
+        await cra_client.search(query_vector=query_vector, query_text='tax deduction')
+        assert mock_qdrant_client.query_points.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_search_cache_returns_copies(self, cra_client: TaxDataQdrantClient) -> None:
+        """Test that mutating returned results does not change what later cache hits return."""
         query_vector = [0.5] * 1536
 
-        # Test with different limits
-        for limit in [1, 5, 10]:
-            client.search(query_vector=query_vector, limit=limit)
-            call_args = mock_qdrant_client.query_points.call_args
-            assert call_args.kwargs['limit'] == limit
+        for _ in range(2):
+            results = await cra_client.search(query_vector=query_vector, query_text='tax deduction')
+            assert results[0].payload['chunk_text'] == 'Result 1'
+            results[0].payload['chunk_text'] = 'Edited'
+            results.pop()
+
+        results = await cra_client.search(query_vector=query_vector, query_text='tax deduction')
+        assert [point.payload['chunk_text'] for point in results] == ['Result 1', 'Result 2']
+
+    @pytest.mark.asyncio
+    async def test_search_cache_evicts_least_recently_used(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the search cache is bounded and evicts the least recently used entry."""
+        monkeypatch.setattr('tax_rag_scraper.storage.qdrant_client.SEARCH_CACHE_SIZE', 2)
+
+        query_vector = [0.5] * 1536
+        await cra_client.search(query_vector=query_vector, query_text='a')
+        await cra_client.search(query_vector=query_vector, query_text='b')
+        await cra_client.search(query_vector=query_vector, query_text='a')  # hit, 'b' is now least recent
+        await cra_client.search(query_vector=query_vector, query_text='c')  # evicts 'b'
+        assert mock_qdrant_client.query_points.await_count == 3
+
+        await cra_client.search(query_vector=query_vector, query_text='a')
+        assert mock_qdrant_client.query_points.await_count == 3
+        await cra_client.search(query_vector=query_vector, query_text='b')
+        assert mock_qdrant_client.query_points.await_count == 4
 
 
 @pytest.mark.unit
 class TestTaxDataQdrantClientUtilities:
     """Test utility methods."""
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
-    def test_count_documents(self, mock_qdrant_class, mock_qdrant_client) -> None:
+    @pytest.mark.asyncio
+    async def test_count_documents(self, cra_client: TaxDataQdrantClient) -> None:
         """Test counting documents in collection."""
-        mock_qdrant_class.return_value = mock_qdrant_client
-
-        client = TaxDataQdrantClient(
-            url='https://test.cloud.qdrant.io',
-            api_key='test-key',
-            collection_name='cra-collection',
-            source='cra',
-        )
-
-        count = client.count_documents()
+        count = await cra_client.count_documents()
         assert count == 100
 
-    @patch('tax_rag_scraper.storage.qdrant_client.QdrantClient')
-    def test_get_collection_info(self, mock_qdrant_class, mock_qdrant_client) -> None:
+    @pytest.mark.asyncio
+    async def test_count_documents_cached(
+        self,
+        cra_client: TaxDataQdrantClient,
+        mock_qdrant_client: MagicMock,
+        make_collection_info: Callable[..., MagicMock],
+    ) -> None:
+        """Test that counts are served from cache within the TTL and advanced by stored chunks."""
+        assert await cra_client.count_documents() == 100
+        chunks = [(f'Chunk {i}', [0.1] * 1536, {'chunk_index': i}) for i in range(3)]
+        await cra_client.store_documents(*to_arrays(chunks))
+        assert await cra_client.count_documents() == 103
+        assert mock_qdrant_client.get_collection.await_count == 1
+
+        # After the TTL expires, the count is refreshed from the server
+        mock_qdrant_client.get_collection.return_value = make_collection_info('cra', points_count=102)
+        with patch('tax_rag_scraper.storage.qdrant_client.time.monotonic', return_value=time.monotonic() + 60):
+            assert await cra_client.count_documents() == 102
+        assert mock_qdrant_client.get_collection.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_collection_info(self, cra_client: TaxDataQdrantClient) -> None:
         """Test retrieving collection information."""
-        mock_qdrant_class.return_value = mock_qdrant_client
+        info = await cra_client.get_collection_info()
 
-        client = TaxDataQdrantClient(
+        assert info['name'] == 'cra-collection'
+        assert info['source'] == 'cra'
+        assert info['dense_vector_name'] == 'cra-dense'
+        assert info['sparse_vector_name'] == 'cra-sparse'
+        assert info['points_count'] == 100
+
+    @pytest.mark.asyncio
+    async def test_flush_waits_for_pending_upserts(
+        self, cra_client: TaxDataQdrantClient, mock_qdrant_client: MagicMock
+    ) -> None:
+        """Test that flush sends a waiting no-op update and drops caches that may predate it."""
+        await cra_client.count_documents()
+        await cra_client.search(query_vector=[0.5] * 1536)
+
+        await cra_client.flush()
+
+        mock_qdrant_client.delete.assert_awaited_once()
+        kwargs = mock_qdrant_client.delete.call_args.kwargs
+        assert kwargs['wait'] is True
+        assert kwargs['points_selector'].points == []
+
+        await cra_client.count_documents()
+        await cra_client.search(query_vector=[0.5] * 1536)
+        assert mock_qdrant_client.get_collection.await_count == 2
+        assert mock_qdrant_client.query_points.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_collection_info_shares_cache(self, mock_qdrant_client: MagicMock) -> None:
+        """Test that validation, count_documents and get_collection_info share one cached get_collection."""
+        client = await TaxDataQdrantClient.create(
             url='https://test.cloud.qdrant.io',
             api_key='test-key',
             collection_name='cra-collection',
             source='cra',
+            client=mock_qdrant_client,
         )
 
-        info = client.get_collection_info()
+        assert await client.count_documents() == 100
+        assert (await client.get_collection_info())['points_count'] == 100
+        assert mock_qdrant_client.get_collection.await_count == 1
 
-        assert info['name'] == 'cra-collection'
-        assert info['source'] == 'cra'
-        assert info['dense_vector_name'] == 'cra-dense'
-        assert info['sparse_vector_name'] == 'cra-sparse'
-        assert info['points_count'] == 100
+        # Deleting the collection drops the cached info
+        await client.delete_collection()
+        await client.count_documents()
+        assert mock_qdrant_client.get_collection.await_count == 2
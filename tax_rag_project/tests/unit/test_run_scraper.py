@@ -0,0 +1,86 @@
+"""Test suite for the shared scraper entry point."""
+
+from collections.abc import Generator
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from tax_rag_scraper.crawlers.run import run_scraper
+from tax_rag_scraper.utils.url_filter import compile_url_patterns
+
+CRAWL_CONFIG = {
+    'NAME': 'Test',
+    'TARGET': 'Test Resources',
+    'MAX_DEPTH': 2,
+    'MAX_CONCURRENCY': 3,
+    'MAX_REQUESTS': 50,
+    'CRAWL_TYPE': 'test',
+    'COLLECTION': 'test-collection',
+    'SOURCE': 'test',
+}
+START_URLS = ['https://www.canada.ca/en/revenue-agency.html']
+ALLOWED_RE = compile_url_patterns(['https://www.canada.ca/en/revenue-agency/**'])
+EXCLUDED_RE = compile_url_patterns([])
+
+
+@pytest.fixture(autouse=True)
+def _credentials(monkeypatch: pytest.MonkeyPatch) -> Generator[None, None, None]:
+    monkeypatch.setenv('QDRANT_URL', 'https://test.cloud.qdrant.io')
+    monkeypatch.setenv('QDRANT_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-openai-key')
+    with patch('tax_rag_scraper.crawlers.run.ensure_env_loaded'):
+        yield
+
+
+@pytest.mark.unit
+class TestRunScraper:
+    """Test credential validation and crawler setup in run_scraper."""
+
+    @pytest.mark.asyncio
+    async def test_runs_crawler_with_config(self) -> None:
+        """Test that settings and crawler are built from the scraper config."""
+        with patch('tax_rag_scraper.crawlers.run.TaxDataCrawler') as mock_crawler_class:
+            mock_crawler_class.return_value.run = AsyncMock()
+
+            await run_scraper(START_URLS, ALLOWED_RE, EXCLUDED_RE, CRAWL_CONFIG)
+
+        kwargs = mock_crawler_class.call_args.kwargs
+        settings = kwargs['settings']
+        assert settings.QDRANT_COLLECTION == 'test-collection'
+        assert settings.QDRANT_SOURCE == 'test'
+        assert settings.MAX_REQUESTS_PER_CRAWL == 50
+        assert kwargs['max_depth'] == 2
+        assert kwargs['allowed_patterns'] is ALLOWED_RE
+        assert kwargs['excluded_patterns'] is EXCLUDED_RE
+        mock_crawler_class.return_value.run.assert_awaited_once_with(START_URLS, crawl_type='test')
+
+    @pytest.mark.asyncio
+    async def test_closes_qdrant_clients_after_failed_run(self) -> None:
+        """Test that shared Qdrant clients are closed even when the crawl fails."""
+        with (
+            patch('tax_rag_scraper.crawlers.run.TaxDataCrawler') as mock_crawler_class,
+            patch('tax_rag_scraper.crawlers.run.close_qdrant_clients') as mock_close,
+        ):
+            mock_crawler_class.return_value.run = AsyncMock(side_effect=RuntimeError('crawl failed'))
+
+            with pytest.raises(RuntimeError, match='crawl failed'):
+                await run_scraper(START_URLS, ALLOWED_RE, EXCLUDED_RE, CRAWL_CONFIG)
+
+        mock_close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_exits_without_qdrant_url(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a missing QDRANT_URL exits before any crawler is created."""
+        monkeypatch.delenv('QDRANT_URL')
+
+        with patch('tax_rag_scraper.crawlers.run.TaxDataCrawler') as mock_crawler_class, pytest.raises(SystemExit):
+            await run_scraper(START_URLS, ALLOWED_RE, EXCLUDED_RE, CRAWL_CONFIG)
+
+        mock_crawler_class.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_exits_with_placeholder_start_urls(self) -> None:
+        """Test that placeholder start URLs are rejected."""
+        with patch('tax_rag_scraper.crawlers.run.TaxDataCrawler') as mock_crawler_class, pytest.raises(SystemExit):
+            await run_scraper(['https://example.com/'], ALLOWED_RE, EXCLUDED_RE, CRAWL_CONFIG)
+
+        mock_crawler_class.assert_not_called()
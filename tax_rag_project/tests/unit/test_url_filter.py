@@ -0,0 +1,133 @@
+"""Test suite for precompiled URL allow/deny patterns.
+
+Tests glob translation, hostname bucketing, and link filtering in LinkExtractor.
+"""
+
+import importlib
+
+import pytest
+from bs4 import BeautifulSoup
+from tax_rag_scraper.utils.link_extractor import LinkExtractor
+from tax_rag_scraper.utils.url_filter import compile_url_patterns, matches_url_patterns
+
+ALLOWED = [
+    'https://laws-lois.justice.gc.ca/eng/acts/I-3.3/**',
+    'https://www.canlii.org/en/ca/scc/**',
+]
+EXCLUDED = [
+    'https://laws-lois.justice.gc.ca/eng/acts/I-3.3/FullText.html',
+    'https://laws-lois.justice.gc.ca/**.pdf',
+]
+
+SCRAPERS = ['cra', 'dof', 'eta', 'fedbudget', 'ita', 'provtax', 'taxcomment', 'taxlaw']
+
+
+@pytest.mark.unit
+class TestCompileUrlPatterns:
+    """Test pattern compilation and matching."""
+
+    def test_patterns_bucketed_by_hostname(self) -> None:
+        """Test that patterns are indexed by hostname."""
+        patterns = compile_url_patterns(ALLOWED)
+
+        assert set(patterns) == {'laws-lois.justice.gc.ca', 'www.canlii.org'}
+
+    def test_double_star_matches_across_segments(self) -> None:
+        """Test that '**' matches any characters, including '/'."""
+        patterns = compile_url_patterns(ALLOWED)
+
+        assert matches_url_patterns(patterns, 'https://laws-lois.justice.gc.ca/eng/acts/I-3.3/')
+        assert matches_url_patterns(patterns, 'https://laws-lois.justice.gc.ca/eng/acts/I-3.3/section-1.html')
+        assert matches_url_patterns(patterns, 'https://laws-lois.justice.gc.ca/eng/acts/I-3.3/page-2.html?x=1')
+        assert matches_url_patterns(patterns, 'https://www.canlii.org/en/ca/scc/doc/2020/2020scc1/2020scc1.html')
+
+    def test_single_star_stops_at_slash(self) -> None:
+        """Test that '*' does not match across path segments."""
+        patterns = compile_url_patterns(['https://example.com/docs/*.html'])
+
+        assert matches_url_patterns(patterns, 'https://example.com/docs/guide.html')
+        assert not matches_url_patterns(patterns, 'https://example.com/docs/nested/guide.html')
+
+    def test_non_matching_urls(self) -> None:
+        """Test that other paths and hosts do not match."""
+        patterns = compile_url_patterns(ALLOWED)
+
+        assert not matches_url_patterns(patterns, 'https://laws-lois.justice.gc.ca/eng/acts/E-15/')
+        assert not matches_url_patterns(patterns, 'https://example.com/eng/acts/I-3.3/')
+
+    def test_special_characters_are_literal(self) -> None:
+        """Test that regex metacharacters and '?' in patterns are matched literally."""
+        patterns = compile_url_patterns(['https://example.com/insights/?page=1&filter=1887'])
+
+        assert matches_url_patterns(patterns, 'https://example.com/insights/?page=1&filter=1887')
+        assert not matches_url_patterns(patterns, 'https://example.com/insights/Xpage=1&filter=1887')
+
+    def test_empty_patterns_match_nothing(self) -> None:
+        """Test that an empty pattern list never matches."""
+        assert not matches_url_patterns(compile_url_patterns([]), 'https://example.com/')
+
+
+@pytest.mark.unit
+class TestLinkExtractorPatterns:
+    """Test that LinkExtractor applies compiled allow/deny patterns."""
+
+    def test_extract_links_applies_patterns(self) -> None:
+        """Test that only allowed, non-excluded links are returned."""
+        html = """
+            <a href="/eng/acts/I-3.3/section-1.html#s1">Allowed</a>
+            <a href="/eng/acts/I-3.3/FullText.html">Excluded page</a>
+            <a href="/eng/acts/I-3.3/section-2.pdf">Excluded pdf</a>
+            <a href="/eng/acts/E-15/">Other act</a>
+            <a href="https://www.canlii.org/en/ca/scc/nav/date/2020/">Cross-domain allowed</a>
+        """
+        extractor = LinkExtractor(
+            max_depth=2,
+            allowed_patterns=compile_url_patterns(ALLOWED),
+            excluded_patterns=compile_url_patterns(EXCLUDED),
+        )
+
+        links = extractor.extract_links(
+            BeautifulSoup(html, 'html.parser'), 'https://laws-lois.justice.gc.ca/eng/acts/I-3.3/'
+        )
+
+        assert links == {
+            'https://laws-lois.justice.gc.ca/eng/acts/I-3.3/section-1.html',
+            'https://www.canlii.org/en/ca/scc/nav/date/2020/',
+        }
+
+    def test_extract_links_without_patterns_stays_on_domain(self) -> None:
+        """Test that the same-domain rule still applies when no patterns are configured."""
+        html = '<a href="/page.html">Same</a><a href="https://other.example.org/page.html">Other</a>'
+        extractor = LinkExtractor(max_depth=2)
+
+        links = extractor.extract_links(BeautifulSoup(html, 'html.parser'), 'https://example.com/')
+
+        assert links == {'https://example.com/page.html'}
+
+    def test_pattern_decisions_are_cached(self) -> None:
+        """Test that repeated links are matched against the patterns only once."""
+        html = '<a href="/eng/acts/I-3.3/section-1.html">A</a><a href="/eng/acts/I-3.3/section-1.html#s2">A again</a>'
+        extractor = LinkExtractor(max_depth=2, allowed_patterns=compile_url_patterns(ALLOWED))
+        soup = BeautifulSoup(html, 'html.parser')
+
+        extractor.extract_links(soup, 'https://laws-lois.justice.gc.ca/eng/acts/I-3.3/')
+        extractor.extract_links(soup, 'https://laws-lois.justice.gc.ca/eng/acts/I-3.3/')
+
+        cache_info = extractor._match_patterns.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 3
+
+
+@pytest.mark.unit
+class TestScraperPatterns:
+    """Test the URL patterns configured by each active scraper."""
+
+    @pytest.mark.parametrize('scraper', SCRAPERS)
+    def test_start_urls_match_own_patterns(self, scraper: str) -> None:
+        """Test that every start URL is inside its scraper's allow list and outside its exclude list."""
+        module = importlib.import_module(f'tax_rag_scraper.active-crawlers.{scraper}_scraper')
+
+        for url in module.START_URLS:
+            # An empty allow list falls back to same-domain crawling
+            assert not module.ALLOWED_DOMAINS or matches_url_patterns(module.ALLOWED_RE, url), url
+            assert not matches_url_patterns(module.EXCLUDED_RE, url), url